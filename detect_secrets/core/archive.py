@@ -0,0 +1,243 @@
+import gzip
+import io
+import os
+import tarfile
+import zipfile
+import zlib
+from collections import namedtuple
+
+from detect_secrets.core.constants import IGNORED_FILE_EXTENSIONS
+from detect_secrets.core.log import log
+
+
+# Archives are scanned if they have one of these extensions.
+ARCHIVE_EXTENSIONS = (
+    '.ear',
+    '.gz',
+    '.jar',
+    '.tar',
+    '.tgz',
+    '.war',
+    '.whl',
+    '.zip',
+)
+
+# Separates the name of an archive from the path of a file within it,
+# e.g. `archive.zip!/path/in/archive`.
+MEMBER_SEPARATOR = '!/'
+
+ARCHIVE_ERRORS = (
+    EOFError,
+    OSError,
+    RuntimeError,       # e.g. encrypted zip members
+    tarfile.TarError,
+    zipfile.BadZipFile,
+    zlib.error,
+)
+
+
+class ArchiveLimits(
+    namedtuple(
+        'ArchiveLimits',
+        [
+            'max_depth',
+            'max_members',
+            'max_size',
+        ],
+    ),
+):
+    """Limits on what is read from each archive, so that archive bombs
+    can't exhaust memory or time.
+
+    :type max_depth: int
+    :param max_depth: archives nested deeper than this are skipped. An
+        archive which isn't within another one has a depth of 1.
+
+    :type max_members: int
+    :param max_members: stop after reading this many files from an archive
+        (including the archives within it).
+
+    :type max_size: int
+    :param max_size: stop after decompressing this many bytes from an archive
+        (including the archives within it).
+    """
+    def __new__(cls, max_depth=3, max_members=10000, max_size=100 * 1024 * 1024):
+        return super(ArchiveLimits, cls).__new__(
+            cls,
+            max_depth=max_depth,
+            max_members=max_members,
+            max_size=max_size,
+        )
+
+
+class _ArchiveLimitExceeded(Exception):
+    pass
+
+
+class _Usage:
+
+    def __init__(self):
+        self.members = 0
+        self.size = 0
+
+
+def is_archive(filename):
+    """
+    :type filename: str
+    :rtype: bool
+    """
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def iter_members(f, filename, limits):
+    """Reads the files in an archive, and the archives within it, into memory.
+    Nothing is extracted to disk.
+
+    Files which are usually skipped (see IGNORED_FILE_EXTENSIONS) aren't read.
+
+    :type f: file object
+    :param f: the archive, opened in binary mode.
+
+    :type filename: str
+    :type limits: ArchiveLimits
+
+    :rtype: iter of (str, bytes)
+    :returns: the name of each file (in the form `archive.zip!/path/in/archive`),
+        and its contents.
+    """
+    try:
+        for member in _iter_members(f, filename, limits, _Usage(), depth=1):
+            yield member
+    except _ArchiveLimitExceeded as error:
+        log.warning('Stopped scanning %s: %s', filename, error)
+
+
+def read_member(filename, limits=ArchiveLimits()):
+    """
+    :type filename: str
+    :param filename: in the form `archive.zip!/path/in/archive`.
+
+    :type limits: ArchiveLimits
+
+    :rtype: bytes|None
+    :returns: the contents of the file, or None if it can't be read.
+    """
+    archive_filename = filename.split(MEMBER_SEPARATOR, 1)[0]
+    try:
+        with open(archive_filename, 'rb') as f:
+            for member_filename, data in iter_members(f, archive_filename, limits):
+                if member_filename == filename:
+                    return data
+    except IOError:
+        pass
+
+    return None
+
+
+def _iter_members(f, filename, limits, usage, depth):
+    try:
+        for name, read in _list_members(f, filename):
+            member_filename = '{}{}{}'.format(filename, MEMBER_SEPARATOR, name)
+            if not is_archive(name) and os.path.splitext(name)[1] in IGNORED_FILE_EXTENSIONS:
+                continue
+
+            usage.members += 1
+            if usage.members > limits.max_members:
+                raise _ArchiveLimitExceeded(
+                    'more than {} files'.format(limits.max_members),
+                )
+
+            data = read(limits.max_size - usage.size + 1)
+            usage.size += len(data)
+            if usage.size > limits.max_size:
+                raise _ArchiveLimitExceeded(
+                    'more than {} bytes when decompressed'.format(limits.max_size),
+                )
+
+            if not is_archive(name):
+                yield member_filename, data
+                continue
+
+            if depth >= limits.max_depth:
+                log.warning(
+                    'Skipping %s: archives are nested more than %d deep',
+                    member_filename,
+                    limits.max_depth,
+                )
+                continue
+
+            for member in _iter_members(
+                io.BytesIO(data),
+                member_filename,
+                limits,
+                usage,
+                depth + 1,
+            ):
+                yield member
+
+    except ARCHIVE_ERRORS as error:
+        log.warning('Unable to read archive %s: %s', filename, error)
+
+
+def _list_members(f, filename):
+    """
+    :type f: file object
+    :param f: the archive, opened in binary mode.
+
+    :type filename: str
+
+    :rtype: iter of (str, function)
+    :returns: the path of each file in the archive, and a function that
+        reads (up to) a given number of bytes of it.
+    """
+    if zipfile.is_zipfile(f):
+        with zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+
+                yield info.filename, _get_zip_member_reader(archive, info)
+
+        return
+
+    f.seek(0)
+    try:
+        archive = tarfile.open(fileobj=f, mode='r:*')
+    except tarfile.ReadError:
+        archive = None
+
+    if archive is not None:
+        with archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+
+                yield info.name, _get_tar_member_reader(archive, info)
+
+        return
+
+    f.seek(0)
+    if f.read(2) == b'\x1f\x8b':
+        f.seek(0)
+        with gzip.GzipFile(fileobj=f) as archive:
+            # The only file is the archive, without its extension.
+            yield os.path.splitext(os.path.basename(filename))[0], archive.read
+
+        return
+
+    log.warning('Unable to read archive %s: unsupported format', filename)
+
+
+def _get_zip_member_reader(archive, info):
+    def read(size):
+        with archive.open(info) as member:
+            return member.read(size)
+
+    return read
+
+
+def _get_tar_member_reader(archive, info):
+    def read(size):
+        return archive.extractfile(info).read(size)
+
+    return read
@@ -5,20 +5,28 @@ import json
 import os
 import sys
 from builtins import input
+from collections import Counter
 from collections import defaultdict
 from copy import deepcopy
 from functools import lru_cache
 
+from ..plugins.base import LINES_OF_CONTEXT
 from ..plugins.common import initialize
 from ..plugins.common.util import get_mapping_from_secret_type_to_class_name
 from ..util import get_git_remotes
 from ..util import get_git_sha
+from .archive import MEMBER_SEPARATOR
+from .archive import read_member
 from .baseline import merge_results
 from .bidirectional_iterator import BidirectionalIterator
 from .code_snippet import CodeSnippetHighlighter
 from .color import AnsiColor
 from .color import colorize
 from .common import write_baseline_to_file
+from .constants import VerifiedResult
+from .verification import DEFAULT_MAX_WORKERS
+from .verification import VerificationQueue
+from .verification_cache import VerificationCache
 from detect_secrets.core.constants import POTENTIAL_SECRET_DETECTED_NOTE
 
 
@@ -337,6 +345,138 @@ def print_audit_results(baseline_filename):
     )
 
 
+def verify_baseline(
+    baseline_filename,
+    verification_threads=DEFAULT_MAX_WORKERS,
+    verification_cache=None,
+    request_policy=None,
+):
+    """Verifies the secrets in a baseline, and records the results in it.
+
+    This allows files to be scanned without verification (which waits on the
+    network), and their secrets verified later, e.g. in a separate CI job.
+    Secrets are found again in their files, since baselines only contain
+    their hashes. Secrets of the same type are queued together, and verified
+    at the same time as those of other types.
+
+    Secrets that can't be verified (e.g. because their provider can't be
+    reached) keep the results that they had before.
+
+    :type baseline_filename: str
+
+    :type verification_threads: int
+    :param verification_threads: number of secrets to verify at the same time.
+
+    :type verification_cache: VerificationCache|None
+    :param verification_cache: to reuse the results of verification from.
+
+    :type request_policy: detect_secrets.plugins.common.http_session.RequestPolicy|None
+    :param request_policy: limits on the requests made to verify secrets
+        (e.g. a deadline).
+
+    :rtype: dict
+    :returns: VerifiedResult (or None, for secrets that weren't found) =>
+        number of secrets.
+    """
+    baseline = _get_baseline_from_file(baseline_filename)
+    if verification_cache is None:
+        verification_cache = VerificationCache()
+
+    plugins = {}
+    candidates = []
+    counts = Counter()
+    for filename, secrets in baseline['results'].items():
+        file_content = _open_file_with_cache(filename)
+        file_lines = file_content.splitlines() if file_content else []
+
+        # Secret hash => PotentialSecret, for each type of secret in the file.
+        found = {}
+        for secret in secrets:
+            plugin = _get_verifying_plugin(
+                secret['type'],
+                baseline['plugins_used'],
+                plugins,
+            )
+            if plugin is None:
+                continue
+
+            plugin.verification_cache = verification_cache
+            if secret['type'] not in found:
+                found[secret['type']] = {
+                    potential_secret.secret_hash: potential_secret
+                    for potential_secret in (
+                        plugin.analyze(io.StringIO(file_content), filename)
+                        if file_content
+                        else ()
+                    )
+                }
+
+            potential_secret = found[secret['type']].get(secret['hashed_secret'])
+            if potential_secret is None:
+                counts[None] += 1
+                continue
+
+            content = str(
+                CodeSnippetHighlighter().get_code_snippet(
+                    file_lines,
+                    potential_secret.lineno,
+                    lines_of_context=LINES_OF_CONTEXT,
+                ),
+            )
+            candidates.append((secret, plugin, potential_secret, content))
+
+    candidates.sort(key=lambda candidate: candidate[0]['type'])
+    queue = VerificationQueue(
+        max_workers=verification_threads,
+        request_policy=request_policy,
+    )
+    for _, plugin, potential_secret, content in candidates:
+        queue.submit(plugin, potential_secret, content)
+
+    queue.join()
+    verification_cache.save()
+
+    for secret, _, potential_secret, _ in candidates:
+        if not potential_secret.is_verified:
+            counts[VerifiedResult.UNVERIFIED] += 1
+            continue
+
+        counts[
+            VerifiedResult.VERIFIED_TRUE
+            if potential_secret.verified_result
+            else VerifiedResult.VERIFIED_FALSE
+        ] += 1
+
+        secret['is_verified'] = True
+        secret['verified_result'] = potential_secret.verified_result
+        if potential_secret.other_factors:
+            secret['other_factors'] = dict(potential_secret.other_factors)
+
+    write_baseline_to_file(
+        filename=baseline_filename,
+        data=baseline,
+    )
+
+    print(
+        'Verified {} secrets: {} live, {} not live, {} could not be verified.'.format(
+            len(candidates),
+            counts[VerifiedResult.VERIFIED_TRUE],
+            counts[VerifiedResult.VERIFIED_FALSE],
+            counts[VerifiedResult.UNVERIFIED],
+        ),
+    )
+    for reason, count in sorted(queue.skipped.items()):
+        print('Skipped verifying {} secrets: {}'.format(count, reason))
+
+    if counts[None]:
+        print(
+            '{} secrets were not found in their files. '
+            'Try recreating your baseline.'.format(counts[None]),
+        )
+
+    return dict(counts)
+
+
 def get_secrets_list_from_file(baseline_filename: str) -> list:
     baseline = _get_baseline_from_file(baseline_filename)
     secrets = list(_secret_generator(baseline))
@@ -358,6 +498,29 @@ def _get_baseline_from_file(filename):  # pragma: no cover
         sys.exit(errno.EIO)
 
 
+def _get_verifying_plugin(secret_type, plugin_settings, plugins):
+    """
+    :type secret_type: str
+    :type plugin_settings: list
+    :param plugin_settings: "plugins_used" in the baseline.
+
+    :type plugins: dict
+    :param plugins: secret type => plugin, for those that were already
+        initialized.
+
+    :rtype: detect_secrets.plugins.base.BasePlugin|None
+    :returns: the plugin for the type of secret, if it can verify secrets.
+    """
+    if secret_type not in plugins:
+        plugin = initialize.from_secret_type(secret_type, plugin_settings)
+        if plugin is not None and not plugin.can_verify:
+            plugin = None
+
+        plugins[secret_type] = plugin
+
+    return plugins[secret_type]
+
+
 def _remove_nonexistent_files_from_baseline(baseline):
     files_removed = False
     for filename in baseline['results'].copy():
@@ -620,6 +783,14 @@ def _open_file_with_cache(filename):
     This caches opened files to ensure that the audit functionality
     doesn't unnecessarily re-open the same file.
     """
+    if MEMBER_SEPARATOR in filename:
+        # The file is within an archive.
+        data = read_member(filename)
+        try:
+            return data.decode('utf-8') if data is not None else None
+        except UnicodeDecodeError:
+            return None
+
     try:
         with codecs.open(filename, encoding='utf-8') as f:
             return f.read()
@@ -1,13 +1,19 @@
+import hashlib
 import json
 import os
 import re
 import subprocess
 import sys
 import types
+from collections import Counter
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from detect_secrets import util
+from detect_secrets.core.lazy_results import LazySecretsDict
 from detect_secrets.core.log import get_logger
 from detect_secrets.core.secrets_collection import SecretsCollection
+from detect_secrets.plugins.common import regex_backend
 
 
 log = get_logger(format_string='%(message)s')
@@ -23,6 +29,18 @@ def initialize(
     should_scan_all_files=False,
     output_raw=False,
     output_verified_false=False,
+    buffer_scan=False,
+    mmap_scan=False,
+    long_line_threshold=None,
+    file_time_budget=None,
+    line_time_budget=None,
+    regex_engine=regex_backend.DEFAULT_ENGINE,
+    file_policies=None,
+    archive_limits=None,
+    threads=1,
+    verification_threads=None,
+    verification_cache=None,
+    request_policy=None,
 ):
     """Scans the entire codebase for secrets, and returns a
     SecretsCollection object.
@@ -44,6 +62,46 @@ def initialize(
     :type should_scan_all_files: bool
     :type output_raw: bool
     :type output_verified_false: bool
+
+    :type buffer_scan: bool
+    :param buffer_scan: run regex based plugins over entire files, rather than line by line.
+
+    :type mmap_scan: bool
+    :param mmap_scan: memory-map files, and only decode the parts that are needed.
+
+    :type long_line_threshold: int|None
+    :param long_line_threshold: scan lines longer than this in overlapping windows.
+
+    :type file_time_budget: float|None
+    :param file_time_budget: seconds after which to skip a file.
+
+    :type line_time_budget: float|None
+    :param line_time_budget: seconds after which a plugin skips a line.
+
+    :type regex_engine: str
+    :param regex_engine: engine to run the denylists of regex based plugins with.
+
+    :type file_policies: dict|None
+    :param file_policies: class of generated file => what to do with files of that class.
+
+    :type archive_limits: detect_secrets.core.archive.ArchiveLimits|None
+    :param archive_limits: if given, scan the files in archives, within these limits.
+
+    :type threads: int
+    :param threads: number of files to scan at the same time. Plugins are shared
+        between threads.
+
+    :type verification_threads: int|None
+    :param verification_threads: if given, secrets are verified by this many
+        threads in the background, rather than while each file is scanned.
+
+    :type verification_cache: detect_secrets.core.verification_cache.VerificationCache|None
+    :param verification_cache: to reuse the results of verification from.
+
+    :type request_policy: detect_secrets.plugins.common.http_session.RequestPolicy|None
+    :param request_policy: limits on the requests made to verify secrets in
+        the background.
+
     :rtype: SecretsCollection
     """
     output = SecretsCollection(
@@ -54,6 +112,17 @@ def initialize(
         word_list_hash=word_list_hash,
         output_raw=output_raw,
         output_verified_false=output_verified_false,
+        buffer_scan=buffer_scan,
+        mmap_scan=mmap_scan,
+        long_line_threshold=long_line_threshold,
+        file_time_budget=file_time_budget,
+        line_time_budget=line_time_budget,
+        regex_engine=regex_engine,
+        file_policies=file_policies,
+        archive_limits=archive_limits,
+        verification_threads=verification_threads,
+        verification_cache=verification_cache,
+        request_policy=request_policy,
     )
 
     files_to_scan = []
@@ -87,8 +156,63 @@ def initialize(
 
         files_to_scan = filter(filename_regex_match, files_to_scan)
 
-    for file in sorted(files_to_scan):
-        output.scan_file(file)
+    groups = _group_duplicate_files(
+        # The same file may be found through different paths.
+        sorted(set(files_to_scan)),
+        output.get_file_context,
+    )
+    files = [file for file, _ in groups]
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Consuming the results raises any errors from the threads.
+            list(executor.map(output.scan_file, files))
+    else:
+        for file in files:
+            output.scan_file(file)
+
+    output.wait_for_verification()
+
+    duplicate_files = 0
+    duplicate_bytes = 0
+    for file, duplicates in groups:
+        # Files with the same contents are only scanned once.
+        for duplicate in duplicates:
+            output.copy_results(file, duplicate)
+
+        if duplicates:
+            duplicate_files += len(duplicates)
+            duplicate_bytes += os.path.getsize(file) * len(duplicates)
+
+    if duplicate_files:
+        log.info(
+            'Skipped %d duplicate files (%d bytes)',
+            duplicate_files,
+            duplicate_bytes,
+        )
+
+    if output.binary_files_skipped:
+        log.info(
+            'Skipped %d binary files (%d bytes)',
+            output.binary_files_skipped,
+            output.binary_bytes_skipped,
+        )
+
+    if output.time_budget is not None and output.time_budget.exceeded:
+        # Which files and lines time out depends on the load of the machine,
+        # so they are logged (as they are skipped), rather than saved in the
+        # baseline.
+        budgets = Counter(error.budget for error in output.time_budget.exceeded)
+        log.info(
+            'Skipped %d files and %d lines, which exceeded their time budgets',
+            budgets['file'],
+            budgets['line'],
+        )
+
+    for reason, count in sorted(output.verification_skipped.items()):
+        log.info('Skipped verifying %d secrets: %s', count, reason)
+
+    _log_line_cache_statistics(plugins)
+    _log_applicability_statistics(plugins)
 
     return output
 
@@ -111,12 +235,17 @@ def get_secrets_from_baseline(baseline, filter_func=lambda secret: True):
 
     new_secrets = SecretsCollection()
     for filename in baseline.data:
-        # The __hash__ method of PotentialSecret makes this work
-        filtered_results = {
-            secret: secret
-            for secret in baseline.data[filename]
-            if filter_func(secret)
-        }
+        if isinstance(baseline.data[filename], LazySecretsDict):
+            # Filter on the records themselves, so that only the
+            # secrets which are returned need to be materialized.
+            filtered_results = baseline.data[filename].filter(filter_func)
+        else:
+            # The __hash__ method of PotentialSecret makes this work
+            filtered_results = {
+                secret: secret
+                for secret in baseline.data[filename]
+                if filter_func(secret)
+            }
 
         if filtered_results:
             new_secrets.data[filename] = filtered_results
@@ -227,7 +356,7 @@ def trim_baseline_of_removed_secrets(results, baseline, filelist):
 
         # We clone the baseline, so that we can modify the baseline,
         # without messing up the iteration.
-        for baseline_secret in baseline.data[filename].copy():
+        for baseline_secret in _get_records(baseline.data[filename]):
             new_secret_found = results.get_secret(
                 filename,
                 baseline_secret.secret_hash,
@@ -341,6 +470,127 @@ def format_baseline_for_output(baseline):
     )
 
 
+def _log_line_cache_statistics(plugins):
+    """
+    :type plugins: tuple of detect_secrets.plugins.base.BasePlugin
+    """
+    for plugin in plugins:
+        cache_info = plugin.line_cache.info()
+        log.info(
+            '%s: %d line cache hits, %d misses (%.1f%% hit rate)',
+            plugin.__class__.__name__,
+            cache_info.hits,
+            cache_info.misses,
+            cache_info.hit_rate * 100,
+        )
+
+
+def _log_applicability_statistics(plugins):
+    """
+    :type plugins: tuple of detect_secrets.plugins.base.BasePlugin
+    """
+    for plugin in plugins:
+        if plugin.applicability is None:
+            continue
+
+        statistics = plugin.applicability_statistics
+        log.info(
+            '%s: applied to %d of %d files (saved about %.3f seconds)',
+            plugin.__class__.__name__,
+            statistics.files_scanned,
+            statistics.files_scanned + statistics.files_skipped,
+            statistics.seconds_saved,
+        )
+
+
+def _group_duplicate_files(filenames, get_context):
+    """Finds files with the same contents. Files are only hashed if
+    there are others with the same size.
+
+    :type filenames: list of str
+    :type get_context: function
+    :param get_context: returns what else (besides its contents) affects the
+        results of scanning a file. Only files with the same context are grouped.
+
+    :rtype: list of (str, list of str)
+    :returns: each file with unique contents (in the order of `filenames`),
+        and the files which are duplicates of it.
+    """
+    files_by_size = defaultdict(list)
+    for filename in filenames:
+        # Symbolic links aren't scanned, and empty files have no results.
+        if os.path.islink(filename):
+            continue
+
+        try:
+            size = os.path.getsize(filename)
+        except OSError:
+            continue
+
+        if size:
+            files_by_size[(size, get_context(filename))].append(filename)
+
+    duplicates = {}
+    for group in files_by_size.values():
+        if len(group) < 2:
+            continue
+
+        files_by_hash = defaultdict(list)
+        for filename in group:
+            digest = _hash_file(filename)
+            if digest is not None:
+                files_by_hash[digest].append(filename)
+
+        for original, *copies in files_by_hash.values():
+            for filename in copies:
+                duplicates[filename] = original
+
+    output = []
+    copies = defaultdict(list)
+    for filename in filenames:
+        if filename in duplicates:
+            copies[duplicates[filename]].append(filename)
+        else:
+            output.append(filename)
+
+    return [
+        (filename, copies[filename])
+        for filename in output
+    ]
+
+
+def _hash_file(filename, chunk_size=1024 * 1024):
+    """
+    :type filename: str
+    :rtype: str|None
+    """
+    digest = hashlib.sha1()
+    try:
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except IOError:
+        return None
+
+    return digest.hexdigest()
+
+
+def _get_records(file_results):
+    """
+    :type file_results: dict|LazySecretsDict
+    :param file_results: the results of a single file, in a SecretsCollection.
+
+    :rtype: list
+    :returns: a copy of the secrets in `file_results`. For lazily loaded
+        baselines, the records are returned instead, since only their
+        `secret_hash`, `type` and `lineno` are needed.
+    """
+    if isinstance(file_results, LazySecretsDict):
+        return list(file_results.records())
+
+    return list(file_results.copy())
+
+
 def _get_git_tracked_files(rootdir='.'):
     """Parsing .gitignore rules is hard.
 
@@ -1,4 +1,5 @@
 import itertools
+from collections import deque
 
 from .color import AnsiColor
 from .color import colorize
@@ -43,6 +44,82 @@ class CodeSnippetHighlighter:
         )
 
 
+class CodeSnippetWindow:
+    """Builds the same snippets as `CodeSnippetHighlighter.get_code_snippet`,
+    for a stream of lines, without holding the entire file in memory.
+
+    Only the last `lines_of_context` lines are kept around. Snippets for
+    deferred lines are completed once the lines following them have been
+    added, and are returned in the order that they were deferred.
+    """
+
+    def __init__(self, lines_of_context=5):
+        """
+        :type lines_of_context: int
+        """
+        self.lines_of_context = lines_of_context
+
+        # The current line, and the ones before it.
+        self._previous_lines = deque(maxlen=lines_of_context + 1)
+        self._pending = deque()
+        self._line_number = 0
+
+    def add_line(self, line):
+        """
+        :type line: str
+        :rtype: list of (object, CodeSnippet)
+        :returns: deferred items whose snippets are now complete.
+        """
+        completed = self._pop_completed()
+
+        self._line_number += 1
+        self._previous_lines.append(line)
+        for pending in self._pending:
+            pending[1].lines.append(line)
+            pending[2] -= 1
+
+        completed.extend(self._pop_completed())
+        return completed
+
+    def defer(self, item):
+        """Associates an item with the most recently added line, so that it
+        can be returned with that line's snippet once it is complete.
+
+        :type item: object
+        """
+        lines = list(self._previous_lines)
+        self._pending.append([
+            item,
+            CodeSnippet(
+                lines,
+                self._line_number - len(lines),
+                len(lines) - 1,
+            ),
+            self.lines_of_context,
+        ])
+
+    def flush(self):
+        """Completes all deferred snippets, at the end of the file.
+
+        :rtype: list of (object, CodeSnippet)
+        """
+        completed = [
+            (item, snippet)
+            for item, snippet, _ in self._pending
+        ]
+        self._pending.clear()
+
+        return completed
+
+    def _pop_completed(self):
+        completed = []
+        while self._pending and self._pending[0][2] <= 0:
+            item, snippet, _ = self._pending.popleft()
+            completed.append((item, snippet))
+
+        return completed
+
+
 class CodeSnippet:
 
     def __init__(self, snippet, start_line, target_index):
@@ -2,11 +2,9 @@ from enum import Enum
 
 
 # We don't scan files with these extensions.
-# NOTE: We might be able to do this better with
-#       `subprocess.check_output(['file', filename])`
-#       and look for "ASCII text", but that might be more expensive.
-#
-#       Definitely something to look into, if this list gets unruly long.
+# NOTE: Binary files with other extensions are skipped once their first
+#       few KB are read (see `detect_secrets.core.file_type`). This list
+#       only saves opening the most common ones.
 IGNORED_FILE_EXTENSIONS = set(
     (
         '.7z',
@@ -0,0 +1,121 @@
+import os
+import re
+
+
+# Files are classified by this many bytes from their start.
+SNIFF_SIZE = 8192
+
+# Files with more than this proportion of non-text characters are binary.
+MAX_NON_TEXT_RATIO = 0.3
+
+# Control characters other than whitespace, backspace and escape (which
+# are common in logs), and undecodable bytes.
+NON_TEXT_REGEX = re.compile('[\x00-\x07\x0e-\x1a\x1c-\x1f\x7f\ufffd]')
+
+# Classes of files which are full of hashes and encoded blobs, that
+# rarely contain real secrets.
+GENERATED = 'generated'
+LOCKFILE = 'lockfile'
+FILE_CLASSES = (GENERATED, LOCKFILE)
+
+# What to do with files of each class.
+SCAN = 'scan'
+REGEX_ONLY = 'regex-only'
+SKIP = 'skip'
+POLICIES = (SCAN, REGEX_ONLY, SKIP)
+
+DEFAULT_FILE_POLICIES = {
+    GENERATED: SCAN,
+    LOCKFILE: SCAN,
+}
+
+LOCKFILE_NAMES = set(
+    (
+        'Cargo.lock',
+        'composer.lock',
+        'Gemfile.lock',
+        'go.sum',
+        'npm-shrinkwrap.json',
+        'package-lock.json',
+        'Pipfile.lock',
+        'pnpm-lock.yaml',
+        'poetry.lock',
+        'yarn.lock',
+    ),
+)
+
+GENERATED_FILENAME_REGEX = re.compile(
+    r'\.min\.(?:js|css)$|\.(?:js|css)\.map$',
+    re.IGNORECASE,
+)
+
+# Tools mark the files they generate in their first few lines,
+# e.g. `// Code generated by protoc-gen-go. DO NOT EDIT.`
+GENERATED_HEADER_REGEX = re.compile(
+    r'@generated\b|\bDO NOT EDIT\b|\b(?:[Aa]uto-?generated|AUTO-?GENERATED)\b',
+)
+GENERATED_HEADER_LINES = 5
+
+SOURCE_MAP_REGEX = re.compile(r'(?:\)\]\}\'\s*)?\{\s*"version"\s*:\s*3\s*,')
+
+
+def is_binary(sample):
+    """Classifies a file by its start, so that binary files can be skipped
+    without decoding (and scanning) all of them.
+
+    :type sample: str|bytes
+    :param sample: (up to) the first SNIFF_SIZE bytes of the file.
+        Bytes which aren't valid UTF-8 count as non-text.
+
+    :rtype: bool
+    """
+    if isinstance(sample, bytes):
+        sample = sample.decode('utf-8', errors='replace')
+
+    if not sample:
+        return False
+
+    if '\x00' in sample:
+        return True
+
+    return len(NON_TEXT_REGEX.findall(sample)) > len(sample) * MAX_NON_TEXT_RATIO
+
+
+def classify(filename, sample):
+    """
+    :type filename: str
+    :type sample: str|bytes
+    :param sample: (up to) the first SNIFF_SIZE bytes of the file.
+
+    :rtype: str|None
+    :returns: the class of generated file (one of FILE_CLASSES) that the
+        file belongs to, if any.
+    """
+    file_class = classify_by_name(filename)
+    if file_class:
+        return file_class
+
+    if isinstance(sample, bytes):
+        sample = sample.decode('utf-8', errors='replace')
+
+    header = '\n'.join(sample.split('\n', GENERATED_HEADER_LINES)[:GENERATED_HEADER_LINES])
+    if SOURCE_MAP_REGEX.match(sample) or GENERATED_HEADER_REGEX.search(header):
+        return GENERATED
+
+    return None
+
+
+def classify_by_name(filename):
+    """Same as `classify`, without looking at the contents of the file.
+
+    :type filename: str
+    :rtype: str|None
+    """
+    basename = os.path.basename(filename)
+    if basename in LOCKFILE_NAMES:
+        return LOCKFILE
+
+    if GENERATED_FILENAME_REGEX.search(basename):
+        return GENERATED
+
+    return None
@@ -0,0 +1,202 @@
+from collections import namedtuple
+from collections.abc import MutableMapping
+
+from detect_secrets.core.potential_secret import PotentialSecret
+
+
+class BaselineEntry(
+    namedtuple(
+        'BaselineEntry',
+        [
+            'type',
+            'filename',
+            'secret_hash',
+            'lineno',
+            'is_secret',
+            'is_verified',
+            'verified_result',
+        ],
+    ),
+):
+    """Lightweight, immutable record of a single baseline result.
+
+    The field names mirror the attributes of PotentialSecret, so that
+    read-only filters (e.g. `lambda secret: secret.is_secret is None`)
+    can be applied to records without materializing them.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, filename, item):
+        """
+        :type filename: str
+        :type item: dict
+        :param item: a single result, in PotentialSecret.json() format.
+        """
+        return cls(
+            type=item['type'],
+            filename=filename,
+            secret_hash=item['hashed_secret'],
+            lineno=item['line_number'],
+            is_secret=item.get('is_secret'),
+            is_verified=item['is_verified'],
+            verified_result=item.get('verified_result'),
+        )
+
+    @property
+    def key(self):
+        return (self.secret_hash, self.type)
+
+    def to_potential_secret(self, output_raw=False):
+        """
+        :rtype: PotentialSecret
+        """
+        secret = PotentialSecret(
+            self.type,
+            self.filename,
+            secret='will be replaced',
+            lineno=self.lineno,
+            is_secret=self.is_secret,
+            output_raw=output_raw,
+            is_verified=self.is_verified,
+            verified_result=self.verified_result,
+        )
+        secret.secret_hash = self.secret_hash
+
+        return secret
+
+    def json(self):
+        """Same format as PotentialSecret.json()"""
+        attributes = {
+            'type': self.type,
+            'filename': self.filename,
+            'line_number': self.lineno,
+            'hashed_secret': self.secret_hash,
+            'is_verified': self.is_verified,
+            'verified_result': self.verified_result,
+        }
+
+        if self.is_secret is not None:
+            attributes['is_secret'] = self.is_secret
+
+        return attributes
+
+
+class LazySecretsDict(MutableMapping):
+    """Drop-in replacement for the `{PotentialSecret: PotentialSecret}`
+    dictionaries stored in SecretsCollection.data, for a single file.
+
+    Baseline results are kept as BaselineEntry records, and only become
+    PotentialSecret objects when they are accessed through the mapping
+    interface. Once materialized, the same object is always returned, so
+    that in-place modifications (e.g. updating the line number) persist.
+    """
+
+    def __init__(self, filename, records=(), output_raw=False):
+        """
+        :type filename: str
+        :type records: iterable of BaselineEntry
+        :type output_raw: bool
+        """
+        self.filename = filename
+        self.output_raw = output_raw
+
+        self._records = {}
+        self._secrets = {}
+        for record in records:
+            self._records[record.key] = record
+
+    def records(self):
+        """Iterates through the entries of this file, without materializing
+        them. Materialized secrets are returned as is, since they may have
+        been modified.
+
+        :rtype: iterable of BaselineEntry|PotentialSecret
+        """
+        for key, record in self._records.items():
+            yield self._secrets.get(key, record)
+
+    def filter(self, filter_func):
+        """
+        :type filter_func: function
+        :param filter_func: applied to each record. See `records`.
+
+        :rtype: LazySecretsDict
+        """
+        output = LazySecretsDict(self.filename, output_raw=self.output_raw)
+        for key, record in self._records.items():
+            entry = self._secrets.get(key, record)
+            if not filter_func(entry):
+                continue
+
+            output._records[key] = record
+            if key in self._secrets:
+                output._secrets[key] = self._secrets[key]
+
+        return output
+
+    def copy(self):
+        return self.filter(lambda entry: True)
+
+    def json(self):
+        """
+        :rtype: list of dict, in PotentialSecret.json() format
+        """
+        return [entry.json() for entry in self.records()]
+
+    def _get_key(self, secret):
+        if getattr(secret, 'filename', None) != self.filename:
+            return None
+
+        return (secret.secret_hash, secret.type)
+
+    def _materialize(self, key):
+        try:
+            return self._secrets[key]
+        except KeyError:
+            secret = self._records[key].to_potential_secret(self.output_raw)
+            self._secrets[key] = secret
+            return secret
+
+    def __contains__(self, secret):
+        return self._get_key(secret) in self._records
+
+    def __getitem__(self, secret):
+        key = self._get_key(secret)
+        if key not in self._records:
+            raise KeyError(secret)
+
+        return self._materialize(key)
+
+    def __setitem__(self, secret, value):
+        key = self._get_key(secret)
+        if key is None:
+            raise KeyError(secret)
+
+        if key not in self._records:
+            self._records[key] = BaselineEntry(
+                type=value.type,
+                filename=value.filename,
+                secret_hash=value.secret_hash,
+                lineno=value.lineno,
+                is_secret=value.is_secret,
+                is_verified=value.is_verified,
+                verified_result=value.verified_result,
+            )
+
+        self._secrets[key] = value
+
+    def __delitem__(self, secret):
+        key = self._get_key(secret)
+        if key not in self._records:
+            raise KeyError(secret)
+
+        del self._records[key]
+        self._secrets.pop(key, None)
+
+    def __iter__(self):
+        for key in list(self._records):
+            yield self._materialize(key)
+
+    def __len__(self):
+        return len(self._records)
@@ -1,4 +1,6 @@
+import copy
 import hashlib
+import sys
 
 
 class PotentialSecret:
@@ -14,6 +16,29 @@ class PotentialSecret:
     without actually knowing what the secret is.
     """
 
+    # Instances are created for every finding, so we avoid a per-instance
+    # __dict__ to keep memory usage down for large scans.
+    __slots__ = (
+        'type',
+        'filename',
+        'lineno',
+        'secret_value',
+        'is_secret',
+        'is_verified',
+        'verified_result',
+        'output_raw',
+        '_secret_hash',
+        '_other_factors',
+        'factor_index',
+        '_key',
+        '_hash',
+    )
+
+    # If two PotentialSecrets have the same values for these fields,
+    # they are considered equal. Note that line numbers aren't included
+    # in this, because line numbers are subject to change.
+    fields_to_compare = ('filename', 'secret_hash', 'type')
+
     def __init__(
         self,
         typ,
@@ -50,15 +75,19 @@ class PotentialSecret:
         :type output_raw: bool|None
         :param output_raw: whether or not to output the raw, unhashed secret
         """
-        self.type = typ
-        self.filename = filename
+        # Types and filenames are shared by many secrets, so only keep
+        # one copy of each around.
+        self.type = _intern(typ)
+        self.filename = _intern(filename)
         self.lineno = lineno
-        self.secret_hash = self.hash_secret(secret)
-        self.secret = secret
         self.is_secret = is_secret
         self.is_verified = is_verified
         self.verified_result = verified_result
-        self.other_factors = {}
+        self._other_factors = None
+
+        # The FactorIndex of the file that the secret was found in, while it
+        # is being verified. This is never output.
+        self.factor_index = None
 
         # NOTE: Originally, we never wanted to keep the secret value in memory,
         #       after finding it in the codebase. However, to support verifiable
@@ -71,14 +100,39 @@ class PotentialSecret:
         self.secret_value = secret
         self.output_raw = output_raw
 
-        # If two PotentialSecrets have the same values for these fields,
-        # they are considered equal. Note that line numbers aren't included
-        # in this, because line numbers are subject to change.
-        self.fields_to_compare = ['filename', 'secret_hash', 'type']
+        # The hash is only computed when first needed, since many secrets
+        # are discarded (e.g. through allowlists) before that.
+        self._secret_hash = None
+        self._key = None
+        self._hash = None
+
+    @property
+    def secret(self):
+        return self.secret_value
+
+    @property
+    def secret_hash(self):
+        if self._secret_hash is None:
+            self._secret_hash = self.hash_secret(self.secret_value)
+
+        return self._secret_hash
+
+    @secret_hash.setter
+    def secret_hash(self, value):
+        self._secret_hash = value
+        self._key = None
+        self._hash = None
+
+    @property
+    def other_factors(self):
+        if self._other_factors is None:
+            self._other_factors = {}
+
+        return self._other_factors
 
     def set_secret(self, secret):
-        self.secret_hash = self.hash_secret(secret)
         self.secret_value = secret
+        self.secret_hash = self.hash_secret(secret)
 
     @staticmethod
     def hash_secret(secret):
@@ -90,6 +144,21 @@ class PotentialSecret:
         """
         return hashlib.sha1(secret.encode('utf-8')).hexdigest()
 
+    def copy_to(self, filename):
+        """
+        :type filename: str
+        :rtype: PotentialSecret
+        :returns: the same secret, found in another file (e.g. a copy of this one).
+        """
+        secret = copy.copy(self)
+        secret.filename = _intern(filename)
+        secret._key = None
+        secret._hash = None
+        if self._other_factors:
+            secret._other_factors = dict(self._other_factors)
+
+        return secret
+
     def json(self):
         """Custom JSON encoder"""
         attributes = {
@@ -107,12 +176,25 @@ class PotentialSecret:
         if self.is_secret is not None:
             attributes['is_secret'] = self.is_secret
 
-        if self.other_factors:
-            attributes['other_factors'] = self.other_factors
+        if self._other_factors:
+            attributes['other_factors'] = self._other_factors
 
         return attributes
 
+    def _get_key(self):
+        """
+        :rtype: tuple
+        :returns: values of `fields_to_compare`
+        """
+        if self._key is None:
+            self._key = (self.filename, self.secret_hash, self.type)
+
+        return self._key
+
     def __eq__(self, other):
+        if isinstance(other, PotentialSecret):
+            return self._get_key() == other._get_key()
+
         return all(
             getattr(self, field) == getattr(other, field)
             for field in self.fields_to_compare
@@ -122,12 +204,10 @@ class PotentialSecret:
         return not self.__eq__(other)
 
     def __hash__(self):
-        return hash(
-            tuple(
-                getattr(self, x)
-                for x in self.fields_to_compare
-            ),
-        )
+        if self._hash is None:
+            self._hash = hash(self._get_key())
+
+        return self._hash
 
     def __str__(self):  # pragma: no cover
         return (
@@ -137,3 +217,10 @@ class PotentialSecret:
             self.type,
             self.filename, self.lineno,
         )
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+
+    return value
@@ -1,16 +1,38 @@
 import codecs
+import io
 import json
+import mmap
 import os
 import re
 import sys
+import threading
+from contextlib import closing
 from time import gmtime
+from time import monotonic
 from time import strftime
 
 from detect_secrets import VERSION
+from detect_secrets.core import archive
+from detect_secrets.core import file_type
+from detect_secrets.core.code_snippet import CodeSnippetWindow
 from detect_secrets.core.constants import IGNORED_FILE_EXTENSIONS
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.lazy_results import BaselineEntry
+from detect_secrets.core.lazy_results import LazySecretsDict
 from detect_secrets.core.log import log
 from detect_secrets.core.potential_secret import PotentialSecret
+from detect_secrets.core.time_budget import TimeBudget
+from detect_secrets.core.verification import VerificationQueue
+from detect_secrets.core.verification_cache import VerificationCache
+from detect_secrets.plugins.base import LINES_OF_CONTEXT
+from detect_secrets.plugins.base import RegexBasedDetector
 from detect_secrets.plugins.common import initialize
+from detect_secrets.plugins.common import regex_backend
+from detect_secrets.plugins.common.applicability import iter_chunks
+from detect_secrets.plugins.common.buffer_scan import iter_lines
+from detect_secrets.plugins.common.buffer_scan import MappedFile
+from detect_secrets.plugins.common.decoders import DecoderPipeline
+from detect_secrets.plugins.common.factor_index import FactorIndex
 from detect_secrets.util import build_automaton
 
 
@@ -25,6 +47,17 @@ class SecretsCollection:
         word_list_hash=None,
         output_raw=False,
         output_verified_false=False,
+        buffer_scan=False,
+        mmap_scan=False,
+        long_line_threshold=None,
+        file_time_budget=None,
+        line_time_budget=None,
+        regex_engine=regex_backend.DEFAULT_ENGINE,
+        file_policies=None,
+        archive_limits=None,
+        verification_threads=None,
+        verification_cache=None,
+        request_policy=None,
     ):
         """
         :type plugins: tuple of detect_secrets.plugins.base.BasePlugin
@@ -41,6 +74,38 @@ class SecretsCollection:
         :param output_raw: whether or not to output the raw, unhashed secret.
         :type output_verified_false: bool
         :param output_verified_false: whether to output secrets that fail verification.
+        :type buffer_scan: bool
+        :param buffer_scan: whether regex based plugins should scan entire files at once,
+            rather than line by line.
+        :type mmap_scan: bool
+        :param mmap_scan: whether to memory-map files, and only decode the parts
+            of them that regex based plugins need.
+        :type long_line_threshold: int|None
+        :param long_line_threshold: lines longer than this are scanned in
+            overlapping windows, rather than all at once.
+        :type file_time_budget: float|None
+        :param file_time_budget: seconds after which to stop scanning a file.
+        :type line_time_budget: float|None
+        :param line_time_budget: seconds after which a plugin stops analyzing a line.
+        :type regex_engine: str
+        :param regex_engine: engine to run the denylists of regex based plugins with.
+        :type file_policies: dict|None
+        :param file_policies: class of generated file => what to do with files of
+            that class (see `detect_secrets.core.file_type`). By default, they are
+            scanned like any other file.
+        :type archive_limits: detect_secrets.core.archive.ArchiveLimits|None
+        :param archive_limits: if given, the files in archives are scanned (rather
+            than the archives being skipped), within these limits.
+        :type verification_threads: int|None
+        :param verification_threads: if given, secrets are verified in the
+            background by this many threads, while scanning continues. Results
+            are only complete after `wait_for_verification`.
+        :type verification_cache: VerificationCache|None
+        :param verification_cache: to reuse the results of verification from.
+            By default, each secret is only verified once, but nothing is saved.
+        :type request_policy: detect_secrets.plugins.common.http_session.RequestPolicy|None
+        :param request_policy: limits on the requests made to verify secrets in
+            the background (e.g. a deadline). By default, they only have a timeout.
         """
         self.data = {}
         self.plugins = plugins
@@ -51,9 +116,69 @@ class SecretsCollection:
         self.version = VERSION
         self.output_raw = output_raw
         self.output_verified_false = output_verified_false
+        self.buffer_scan = buffer_scan
+        self.mmap_scan = mmap_scan
+        self.long_line_threshold = long_line_threshold
+
+        if long_line_threshold:
+            for plugin in plugins:
+                plugin.long_line_threshold = long_line_threshold
+
+        self.time_budget = None
+        if file_time_budget or line_time_budget:
+            self.time_budget = TimeBudget(
+                file_seconds=file_time_budget,
+                line_seconds=line_time_budget,
+            )
+            for plugin in plugins:
+                plugin.time_budget = self.time_budget
+
+        self.regex_engine = regex_engine
+        for plugin in plugins:
+            if isinstance(plugin, RegexBasedDetector):
+                plugin.regex_engine = regex_engine
+
+        self.archive_limits = archive_limits
+
+        self.verification_cache = verification_cache or VerificationCache()
+        for plugin in plugins:
+            plugin.verification_cache = self.verification_cache
+
+        # So that each line is only decoded once, for all of the plugins.
+        self.decoder_pipeline = DecoderPipeline()
+        for plugin in plugins:
+            plugin.decoder_pipeline = self.decoder_pipeline
+
+        self.verification_queue = None
+        if verification_threads:
+            self.verification_queue = VerificationQueue(
+                max_workers=verification_threads,
+                request_policy=request_policy,
+            )
+            for plugin in plugins:
+                plugin.verification_queue = self.verification_queue
+
+        # Secrets found by several plugins are only verified once, after every
+        # plugin has analyzed the file. See `_verify_file_results`.
+        for plugin in plugins:
+            plugin.defer_verification = True
+
+        self.file_policies = dict(file_type.DEFAULT_FILE_POLICIES)
+        self.file_policies.update(file_policies or {})
+
+        # Files which were skipped, because their content looked binary.
+        self.binary_files_skipped = 0
+        self.binary_bytes_skipped = 0
+
+        # Secrets verified in the background => other results for the same
+        # secrets, which are given the same verdict once it is known.
+        self._duplicate_results = {}
+
+        # Files may be scanned from multiple threads.
+        self._lock = threading.Lock()
 
     @classmethod
-    def load_baseline_from_string(cls, string, plugin_filenames=None):
+    def load_baseline_from_string(cls, string, plugin_filenames=None, lazy=False):
         """Initializes a SecretsCollection object from string.
 
         :type string: str
@@ -62,6 +187,9 @@ class SecretsCollection:
         :type plugin_filenames: tuple
         :param plugin_filenames: list of plugins to import
 
+        :type lazy: bool
+        :param lazy: see `load_baseline_from_dict`.
+
         :rtype: SecretsCollection
         :raises: IOError
         """
@@ -69,13 +197,14 @@ class SecretsCollection:
             return cls.load_baseline_from_dict(
                 json.loads(string),
                 plugin_filenames=plugin_filenames,
+                lazy=lazy,
             )
         except (IOError, ValueError):
             log.error('Incorrectly formatted baseline!')
             raise
 
     @classmethod
-    def load_baseline_from_dict(cls, data, plugin_filenames=None):
+    def load_baseline_from_dict(cls, data, plugin_filenames=None, lazy=False):
         """Initializes a SecretsCollection object from dictionary.
 
         :type data: dict
@@ -84,6 +213,11 @@ class SecretsCollection:
         :type plugin_filenames: tuple
         :param plugin_filenames: the plugin filenames.
 
+        :type lazy: bool
+        :param lazy: if True, results are kept as lightweight BaselineEntry
+            records, and only turned into PotentialSecret objects when accessed.
+            This is meant for read-mostly consumers of large baselines.
+
         :rtype: SecretsCollection
         :raises: IOError
         """
@@ -112,6 +246,9 @@ class SecretsCollection:
             result.exclude_files = data['exclude']['files']
             result.exclude_lines = data['exclude']['lines']
 
+        if 'file_policies' in data:
+            result.file_policies.update(data['file_policies'])
+
         # In v0.12.7 the `--word-list` option got added
         automaton = None
         if 'word_list' in data:
@@ -139,20 +276,22 @@ class SecretsCollection:
         result.plugins = tuple(plugins)
 
         for filename in data['results']:
-            result.data[filename] = {}
+            records = (
+                BaselineEntry.from_json(filename, item)
+                for item in data['results'][filename]
+            )
 
-            for item in data['results'][filename]:
-                secret = PotentialSecret(
-                    item['type'],
+            if lazy:
+                result.data[filename] = LazySecretsDict(
                     filename,
-                    secret='will be replaced',
-                    lineno=item['line_number'],
-                    is_secret=item.get('is_secret'),
+                    records,
                     output_raw=result.output_raw,
-                    is_verified=item['is_verified'],
-                    verified_result=item.get('verified_result'),
                 )
-                secret.secret_hash = item['hashed_secret']
+                continue
+
+            result.data[filename] = {}
+            for record in records:
+                secret = record.to_potential_secret(result.output_raw)
                 result.data[filename][secret] = secret
 
         result.version = (
@@ -238,10 +377,32 @@ class SecretsCollection:
         """
         if os.path.islink(filename):
             return False
-        if os.path.splitext(filename)[1] in IGNORED_FILE_EXTENSIONS:
+
+        if self.archive_limits is not None and archive.is_archive(filename):
+            scan = self._scan_archive
+        elif os.path.splitext(filename)[1] in IGNORED_FILE_EXTENSIONS:
             return False
+        else:
+            scan = self._scan_file
+
+        if self.time_budget is None:
+            return scan(filename)
+
+        with self.time_budget.file(filename):
+            return scan(filename)
+
+        # The file took too long to scan, and was skipped.
+        return False
+
+    def _scan_file(self, filename):
         try:
-            with codecs.open(filename, encoding='utf-8') as f:
+            if self.mmap_scan:
+                with open(filename, 'rb') as f:
+                    self._extract_secrets_from_mapped_file(f, filename)
+
+                return True
+
+            with open(filename, 'rb') as f:
                 self._extract_secrets_from_file(f, filename)
 
             return True
@@ -249,6 +410,120 @@ class SecretsCollection:
             log.warning('Unable to open file: %s', filename)
             return False
 
+    def _scan_archive(self, filename):
+        try:
+            with open(filename, 'rb') as f:
+                log.info('Checking archive: %s', filename)
+
+                for member_filename, data in archive.iter_members(
+                    f,
+                    filename,
+                    self.archive_limits,
+                ):
+                    self._extract_secrets_from_file(
+                        io.BytesIO(data),
+                        member_filename,
+                    )
+
+            return True
+        except IOError:
+            log.warning('Unable to open file: %s', filename)
+            return False
+
+    def wait_for_verification(self):
+        """Waits for secrets that are verified in the background, and removes
+        those that failed verification (unless output_verified_false is set).
+        The results of verification are then saved to the cache file, if any.
+        """
+        if self.verification_queue is None:
+            self.verification_cache.save()
+            return
+
+        failed = set(self.verification_queue.join())
+        self.verification_cache.save()
+
+        with self._lock:
+            duplicate_results, self._duplicate_results = self._duplicate_results, {}
+
+        for result, duplicates in duplicate_results.items():
+            _copy_verdict(result, duplicates)
+            if result in failed:
+                failed.update(duplicates)
+
+        if not failed or self.output_verified_false:
+            return
+
+        for filename in list(self.data):
+            secrets = self.data[filename]
+            for secret in [secret for secret in secrets if secret in failed]:
+                del secrets[secret]
+
+            if not secrets:
+                del self.data[filename]
+
+    @property
+    def verification_skipped(self):
+        """
+        :rtype: dict
+        :returns: reason => number of secrets which weren't verified because
+            of it (e.g. the deadline passed).
+        """
+        if self.verification_queue is None:
+            return {}
+
+        return dict(self.verification_queue.skipped)
+
+    def get_file_context(self, filename):
+        """Files with the same contents and context have the same results,
+        apart from their filenames.
+
+        :type filename: str
+        :rtype: tuple
+        """
+        return (
+            os.path.splitext(filename)[1],
+            file_type.classify_by_name(filename),
+        ) + tuple(
+            (
+                plugin._get_line_cache_context(filename),
+                # Plugins may only apply to some paths.
+                plugin.is_applicable(filename),
+            )
+            for plugin in self.plugins
+        )
+
+    def copy_results(self, filename, duplicate_filename):
+        """Records the results of scanning `filename` for `duplicate_filename`,
+        a file with the same contents and context (see `get_file_context`).
+
+        :type filename: str
+        :type duplicate_filename: str
+        """
+        if sys.platform.lower() == 'win32':
+            filename = filename.replace('\\', '/')
+            duplicate_filename = duplicate_filename.replace('\\', '/')
+
+        filenames = [filename]
+        if self.archive_limits is not None:
+            # Results for the files within archives are stored separately.
+            filenames.extend(
+                key
+                for key in self.data
+                if key.startswith(filename + archive.MEMBER_SEPARATOR)
+            )
+
+        for key in filenames:
+            if key not in self.data:
+                continue
+
+            new_key = duplicate_filename + key[len(filename):]
+            file_results = {}
+            for secret in self.data[key]:
+                secret = secret.copy_to(new_key)
+                file_results[secret] = secret
+
+            self.data.setdefault(new_key, {}).update(file_results)
+
     def get_secret(self, filename, secret, type_=None):
         """Checks to see whether a secret is found in the collection.
 
@@ -315,24 +590,35 @@ class SecretsCollection:
                 'hash': self.word_list_hash,
             },
             'plugins_used': plugins_used,
+            'file_policies': self.file_policies,
             'results': results,
             'version': self.version,
         }
 
-    def _results_accumulator(self, filename):
+    def _results_accumulator(self, filename, plugins=None, get_lines=None):
         """
         :type filename: str
         :param filename: name of file, used as a key to store in self.data
 
+        :type plugins: tuple of detect_secrets.plugins.base.BasePlugin|None
+        :param plugins: to analyze the file with, if not all of them.
+
+        :type get_lines: function|None
+        :param get_lines: returns the lines of the file (again), so that the
+            results can be verified. If None, they aren't.
+
         :yields: (dict, detect_secrets.plugins.base.BasePlugin)
                  Caller is responsible for updating the dictionary with
                  results of plugin analysis.
         """
         file_results = {}
 
-        for plugin in self.plugins:
+        for plugin in self.plugins if plugins is None else plugins:
             yield file_results, plugin
 
+        if file_results and get_lines is not None:
+            self._verify_file_results(file_results, get_lines)
+
         if not file_results:
             return
 
@@ -345,23 +631,154 @@ class SecretsCollection:
         else:
             self.data[filename].update(file_results)
 
+    def _verify_file_results(self, file_results, get_lines):
+        """The same secret is often found by several plugins, on the same line
+        (e.g. by the KeywordDetector, as well as the detector for its provider).
+        So results are grouped by line and secret: the snippet for each line is
+        built once, each secret is verified once (by the first plugin that can
+        verify it), and its verdict is given to the other results for it.
+
+        :type file_results: dict
+        :param file_results: of every plugin, for a single file. Secrets which
+            fail verification are removed (unless output_verified_false is set).
+
+        :type get_lines: function
+        :param get_lines: returns the lines of the file.
+        """
+        verifiers = {
+            plugin.secret_type: plugin
+            for plugin in self.plugins
+            if plugin.verifies_results
+        }
+        if not verifiers:
+            return
+
+        # Line number => secret hash => results for the secret.
+        results_by_line = {}
+        for result in file_results:
+            results_by_line.setdefault(result.lineno, {}).setdefault(
+                result.secret_hash,
+                [],
+            ).append(result)
+
+        # Line number => results for each secret on the line which is verified,
+        # starting with the one to verify (from the first plugin that can).
+        groups = {}
+        for line_num, line_results in results_by_line.items():
+            for results in line_results.values():
+                results.sort(key=lambda result: result.type not in verifiers)
+                if results[0].type in verifiers:
+                    groups.setdefault(line_num, []).append(results)
+
+        if not groups:
+            return
+
+        factor_indexes = {
+            secret_type: FactorIndex(plugin.factor_regexes)
+            for secret_type, plugin in verifiers.items()
+            if plugin.factor_regexes
+        }
+
+        # Lines are streamed, as when they were analyzed. Only the lines up to
+        # the context of the last result are read.
+        window = CodeSnippetWindow(lines_of_context=LINES_OF_CONTEXT)
+        last_line_num = max(groups) + LINES_OF_CONTEXT
+        completed = []
+        for line_num, line in enumerate(get_lines(), start=1):
+            completed.extend(window.add_line(line))
+            if line_num in groups:
+                window.defer(groups[line_num])
+
+            if line_num >= last_line_num:
+                break
+
+        completed.extend(window.flush())
+
+        for line_groups, snippet in completed:
+            for factor_index in factor_indexes.values():
+                factor_index.add_lines(snippet.lines, snippet.start_line + 1)
+
+            content = str(snippet)
+            for results in line_groups:
+                result, duplicates = results[0], results[1:]
+                plugin = verifiers[result.type]
+                result.factor_index = factor_indexes.get(result.type)
+
+                if self.verification_queue is not None:
+                    self.verification_queue.submit(plugin, result, content)
+                    if duplicates:
+                        with self._lock:
+                            self._duplicate_results[result] = duplicates
+
+                    continue
+
+                is_verified = plugin.verify_result(result, content)
+                _copy_verdict(result, duplicates)
+                if (
+                    is_verified == VerifiedResult.VERIFIED_FALSE
+                    and not self.output_verified_false
+                ):
+                    for failed_result in results:
+                        del file_results[failed_result]
+
     def _extract_secrets_from_file(self, f, filename):
         """Extract secrets from a given file object.
 
-        :type f:        File object
+        :type f:        File object, opened in binary mode
         :type filename: string
         """
         try:
             log.info('Checking file: %s', filename)
 
-            for results, plugin in self._results_accumulator(filename):
-                results.update(
-                    plugin.analyze(
-                        f, filename, self.output_raw,
-                        self.output_verified_false,
-                    ),
-                )
-                f.seek(0)
+            # Binary files are sniffed before decoding, as they are rarely
+            # valid UTF-8.
+            sample = f.read(file_type.SNIFF_SIZE)
+            if file_type.is_binary(sample):
+                self._skip_binary_file(filename, f.seek(0, io.SEEK_END))
+                return
+
+            plugins = self._get_plugins_for_file(filename, sample)
+            f.seek(0)
+            with self.decoder_pipeline.file(filename, codecs.getreader('utf-8')(f)):
+                buffer = None
+                if self.buffer_scan:
+                    buffer = f.read().decode('utf-8')
+                    f.seek(0)
+                    plugins = self._get_applicable_plugins(plugins, filename, buffer)
+                else:
+                    # Otherwise, the file isn't read all at once (to check for the
+                    # literals that the plugins need).
+                    plugins = self._get_plugins_applicable_to_file(plugins, filename, f)
+
+                f = codecs.getreader('utf-8')(f)
+
+                for results, plugin in self._results_accumulator(
+                    filename,
+                    plugins,
+                    get_lines=lambda: _read_lines(f),
+                ):
+                    start_time = monotonic()
+                    if (
+                        buffer is not None
+                        and isinstance(plugin, RegexBasedDetector)
+                        and plugin.can_analyze_buffer(buffer, filename)
+                    ):
+                        results.update(
+                            plugin.analyze_buffer(
+                                buffer, filename, self.output_raw,
+                                self.output_verified_false,
+                            ),
+                        )
+                    else:
+                        results.update(
+                            plugin.analyze(
+                                f, filename, self.output_raw,
+                                self.output_verified_false,
+                            ),
+                        )
+                        f.seek(0)
+
+                    plugin.applicability_statistics.record_scan(monotonic() - start_time)
 
         except UnicodeDecodeError as error:
             log.warning(
@@ -369,6 +786,161 @@ class SecretsCollection:
                 filename, str(error),
             )
 
+    def _extract_secrets_from_mapped_file(self, f, filename):
+        """Extract secrets from a given file object, without decoding all of it.
+
+        :type f:        File object, opened in binary mode
+        :type filename: string
+        """
+        log.info('Checking file: %s', filename)
+
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be memory-mapped.
+            return
+
+        with closing(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)) as buffer:
+            sample = buffer[:file_type.SNIFF_SIZE]
+            if file_type.is_binary(sample):
+                self._skip_binary_file(filename, len(buffer))
+                return
+
+            decoded_file = codecs.getreader('utf-8')(buffer, errors='replace')
+            with self.decoder_pipeline.file(filename, decoded_file):
+                plugins = self._get_applicable_plugins(
+                    self._get_plugins_for_file(filename, sample),
+                    filename,
+                    buffer,
+                )
+                mapped_file = MappedFile(buffer)
+
+                for results, plugin in self._results_accumulator(
+                    filename,
+                    plugins,
+                    get_lines=lambda: _read_lines(decoded_file),
+                ):
+                    start_time = monotonic()
+                    if (
+                        isinstance(plugin, RegexBasedDetector)
+                        and plugin.can_analyze_mapped_file(mapped_file, filename)
+                    ):
+                        results.update(
+                            plugin.analyze_mapped_file(
+                                mapped_file, filename, self.output_raw,
+                                self.output_verified_false,
+                            ),
+                        )
+                    else:
+                        # Other plugins need the whole file, which is decoded as it is read.
+                        buffer.seek(0)
+                        results.update(
+                            plugin.analyze(
+                                codecs.getreader('utf-8')(buffer, errors='replace'),
+                                filename, self.output_raw,
+                                self.output_verified_false,
+                            ),
+                        )
+
+                    plugin.applicability_statistics.record_scan(monotonic() - start_time)
+
+    def _get_plugins_for_file(self, filename, sample):
+        """
+        :type filename: str
+        :type sample: str|bytes
+        :param sample: (up to) the first SNIFF_SIZE bytes of the file.
+
+        :rtype: tuple of detect_secrets.plugins.base.BasePlugin
+        :returns: the plugins to analyze the file with, according to the
+            policy for its class of generated file.
+        """
+        file_class = file_type.classify(filename, sample)
+        policy = self.file_policies.get(file_class, file_type.SCAN)
+
+        if policy == file_type.SKIP:
+            log.info('Skipping %s file: %s', file_class, filename)
+            return ()
+
+        if policy == file_type.REGEX_ONLY:
+            log.info('Only running regex based plugins on %s file: %s', file_class, filename)
+            return tuple(
+                plugin
+                for plugin in self.plugins
+                if isinstance(plugin, RegexBasedDetector)
+            )
+
+        return self.plugins
+
+    def _get_applicable_plugins(self, plugins, filename, content=None):
+        """
+        :type plugins: tuple of detect_secrets.plugins.base.BasePlugin
+        :type filename: str
+        :type content: str|bytes|mmap.mmap|None
+        :param content: of the file, if it has been read.
+
+        :rtype: tuple of detect_secrets.plugins.base.BasePlugin
+        :returns: the plugins which apply to the file, so that the others
+            aren't run on it.
+        """
+        applicable = []
+        for plugin in plugins:
+            if plugin.is_applicable(filename, content):
+                applicable.append(plugin)
+            else:
+                plugin.applicability_statistics.record_skip()
+
+        return tuple(applicable)
+
+    def _get_plugins_applicable_to_file(self, plugins, filename, f):
+        """Like `_get_applicable_plugins`, but the file is searched for the
+        plugins' literals a chunk at a time, if they need its content.
+
+        :type plugins: tuple of detect_secrets.plugins.base.BasePlugin
+        :type filename: str
+        :type f: file object, opened in binary mode
+        :param f: which is left at its start.
+
+        :rtype: tuple of detect_secrets.plugins.base.BasePlugin
+        """
+        if not _needs_content(plugins):
+            return self._get_applicable_plugins(plugins, filename)
+
+        overlap = max(
+            plugin.applicability.max_literal_length
+            for plugin in plugins
+            if plugin.applicability is not None
+        ) - 1
+
+        is_applicable = [False] * len(plugins)
+        for chunk in iter_chunks(f, overlap):
+            is_applicable = [
+                applies or plugin.is_applicable(filename, chunk)
+                for plugin, applies in zip(plugins, is_applicable)
+            ]
+            if all(is_applicable):
+                break
+
+        f.seek(0)
+
+        applicable = []
+        for plugin, applies in zip(plugins, is_applicable):
+            if applies:
+                applicable.append(plugin)
+            else:
+                plugin.applicability_statistics.record_skip()
+
+        return tuple(applicable)
+
+    def _skip_binary_file(self, filename, size):
+        """
+        :type filename: str
+        :type size: int
+        :param size: of the file, in bytes.
+        """
+        log.info('Skipping binary file: %s', filename)
+
+        with self._lock:
+            self.binary_files_skipped += 1
+            self.binary_bytes_skipped += size
+
     def _extract_secrets_from_patch(self, f, plugin, filename):
         """Extract secrets from a given patch file object.
 
@@ -398,6 +970,13 @@ class SecretsCollection:
         """Custom JSON encoder"""
         output = {}
         for filename in self.data:
+            if isinstance(self.data[filename], LazySecretsDict):
+                output[filename] = self.data[filename].json()
+                for item in output[filename]:
+                    del item['filename']
+
+                continue
+
             output[filename] = []
 
             for secret_hash in self.data[filename]:
@@ -420,3 +999,41 @@ class SecretsCollection:
 
     def __setitem__(self, key, value):
         self.data[key] = value
+
+
+def _needs_content(plugins):
+    """
+    :type plugins: tuple of detect_secrets.plugins.base.BasePlugin
+    :rtype: bool
+    :returns: whether the contents of files are needed, to decide which of the
+        plugins apply to them.
+    """
+    return any(
+        plugin.applicability is not None and plugin.applicability.needs_content
+        for plugin in plugins
+    )
+
+
+def _read_lines(f):
+    """
+    :type f: file object
+    :param f: which may already have been read.
+
+    :rtype: iterable of str
+    :returns: the lines of the file, from the start.
+    """
+    f.seek(0)
+    return iter_lines(f)
+
+
+def _copy_verdict(result, duplicates):
+    """
+    :type result: PotentialSecret
+    :param result: which has been verified.
+
+    :type duplicates: list of PotentialSecret
+    :param duplicates: other results for the same secret.
+    """
+    for duplicate in duplicates:
+        duplicate.is_verified = result.is_verified
+        duplicate.verified_result = result.verified_result
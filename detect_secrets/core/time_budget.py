@@ -0,0 +1,254 @@
+import signal
+import threading
+from contextlib import contextmanager
+from time import monotonic
+
+from detect_secrets.core.log import log
+
+
+# The watchdog checks budgets this many times per (smallest) budget.
+CHECKS_PER_BUDGET = 10
+
+MIN_CHECK_INTERVAL = 0.01
+
+
+class TimeBudgetExceeded(BaseException):
+    """Raised when a file takes too long to scan.
+
+    This is derived from BaseException, so that plugins catching broad
+    exceptions (e.g. when trying different file parsers) don't swallow it.
+    """
+    budget = 'file'
+
+    def __init__(self, seconds, filename=None, plugin=None, line_number=None):
+        """
+        :type seconds: float
+        :param seconds: the budget that was exceeded.
+
+        :type filename: str|None
+        :type plugin: detect_secrets.plugins.base.BasePlugin|None
+        :type line_number: int|None
+        """
+        super(TimeBudgetExceeded, self).__init__(seconds, filename, plugin, line_number)
+
+        self.seconds = seconds
+        self.filename = filename
+        self.plugin = plugin
+        self.line_number = line_number
+
+    def json(self):
+        return {
+            'budget': self.budget,
+            'seconds': self.seconds,
+            'filename': self.filename,
+            'plugin': self.plugin.__class__.__name__ if self.plugin else None,
+            'line_number': self.line_number,
+        }
+
+    def __str__(self):
+        message = '{} exceeded the {} time budget of {}s'.format(
+            self.filename,
+            self.budget,
+            self.seconds,
+        )
+        if self.plugin:
+            message += ' in {}'.format(self.plugin.__class__.__name__)
+        if self.line_number:
+            message += ' on line {}'.format(self.line_number)
+
+        return message
+
+
+class LineTimeBudgetExceeded(TimeBudgetExceeded):
+    """Raised when a single plugin takes too long to analyze a single line."""
+    budget = 'line'
+
+
+class _FileState(threading.local):
+    """What is being scanned, which is tracked separately for each thread."""
+
+    def __init__(self):
+        self.filename = None
+        self.file_deadline = None
+        self.plugin = None
+        self.line_number = None
+        self.line_start = None
+
+
+class TimeBudget:
+    """Limits the time spent scanning each file, and analyzing each line
+    of it with a single plugin.
+
+    Budgets are checked cooperatively, whenever a plugin starts and finishes
+    analyzing a line. Where possible (i.e. on the main thread, on platforms
+    with SIGALRM), a watchdog timer also interrupts evaluations that are
+    stuck, e.g. in a regex with catastrophic backtracking.
+
+    Every budget that is exceeded is recorded in `exceeded`. Files may be
+    scanned in different threads at the same time, but the watchdog only runs
+    on the main thread.
+    """
+
+    def __init__(self, file_seconds=None, line_seconds=None):
+        """
+        :type file_seconds: float|None
+        :param file_seconds: maximum time to spend on each file.
+
+        :type line_seconds: float|None
+        :param line_seconds: maximum time for a plugin to spend on each line.
+        """
+        self.file_seconds = file_seconds
+        self.line_seconds = line_seconds
+
+        self.exceeded = []
+
+        self._state = _FileState()
+
+        self._has_watchdog = False
+        self._previous_handler = None
+
+    @contextmanager
+    def file(self, filename):
+        """Applies the file budget to the enclosed block. If it is exceeded,
+        the block is abandoned, and the timeout is recorded.
+
+        :type filename: str
+        """
+        self._state.filename = filename
+        if self.file_seconds:
+            self._state.file_deadline = monotonic() + self.file_seconds
+
+        self._start_watchdog()
+        try:
+            yield
+        except TimeBudgetExceeded as error:
+            self._record(error)
+        finally:
+            self._stop_watchdog()
+
+            self._state.filename = None
+            self._state.file_deadline = None
+            self._end_line()
+
+    def start_line(self, plugin, line_number):
+        """
+        :type plugin: detect_secrets.plugins.base.BasePlugin
+        :type line_number: int
+        """
+        now = monotonic()
+        if self._state.file_deadline is not None and now > self._state.file_deadline:
+            raise TimeBudgetExceeded(
+                self.file_seconds,
+                self._state.filename,
+                plugin,
+                line_number,
+            )
+
+        self._state.plugin = plugin
+        self._state.line_number = line_number
+        self._state.line_start = now
+
+    def end_line(self, error=None):
+        """
+        :type error: LineTimeBudgetExceeded|None
+        :param error: raised while analyzing the line, if any.
+
+        :rtype: bool
+        :returns: False if the line exceeded its budget. The timeout is recorded,
+            and the results for the line should be discarded.
+        """
+        if (
+            error is None
+            and self.line_seconds
+            and self._state.line_start is not None
+            and monotonic() - self._state.line_start > self.line_seconds
+        ):
+            error = LineTimeBudgetExceeded(
+                self.line_seconds,
+                self._state.filename,
+                self._state.plugin,
+                self._state.line_number,
+            )
+
+        self._end_line()
+
+        if error is None:
+            return True
+
+        self._record(error)
+        return False
+
+    def json(self):
+        """
+        :rtype: list of dict
+        """
+        return [error.json() for error in self.exceeded]
+
+    def _record(self, error):
+        log.warning('Skipped: %s', error)
+        self.exceeded.append(error)
+
+    def _end_line(self):
+        self._state.plugin = None
+        self._state.line_number = None
+        self._state.line_start = None
+
+    def _start_watchdog(self):
+        if (
+            not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()
+        ):
+            return
+
+        budgets = [
+            seconds
+            for seconds in (self.file_seconds, self.line_seconds)
+            if seconds
+        ]
+        if not budgets:
+            return
+
+        interval = max(min(budgets) / CHECKS_PER_BUDGET, MIN_CHECK_INTERVAL)
+        self._previous_handler = signal.signal(signal.SIGALRM, self._check)
+        self._has_watchdog = True
+        signal.setitimer(signal.ITIMER_REAL, interval, interval)
+
+    def _stop_watchdog(self):
+        if not self._has_watchdog:
+            return
+
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(
+            signal.SIGALRM,
+            # Handlers that weren't installed from Python can't be restored.
+            self._previous_handler
+            if self._previous_handler is not None
+            else signal.SIG_DFL,
+        )
+        self._has_watchdog = False
+        self._previous_handler = None
+
+    def _check(self, signum, frame):
+        """SIGALRM handler, which interrupts whatever is running when a budget
+        is exceeded.
+        """
+        now = monotonic()
+        if (
+            self.line_seconds
+            and self._state.line_start is not None
+            and now - self._state.line_start > self.line_seconds
+        ):
+            raise LineTimeBudgetExceeded(
+                self.line_seconds,
+                self._state.filename,
+                self._state.plugin,
+                self._state.line_number,
+            )
+
+        if self._state.file_deadline is not None and now > self._state.file_deadline:
+            raise TimeBudgetExceeded(
+                self.file_seconds,
+                self._state.filename,
+                self._state.plugin,
+                self._state.line_number,
+            )
@@ -3,6 +3,12 @@ from collections import namedtuple
 
 from detect_secrets import VERSION
 from detect_secrets.constants import DEFAULT_GHE_INSTANCE
+from detect_secrets.core import file_type
+from detect_secrets.core import verification
+from detect_secrets.core import verification_cache
+from detect_secrets.core.archive import ArchiveLimits
+from detect_secrets.plugins.common import http_session
+from detect_secrets.plugins.common import regex_backend
 
 
 def add_exclude_lines_argument(parser):
@@ -42,6 +48,99 @@ def add_no_verify_flag(parser):
     )
 
 
+def _argparse_positive_int(string):
+    """Custom type for argparse to enforce positive integers"""
+    value = int(string)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(
+            '%s must be a positive integer' % string,
+        )
+
+    return value
+
+
+def _argparse_positive_float(string):
+    """Custom type for argparse to enforce positive numbers"""
+    value = float(string)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(
+            '%s must be a positive number' % string,
+        )
+
+    return value
+
+
+def add_verification_threads_argument(parser):
+    parser.add_argument(
+        '--verification-threads',
+        type=_argparse_positive_int,
+        default=verification.DEFAULT_MAX_WORKERS,
+        help=(
+            'Number of secrets to verify at the same time. '
+            'Defaults to %(default)s.'
+        ),
+    )
+
+
+def add_verification_limits_arguments(parser):
+    parser.add_argument(
+        '--verification-timeout',
+        type=_argparse_positive_float,
+        default=http_session.DEFAULT_TIMEOUT,
+        metavar='SECONDS',
+        help=(
+            'Stop waiting for each request made to verify a secret after this '
+            'long. Defaults to %(default)s.'
+        ),
+    )
+    parser.add_argument(
+        '--verification-deadline',
+        type=_argparse_positive_float,
+        metavar='SECONDS',
+        help=(
+            'Stop verifying secrets this long after starting. Secrets that are '
+            'not verified by then are left unverified. Skipped secrets are logged.'
+        ),
+    )
+
+
+def add_verification_cache_arguments(parser):
+    parser.add_argument(
+        '--verification-cache',
+        metavar='FILENAME',
+        help=(
+            'Remember the results of verifying secrets in this file, so that they '
+            'are not verified again (until they expire). Secrets are not stored.'
+        ),
+    )
+    parser.add_argument(
+        '--verified-true-ttl',
+        type=_argparse_positive_float,
+        default=(
+            verification_cache.DEFAULT_VERIFIED_TRUE_TTL
+            / verification_cache.SECONDS_PER_HOUR
+        ),
+        metavar='HOURS',
+        help=(
+            'With --verification-cache, verify valid secrets again after this '
+            'long. Defaults to %(default)s.'
+        ),
+    )
+    parser.add_argument(
+        '--verified-false-ttl',
+        type=_argparse_positive_float,
+        default=(
+            verification_cache.DEFAULT_VERIFIED_FALSE_TTL
+            / verification_cache.SECONDS_PER_HOUR
+        ),
+        metavar='HOURS',
+        help=(
+            'With --verification-cache, verify invalid secrets again after this '
+            'long. Defaults to %(default)s.'
+        ),
+    )
+
+
 def add_output_verified_false_flag(parser):
     parser.add_argument(
         '--output-verified-false',
@@ -67,6 +166,7 @@ class ParserBuilder(object):
             ._add_word_list_argument()\
             ._add_use_all_plugins_argument()\
             ._add_no_verify_flag()\
+            ._add_verification_cache_arguments()\
             ._add_output_verified_false_flag()\
             ._add_fail_on_unaudited_flag()
 
@@ -79,7 +179,7 @@ class ParserBuilder(object):
             dest='action',
         )
 
-        for action_parser in (ScanOptions, AuditOptions):
+        for action_parser in (ScanOptions, AuditOptions, VerifyOptions):
             action_parser(self.subparser).add_arguments()
 
         return self
@@ -141,6 +241,10 @@ class ParserBuilder(object):
         add_no_verify_flag(self.parser)
         return self
 
+    def _add_verification_cache_arguments(self):
+        add_verification_cache_arguments(self.parser)
+        return self
+
     def _add_output_verified_false_flag(self):
         add_output_verified_false_flag(self.parser)
         return self
@@ -217,7 +321,151 @@ class ScanOptions:
             help='Scan all files recursively (as compared to only scanning git tracked files).',
         )
 
+        self.parser.add_argument(
+            '--buffer-scan',
+            action='store_true',
+            help=(
+                'Run regex based plugins once over the contents of each file, '
+                'rather than line by line. Results are the same, but large files '
+                'are scanned faster.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--mmap-scan',
+            action='store_true',
+            help=(
+                'Memory-map each file, and run regex based plugins over its raw '
+                'contents, only decoding lines that may contain secrets. Invalid '
+                'UTF-8 is replaced, rather than causing the file to be skipped.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--long-line-threshold',
+            type=_argparse_positive_int,
+            metavar='CHARACTERS',
+            help=(
+                'Scan lines longer than this in overlapping windows, rather than '
+                'all at once (e.g. for minified files). Secrets longer than '
+                '1000 characters may be missed on these lines.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--file-time-budget',
+            type=_argparse_positive_float,
+            metavar='SECONDS',
+            help=(
+                'Skip files that take longer than this to scan. Skipped files '
+                'are logged.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--line-time-budget',
+            type=_argparse_positive_float,
+            metavar='SECONDS',
+            help=(
+                'Skip lines that a single plugin takes longer than this to '
+                'analyze. Skipped lines are logged.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--regex-engine',
+            type=self._argparse_regex_engine,
+            choices=regex_backend.ENGINES,
+            default=regex_backend.DEFAULT_ENGINE,
+            help=(
+                'Regex engine for the patterns of regex based plugins. re2 runs in '
+                'linear time, so it can\'t backtrack catastrophically. Patterns that '
+                'it doesn\'t support (e.g. with lookarounds) still use re. '
+                'Requires the `google-re2` package.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--generated-files',
+            choices=file_type.POLICIES,
+            metavar='POLICY',
+            help=(
+                'What to do with generated files, e.g. minified JavaScript and '
+                'source maps: scan them, only run regex based plugins on them '
+                '(skipping entropy and keyword checks), or skip them. One of '
+                '{%(choices)s}. Defaults to the policy in the baseline being '
+                'updated, or scan.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--lockfiles',
+            choices=file_type.POLICIES,
+            metavar='POLICY',
+            help=(
+                'What to do with dependency lockfiles, e.g. package-lock.json '
+                'and poetry.lock. Same choices as --generated-files.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--threads',
+            type=_argparse_positive_int,
+            default=1,
+            help=(
+                'Number of files to scan at the same time. This is fastest on '
+                'free-threaded builds of Python. Defaults to %(default)s.'
+            ),
+        )
+
+        add_verification_threads_argument(self.parser)
+        add_verification_limits_arguments(self.parser)
+
+        self.parser.add_argument(
+            '--scan-archives',
+            action='store_true',
+            help=(
+                'Scan the files in zip, jar, whl, tar and gzip archives (rather '
+                'than skipping them), without extracting them to disk. Secrets '
+                'are reported as e.g. archive.zip!/path/in/archive.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--archive-max-depth',
+            type=_argparse_positive_int,
+            default=ArchiveLimits().max_depth,
+            metavar='DEPTH',
+            help=(
+                'With --scan-archives, skip archives nested deeper than this. '
+                'Defaults to %(default)s.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--archive-max-members',
+            type=_argparse_positive_int,
+            default=ArchiveLimits().max_members,
+            metavar='FILES',
+            help=(
+                'With --scan-archives, stop scanning an archive after this many '
+                'files. Defaults to %(default)s.'
+            ),
+        )
+
+        self.parser.add_argument(
+            '--archive-max-size',
+            type=_argparse_positive_int,
+            default=ArchiveLimits().max_size // (1024 * 1024),
+            metavar='MEGABYTES',
+            help=(
+                'With --scan-archives, stop scanning an archive after '
+                'decompressing this much of it. Defaults to %(default)s.'
+            ),
+        )
+
         add_no_verify_flag(self.parser)
+        add_verification_cache_arguments(self.parser)
         add_output_verified_false_flag(self.parser)
 
         return self
@@ -243,6 +491,15 @@ class ScanOptions:
         )
         return self
 
+    def _argparse_regex_engine(self, string):
+        """Custom type for argparse to enforce installed regex engines"""
+        if string in regex_backend.ENGINES and not regex_backend.is_available(string):
+            raise argparse.ArgumentTypeError(
+                'Please install the `google-re2` package to use %s' % string,
+            )
+
+        return string
+
 
 class AuditOptions:
     def __init__(self, subparser):
@@ -358,6 +615,29 @@ class AuditOptions:
         return self
 
 
+class VerifyOptions:
+    def __init__(self, subparser):
+        self.parser: argparse.ArgumentParser = subparser.add_parser(
+            'verify',
+        )
+
+    def add_arguments(self):
+        self.parser.add_argument(
+            'filename',
+            nargs=1,
+            help=(
+                'Verify the secrets in a given baseline file (e.g. one created '
+                'with `scan --no-verify`), and record the results in it.'
+            ),
+        )
+
+        add_verification_threads_argument(self.parser)
+        add_verification_limits_arguments(self.parser)
+        add_verification_cache_arguments(self.parser)
+
+        return self
+
+
 class PluginDescriptor(
     namedtuple(
         'PluginDescriptor',
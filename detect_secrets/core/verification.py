@@ -0,0 +1,124 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.plugins.common import http_session
+
+
+# Verification is mostly waiting on the network, so many secrets can be
+# verified at the same time.
+DEFAULT_MAX_WORKERS = 8
+
+# Requests in flight to each provider, so that none of them are flooded
+# (and start rate limiting us).
+DEFAULT_MAX_PER_PROVIDER = 4
+
+
+class VerificationQueue:
+    """Verifies secrets in the background, while files continue to be scanned.
+
+    Each provider (i.e. type of secret) has its own pool of threads, of at most
+    `max_per_provider`, so that a slow provider can't hold up the others. At
+    most `max_workers` secrets are verified at the same time.
+
+    Requests are made within the limits of the request policy. Secrets which
+    aren't verified because of it (e.g. after its deadline) are unverified,
+    and the reasons are counted in `skipped`.
+    """
+
+    def __init__(
+        self,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_per_provider=DEFAULT_MAX_PER_PROVIDER,
+        request_policy=None,
+    ):
+        """
+        :type max_workers: int
+        :type max_per_provider: int
+
+        :type request_policy: http_session.RequestPolicy|None
+        :param request_policy: by default, requests have the default timeout,
+            and there is no deadline.
+        """
+        self.max_workers = max_workers
+        self.max_per_provider = max_per_provider
+        self.request_policy = request_policy or http_session.RequestPolicy()
+
+        # Reason => number of secrets which weren't verified because of it.
+        self.skipped = Counter()
+
+        self._executors = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        self._workers = threading.BoundedSemaphore(max_workers)
+
+    def submit(self, plugin, result, content):
+        """The outcome is recorded on the result, once it has been verified.
+
+        :type plugin: detect_secrets.plugins.base.BasePlugin
+        :type result: detect_secrets.core.potential_secret.PotentialSecret
+        :type content: str
+        :param content: lines of context around the result.
+        """
+        with self._lock:
+            future = self._get_executor(plugin.secret_type).submit(
+                self._verify,
+                plugin,
+                result,
+                content,
+            )
+            self._pending.append((result, future))
+
+    def join(self):
+        """Waits for every secret submitted so far to be verified.
+
+        :rtype: list of detect_secrets.core.potential_secret.PotentialSecret
+        :returns: secrets which failed verification.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            executors, self._executors = self._executors, {}
+
+        try:
+            return [
+                result
+                for result, future in pending
+                if future.result() == VerifiedResult.VERIFIED_FALSE
+            ]
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
+
+    def _get_executor(self, provider):
+        executor = self._executors.get(provider)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=min(self.max_per_provider, self.max_workers),
+            )
+            self._executors[provider] = executor
+
+        return executor
+
+    def _verify(self, plugin, result, content):
+        with self._workers:
+            remaining = self.request_policy.remaining()
+            if remaining is not None and remaining <= 0:
+                # Secrets that weren't started before the deadline are skipped,
+                # whether or not they would be verified through HTTP.
+                result.is_verified = False
+                self._record_skipped(http_session.SKIPPED_DEADLINE)
+                return VerifiedResult.UNVERIFIED
+
+            with http_session.apply_policy(self.request_policy) as get_skip_reason:
+                is_verified = plugin.verify_result(result, content)
+                skip_reason = get_skip_reason()
+
+            if is_verified == VerifiedResult.UNVERIFIED and skip_reason:
+                self._record_skipped(skip_reason)
+
+            return is_verified
+
+    def _record_skipped(self, reason):
+        with self._lock:
+            self.skipped[reason] += 1
@@ -0,0 +1,212 @@
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.log import log
+
+
+# TTLs are given in hours on the command line.
+SECONDS_PER_HOUR = 60 * 60
+
+# Valid secrets are checked again sooner, in case they have been revoked.
+DEFAULT_VERIFIED_TRUE_TTL = 24 * SECONDS_PER_HOUR
+DEFAULT_VERIFIED_FALSE_TTL = 7 * 24 * SECONDS_PER_HOUR
+
+CACHE_VERSION = 1
+
+
+class VerificationCache:
+    """Remembers the results of verifying secrets, so that each secret is only
+    verified once per scan, and (if there is a cache file) not again until
+    its result expires.
+
+    Secrets are never stored. Results are keyed by an HMAC of the plugin, the
+    secret and the other factors that it was verified with, using a random
+    key that is saved with the results. Results which recorded other factors
+    (e.g. the AWS secret access key that a key ID was verified with) are only
+    kept in memory, since those may be secrets themselves.
+    """
+
+    def __init__(
+        self,
+        filename=None,
+        verified_true_ttl=DEFAULT_VERIFIED_TRUE_TTL,
+        verified_false_ttl=DEFAULT_VERIFIED_FALSE_TTL,
+    ):
+        """
+        :type filename: str|None
+        :param filename: to load results from, and save them to.
+
+        :type verified_true_ttl: float
+        :param verified_true_ttl: seconds to remember valid secrets for.
+            If 0, they are verified every time.
+
+        :type verified_false_ttl: float
+        :param verified_false_ttl: seconds to remember invalid secrets for.
+            If 0, they are verified every time.
+        """
+        self.filename = filename
+        self.ttls = {
+            VerifiedResult.VERIFIED_TRUE: verified_true_ttl,
+            VerifiedResult.VERIFIED_FALSE: verified_false_ttl,
+        }
+
+        self._salt = None
+        # key => (VerifiedResult, time verified, other factors)
+        self._entries = {}
+
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+        if filename:
+            self._load()
+
+        if self._salt is None:
+            self._salt = os.urandom(32)
+
+    def get_key(self, plugin, token, factors=()):
+        """
+        :type plugin: detect_secrets.plugins.base.BasePlugin
+        :type token: str
+        :type factors: tuple of str
+        :param factors: anything else that the result depends on.
+            See BasePlugin.get_verification_factors.
+
+        :rtype: str
+        """
+        message = json.dumps(
+            [plugin.__dict__, token, list(factors)],
+            sort_keys=True,
+        )
+        return hmac.new(self._salt, message.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    @contextmanager
+    def lock(self, key):
+        """Held while a secret is verified, so that copies of it that are
+        verified at the same time wait for its result.
+
+        :type key: str
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            yield
+
+    def get(self, key):
+        """
+        :type key: str
+        :rtype: (VerifiedResult, dict)|None
+        :returns: the result, and the other factors recorded with it, if it
+            hasn't expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        is_verified, verified_at, other_factors = entry
+        if time.time() - verified_at >= self.ttls.get(is_verified, 0):
+            return None
+
+        return is_verified, dict(other_factors)
+
+    def put(self, key, is_verified, other_factors=None):
+        """Unverified results aren't stored, since the secret may be verifiable
+        next time.
+
+        :type key: str
+        :type is_verified: VerifiedResult
+        :type other_factors: dict|None
+        """
+        if self.ttls.get(is_verified, 0) <= 0:
+            return
+
+        self._entries[key] = (is_verified, time.time(), dict(other_factors or {}))
+
+    def save(self):
+        """Writes the results which haven't expired to the cache file, if any."""
+        if not self.filename:
+            return
+
+        now = time.time()
+        data = {
+            'version': CACHE_VERSION,
+            'key': self._salt.hex(),
+            'results': {
+                key: {
+                    'result': is_verified.name,
+                    'verified_at': verified_at,
+                }
+                for key, (is_verified, verified_at, other_factors) in list(self._entries.items())
+                if not other_factors and now - verified_at < self.ttls.get(is_verified, 0)
+            },
+        }
+
+        try:
+            directory = os.path.dirname(os.path.abspath(self.filename))
+            os.makedirs(directory, exist_ok=True)
+
+            # The file is only readable by its owner, and is replaced all at
+            # once, so that other scans never read half of it.
+            fd, temporary_filename = tempfile.mkstemp(dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+
+                os.replace(temporary_filename, self.filename)
+            except Exception:
+                os.remove(temporary_filename)
+                raise
+        except IOError as error:
+            log.warning('Unable to save verification cache %s: %s', self.filename, error)
+
+    def _load(self):
+        try:
+            with open(self.filename) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (IOError, ValueError) as error:
+            log.warning('Unable to read verification cache %s: %s', self.filename, error)
+            return
+
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            log.warning('Ignoring verification cache %s: unknown version', self.filename)
+            return
+
+        try:
+            salt = bytes.fromhex(data['key'])
+            entries = {
+                key: (VerifiedResult[entry['result']], float(entry['verified_at']), {})
+                for key, entry in data['results'].items()
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            log.warning('Ignoring invalid verification cache %s: %s', self.filename, error)
+            return
+
+        self._salt = salt
+        self._entries = entries
+
+
+def get_verification_cache(args):
+    """
+    :param args: output of `argparse.ArgumentParser.parse_args`, with the
+        arguments of `usage.add_verification_cache_arguments`.
+
+    :rtype: VerificationCache|None
+    :returns: None, if there is no cache file.
+    """
+    if not args.verification_cache:
+        return None
+
+    return VerificationCache(
+        args.verification_cache,
+        verified_true_ttl=args.verified_true_ttl * SECONDS_PER_HOUR,
+        verified_false_ttl=args.verified_false_ttl * SECONDS_PER_HOUR,
+    )
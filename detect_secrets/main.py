@@ -3,12 +3,16 @@ import sys
 
 from detect_secrets.core import audit
 from detect_secrets.core import baseline
+from detect_secrets.core import file_type
+from detect_secrets.core.archive import ArchiveLimits
 from detect_secrets.core.common import write_baseline_to_file
 from detect_secrets.core.log import log
 from detect_secrets.core.report import report
 from detect_secrets.core.secrets_collection import SecretsCollection
 from detect_secrets.core.usage import ParserBuilder
+from detect_secrets.core.verification_cache import get_verification_cache
 from detect_secrets.plugins.common import initialize
+from detect_secrets.plugins.common.http_session import RequestPolicy
 from detect_secrets.util import build_automaton
 from detect_secrets.util import version_check
 
@@ -73,6 +77,14 @@ def main(argv=None):
                     ),
                 )
 
+    elif args.action == 'verify':
+        audit.verify_baseline(
+            args.filename[0],
+            verification_threads=args.verification_threads,
+            verification_cache=get_verification_cache(args),
+            request_policy=_get_request_policy(args),
+        )
+
     elif args.action == 'audit':
         if args.report:
             report.execute(args)
@@ -173,6 +185,16 @@ def _perform_scan(args, plugins, automaton, word_list_hash):
         if not args.word_list_file and old_baseline.get('word_list'):
             args.word_list_file = old_baseline['word_list']['file']
 
+    file_policies = _get_file_policies(args, old_baseline)
+
+    archive_limits = None
+    if args.scan_archives:
+        archive_limits = ArchiveLimits(
+            max_depth=args.archive_max_depth,
+            max_members=args.archive_max_members,
+            max_size=args.archive_max_size * 1024 * 1024,
+        )
+
     # If we have knowledge of an existing baseline file, we should use
     # that knowledge and add it to our exclude_files regex.
     if args.import_filename:
@@ -188,6 +210,18 @@ def _perform_scan(args, plugins, automaton, word_list_hash):
         should_scan_all_files=args.all_files,
         output_raw=args.output_raw,
         output_verified_false=args.output_verified_false,
+        buffer_scan=args.buffer_scan,
+        mmap_scan=args.mmap_scan,
+        long_line_threshold=args.long_line_threshold,
+        file_time_budget=args.file_time_budget,
+        line_time_budget=args.line_time_budget,
+        regex_engine=args.regex_engine,
+        file_policies=file_policies,
+        archive_limits=archive_limits,
+        threads=args.threads,
+        verification_threads=args.verification_threads,
+        verification_cache=get_verification_cache(args),
+        request_policy=_get_request_policy(args),
     ).format_for_baseline_output()
 
     if old_baseline:
@@ -199,6 +233,17 @@ def _perform_scan(args, plugins, automaton, word_list_hash):
     return new_baseline
 
 
+def _get_request_policy(args):
+    """
+    :param args: output of `argparse.ArgumentParser.parse_args`
+    :rtype: RequestPolicy
+    """
+    return RequestPolicy(
+        timeout=args.verification_timeout,
+        deadline=args.verification_deadline,
+    )
+
+
 def _get_existing_baseline(import_filename):
     # Favors --update argument over stdin.
     if import_filename:
@@ -238,6 +283,27 @@ def _get_exclude_files(old_baseline):
         return old_baseline['exclude_regex']
 
 
+def _get_file_policies(args, old_baseline):
+    """
+    Favors `--generated-files` and `--lockfiles` CLI arguments over the
+    policies in an existing baseline (if given).
+
+    :rtype: dict
+    """
+    file_policies = {}
+    if old_baseline and old_baseline.get('file_policies'):
+        file_policies.update(old_baseline['file_policies'])
+
+    for file_class, policy in (
+        (file_type.GENERATED, args.generated_files),
+        (file_type.LOCKFILE, args.lockfiles),
+    ):
+        if policy:
+            file_policies[file_class] = policy
+
+    return file_policies
+
+
 def _add_baseline_to_exclude_files(args):
     """
     Modifies args.exclude_files in-place.
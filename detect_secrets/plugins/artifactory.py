@@ -3,6 +3,7 @@ import re
 import requests
 
 from .base import RegexBasedDetector
+from .common import http_session
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -24,7 +25,7 @@ class ArtifactoryDetector(RegexBasedDetector):
             if type(token) == bytes:
                 token = token.decode('UTF-8')
             headers = {'X-JFrog-Art-API': token}
-            response = requests.get(
+            response = http_session.get(
                 'https://%s/api/system/ping' % self.artifactory_url,
                 headers=headers,
             )
@@ -8,10 +8,10 @@ import string
 import textwrap
 from datetime import datetime
 
-import requests
-
 from .base import classproperty
 from .base import RegexBasedDetector
+from .common import http_session
+from .common.applicability import Applicability
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -19,6 +19,8 @@ class AWSKeyDetector(RegexBasedDetector):
     """Scans for AWS keys."""
     secret_type = 'AWS Access Key'
 
+    applicability = Applicability(content_literals=('AKIA', 'aws'))
+
     denylist = (
         re.compile(r'AKIA[0-9A-Z]{16}'),
         # This examines the variable name to identify AWS secret tokens.
@@ -27,17 +29,29 @@ class AWSKeyDetector(RegexBasedDetector):
         re.compile(r'aws.{0,20}?[\'\"]([0-9a-zA-Z/+]{40})[\'\"]'),
     )
 
+    factor_regexes = {
+        # AWS secret access keys are 40 characters long.
+        'secret_access_key': re.compile(
+            r'= *([\'"]?)([%s]{40})(\1)$' % (
+                string.ascii_letters + string.digits + '+/='
+            ),
+        ),
+    }
+
     @classproperty
     def flag_text(cls):
         return 'no-aws-scan'
 
+    def get_verification_factors(self, content, potential_secret=None):
+        return tuple(self._find_secret_access_keys(content, potential_secret))
+
     def verify(self, token, content, potential_secret=None):
         # As this verification process looks for multi-factor secrets, by assuming that
         # the identified secret token is the key ID (then looking for the corresponding secret).
         # we quit early if it fails our assumptions.
         if not self.denylist[0].match(token):
             return VerifiedResult.UNVERIFIED
-        secret_access_key = get_secret_access_keys(content)
+        secret_access_key = self._find_secret_access_keys(content, potential_secret)
         if not secret_access_key:
             return VerifiedResult.UNVERIFIED
 
@@ -48,14 +62,15 @@ class AWSKeyDetector(RegexBasedDetector):
 
         return VerifiedResult.VERIFIED_FALSE
 
+    def _find_secret_access_keys(self, content, potential_secret=None):
+        return [
+            match[1]
+            for match in self.find_factors('secret_access_key', content, potential_secret)
+        ]
+
 
 def get_secret_access_keys(content):
-    # AWS secret access keys are 40 characters long.
-    regex = re.compile(
-        r'= *([\'"]?)([%s]{40})(\1)$' % (
-            string.ascii_letters + string.digits + '+/='
-        ),
-    )
+    regex = AWSKeyDetector.factor_regexes['secret_access_key']
 
     return [
         match[1]
@@ -188,7 +203,7 @@ def query_aws(access_key, secret_access_key, headers, body):  # pragma: no cover
     )
 
     # Step #5: Finally send the request
-    response = requests.post(
+    response = http_session.post(
         'https://%s' % headers['Host'],
         headers=headers,
         data=body,
@@ -4,12 +4,15 @@ This plugin searches for Azure Storage Account access keys.
 import re
 
 from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.common.applicability import Applicability
 
 
 class AzureStorageKeyDetector(RegexBasedDetector):
     """Scans for Azure Storage Account access keys."""
     secret_type = 'Azure Storage Account access key'
 
+    applicability = Applicability(content_literals=('AccountKey=',))
+
     denylist = [
         # Account Key (AccountKey=xxxxxxxxx)
         re.compile(r'AccountKey=[a-zA-Z0-9+\/=]{88}'),
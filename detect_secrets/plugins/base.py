@@ -1,14 +1,31 @@
-import base64
-import binascii
 import re
 from abc import ABCMeta
 from abc import abstractmethod
 from abc import abstractproperty
 
+import requests
+
+from .common import regex_backend
+from .common.applicability import ApplicabilityStatistics
+from .common.buffer_scan import compile_for_buffer
+from .common.buffer_scan import compile_for_bytes
+from .common.buffer_scan import get_max_match_length
+from .common.buffer_scan import has_other_line_boundaries
+from .common.buffer_scan import is_line_local
+from .common.buffer_scan import iter_lines
+from .common.buffer_scan import LineIndex
 from .common.constants import ALLOWLIST_REGEXES
+from .common.decoders import DecoderPipeline
+from .common.decoders import get_decoders
+from .common.factor_index import FactorIndex
+from .common.filetype import determine_file_type
+from .common.line_cache import LineResultCache
 from detect_secrets.core.code_snippet import CodeSnippetHighlighter
+from detect_secrets.core.code_snippet import CodeSnippetWindow
 from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.log import log
 from detect_secrets.core.potential_secret import PotentialSecret
+from detect_secrets.core.time_budget import LineTimeBudgetExceeded
 
 # NOTE: In this whitepaper (Section V-D), it suggests that there's an
 #       80% chance of finding a multi-factor secret (e.g. username +
@@ -19,6 +36,11 @@ from detect_secrets.core.potential_secret import PotentialSecret
 #       https://www.ndss-symposium.org/wp-content/uploads/2019/02/ndss2019_04B-3_Meli_paper.pdf
 LINES_OF_CONTEXT = 7
 
+# When long lines are split into windows, neighboring windows overlap by the
+# length of the longest possible secret. Patterns without an upper bound are
+# assumed to not match anything longer than this.
+MAX_SECRET_LENGTH = 1000
+
 
 class classproperty(property):
     def __get__(self, cls, owner):
@@ -50,6 +72,14 @@ class BasePlugin:
     """
     __metaclass__ = ABCMeta
 
+    # Name => regex (or tuple of regexes) for each of the other factors that
+    # secrets are verified with (e.g. usernames). See `find_factors`.
+    factor_regexes = {}
+
+    # Optionally declares the files that secrets can be found in, so that the
+    # plugin isn't run on the others. See `is_applicable`.
+    applicability = None
+
     @abstractproperty
     def secret_type(self):
         raise NotImplementedError
@@ -85,6 +115,38 @@ class BasePlugin:
             else []
         )
 
+        self.line_cache = LineResultCache()
+
+        # Files that the plugin was run on, or skipped because it doesn't
+        # apply to them.
+        self.applicability_statistics = ApplicabilityStatistics()
+
+        # Decodes encoded values in lines, so that their contents are scanned
+        # too. This may be shared with other plugins, so that each line is
+        # only decoded once.
+        self.decoder_pipeline = DecoderPipeline()
+
+        # Lines longer than this are scanned in overlapping windows, rather
+        # than all at once. See `_analyze_long_line`.
+        self.long_line_threshold = None
+
+        # Optionally limits the time spent on each line.
+        # See detect_secrets.core.time_budget.TimeBudget.
+        self.time_budget = None
+
+        # Optionally verifies secrets in the background, rather than while
+        # scanning. See detect_secrets.core.verification.VerificationQueue.
+        self.verification_queue = None
+
+        # Optionally remembers the results of verification.
+        # See detect_secrets.core.verification_cache.VerificationCache.
+        self.verification_cache = None
+
+        # Whether results are left for the caller to verify, once every plugin
+        # has analyzed the file, rather than as they are found.
+        # See detect_secrets.core.secrets_collection.SecretsCollection.
+        self.defer_verification = False
+
     @classproperty
     def flag_text(cls):
         name = cls.__name__
@@ -106,9 +168,14 @@ class BasePlugin:
 
     def _is_excluded_line(self, line):
         return (
-            any(
-                allowlist_regex.search(line)
-                for allowlist_regex in ALLOWLIST_REGEXES
+            (
+                # Every allowlist comment contains this, and checking for it is much
+                # cheaper than running each regex over (possibly very long) lines.
+                'pragma' in line
+                and any(
+                    allowlist_regex.search(line)
+                    for allowlist_regex in ALLOWLIST_REGEXES
+                )
             )
             or
             (
@@ -117,6 +184,28 @@ class BasePlugin:
             )
         )
 
+    def is_applicable(self, filename, content=None):
+        """
+        :type filename: str
+        :type content: str|bytes|mmap.mmap|None
+        :param content: of the file. If None, only its path is checked.
+
+        :rtype: bool
+        :returns: whether the plugin can find secrets in the file, according
+            to its `applicability`.
+        """
+        if self.applicability is None:
+            return True
+
+        if not self.applicability.applies_to_path(filename):
+            return False
+
+        # Encoded values may only contain the literals once they are decoded.
+        if content is None or self.decoder_pipeline.get_decoders(filename):
+            return True
+
+        return self.applicability.applies_to_content(content)
+
     def analyze(self, file, filename, output_raw=False, output_verified_false=False):
         """
         :param file:     The File object itself.
@@ -128,49 +217,412 @@ class BasePlugin:
                                detect_secrets.core.potential_secret         }
         """
         potential_secrets = {}
-        file_lines = tuple(file.readlines())
-        for line_num, line in enumerate(file_lines, start=1):
-            if self._is_excluded_line(line):
-                continue
+        should_verify = self._should_verify_results()
+
+        # Lines are streamed, rather than read all at once. Verification is
+        # deferred until the lines of context following a result are available.
+        window = CodeSnippetWindow(lines_of_context=LINES_OF_CONTEXT)
+        factor_index = self._get_factor_index()
+        with self.decoder_pipeline.file(filename, file):
+            for line_num, line in enumerate(iter_lines(file), start=1):
+                if should_verify:
+                    potential_secrets.update(
+                        self._verify_snippets(
+                            window.add_line(line),
+                            output_verified_false,
+                            factor_index,
+                        ),
+                    )
+
+                if self._is_excluded_line(line):
+                    continue
+
+                results = self._analyze_line_within_budget(line, line_num, filename, output_raw)
+                if not results:
+                    continue
+
+                if not should_verify:
+                    potential_secrets.update(results)
+                    continue
+
+                window.defer(results)
+
+        potential_secrets.update(
+            self._verify_snippets(window.flush(), output_verified_false, factor_index),
+        )
 
-            results = self.analyze_line(line, line_num, filename, output_raw)
-            if not results:
-                continue
+        return potential_secrets
 
-            if not self.should_verify:
-                potential_secrets.update(results)
-                continue
+    def _verify_snippets(self, completed, output_verified_false=False, factor_index=None):
+        """
+        :type completed: list of (dict, CodeSnippet)
+        :param completed: output of `analyze_line`, with the snippet
+            of the line that it was found on.
 
-            filtered_results = {}
+        :type output_verified_false: bool
+
+        :type factor_index: FactorIndex|None
+        :param factor_index: of the file, which the snippets are added to.
+
+        :rtype: dict
+        :returns: results, without secrets that failed verification
+            (unless output_verified_false is set).
+        """
+        filtered_results = {}
+        for results, snippet in completed:
+            if factor_index is not None:
+                factor_index.add_lines(snippet.lines, snippet.start_line + 1)
+
+            content = str(snippet)
             for result in results:
-                snippet = CodeSnippetHighlighter().get_code_snippet(
-                    file_lines,
-                    result.lineno,
-                    lines_of_context=LINES_OF_CONTEXT,
+                result.factor_index = factor_index
+                if self._verify_result(result, content, output_verified_false):
+                    filtered_results[result] = result
+
+        return filtered_results
+
+    def _verify_results(
+        self,
+        results,
+        file_lines,
+        output_verified_false=False,
+        factor_index=None,
+    ):
+        """
+        :type results: dict
+        :param results: output of `analyze_line`
+
+        :type file_lines: tuple of str
+        :param file_lines: all lines in the file, used to provide context for verification.
+
+        :type output_verified_false: bool
+
+        :type factor_index: FactorIndex|None
+        :param factor_index: of the file. Results must be verified in the order
+            of their lines.
+
+        :rtype: dict
+        :returns: results, without secrets that failed verification
+            (unless output_verified_false is set).
+        """
+        # Results on the same line share a snippet.
+        results_by_line = {}
+        for result in results:
+            results_by_line.setdefault(result.lineno, {})[result] = result
+
+        return self._verify_snippets(
+            [
+                (
+                    line_results,
+                    CodeSnippetHighlighter().get_code_snippet(
+                        file_lines,
+                        line_num,
+                        lines_of_context=LINES_OF_CONTEXT,
+                    ),
                 )
+                for line_num, line_results in sorted(results_by_line.items())
+            ],
+            output_verified_false,
+            factor_index,
+        )
+
+    def _get_factor_index(self):
+        """
+        :rtype: FactorIndex|None
+        :returns: an empty index for the factors that secrets are verified
+            with, if they are to be verified with any.
+        """
+        if not self._should_verify_results() or not self.factor_regexes:
+            return None
+
+        return FactorIndex(self.factor_regexes)
+
+    @property
+    def can_verify(self):
+        """
+        :rtype: bool
+        :returns: whether the plugin implements `verify`. Otherwise, its
+            secrets are always unverified.
+        """
+        return getattr(self.verify, '__func__', None) is not BasePlugin.verify
+
+    @property
+    def verifies_results(self):
+        """
+        :rtype: bool
+        :returns: whether the plugin's results should be verified. Plugins which
+            can't verify them leave them unverified, without building snippets
+            for them.
+        """
+        return self.should_verify and self.can_verify
+
+    def _should_verify_results(self):
+        """
+        :rtype: bool
+        :returns: whether results are verified as they are found (rather than
+            being left unverified, or verified by the caller).
+        """
+        return self.verifies_results and not self.defer_verification
+
+    def _verify_result(self, result, content, output_verified_false=False):
+        """Verifies a single result (or queues it for verification).
+
+        :type result: PotentialSecret
+        :type content: str
+        :param content: lines of context around the result.
+
+        :type output_verified_false: bool
+        :rtype: bool
+        :returns: whether the result should be kept. Queued results are
+            kept, and removed later if they fail verification.
+        """
+        if self.verification_queue is not None:
+            self.verification_queue.submit(self, result, content)
+            return True
+
+        is_verified = self.verify_result(result, content)
+        if is_verified != VerifiedResult.VERIFIED_FALSE:  # unverified or true
+            return True
+
+        return output_verified_false
+
+    def verify_result(self, result, content):
+        """Verifies a single result, and records the outcome on it.
+
+        :type result: PotentialSecret
+        :type content: str
+        :param content: lines of context around the result.
 
-                is_verified = self.verify(
-                    result.secret_value, content=str(snippet),
-                    potential_secret=result,
+        :rtype: VerifiedResult
+        """
+        cache = self.verification_cache
+        try:
+            if cache is None:
+                is_verified = self._verify(result, content)
+            else:
+                key = cache.get_key(
+                    self,
+                    result.secret_value,
+                    self.get_verification_factors(content, result),
                 )
+                with cache.lock(key):
+                    cached = cache.get(key)
+                    if cached is None:
+                        is_verified = self._verify(result, content)
+                        cache.put(key, is_verified, result.other_factors)
+                    else:
+                        is_verified, other_factors = cached
+                        result.other_factors.update(other_factors)
+        finally:
+            # The index is no longer needed, and shouldn't be kept around
+            # with the results.
+            result.factor_index = None
+
+        if is_verified == VerifiedResult.UNVERIFIED:
+            result.is_verified = False
+        elif is_verified == VerifiedResult.VERIFIED_TRUE:
+            result.is_verified = True
+            result.verified_result = True
+        elif is_verified == VerifiedResult.VERIFIED_FALSE:
+            result.is_verified = True
+            result.verified_result = False
+
+        return is_verified
+
+    def get_verification_factors(self, content, potential_secret=None):
+        """Plugins which verify secrets with other factors found in the lines of
+        context around them should override this, so that the results of
+        verification are only reused when those factors are the same.
 
-                if is_verified == VerifiedResult.UNVERIFIED:
-                    result.is_verified = False
-                elif is_verified == VerifiedResult.VERIFIED_TRUE:
-                    result.is_verified = True
-                    result.verified_result = True
-                elif is_verified == VerifiedResult.VERIFIED_FALSE:
-                    result.is_verified = True
-                    result.verified_result = False
+        :type content: str
+        :param content: lines of context around the secret.
 
-                if is_verified != VerifiedResult.VERIFIED_FALSE:  # unverified or true
-                    filtered_results[result] = result
-                elif is_verified == VerifiedResult.VERIFIED_FALSE and output_verified_false:
-                    filtered_results[result] = result
+        :type potential_secret: PotentialSecret|None
+
+        :rtype: tuple of str
+        """
+        return ()
 
-            potential_secrets.update(filtered_results)
+    def find_factors(self, name, content, potential_secret=None, with_distances=False):
+        """Finds one of the other factors (see `factor_regexes`) that a secret
+        may be verified with, in its lines of context. If the secret was found
+        while scanning a file, they are looked up in the file's FactorIndex,
+        rather than searching the lines again.
 
-        return potential_secrets
+        :type name: str
+        :type content: str
+        :param content: lines of context around the secret.
+
+        :type potential_secret: PotentialSecret|None
+
+        :type with_distances: bool
+        :param with_distances: if True, each factor is returned with the number
+            of lines between it and the secret (or 0, if the secret's line isn't
+            known).
+
+        :rtype: list
+        :returns: matches of the regexes for the factor (as from `findall`),
+            in the order that they appear.
+        """
+        factor_index = potential_secret.factor_index if potential_secret else None
+        if factor_index is None:
+            matches = FactorIndex.from_content(
+                {name: self.factor_regexes[name]},
+                content,
+            ).find(name, with_line_numbers=True)
+            secret_line_number = _find_line_number(content, potential_secret)
+        else:
+            matches = factor_index.find(
+                name,
+                potential_secret.lineno,
+                LINES_OF_CONTEXT,
+                with_line_numbers=True,
+            )
+            secret_line_number = potential_secret.lineno
+
+        if not with_distances:
+            return [factor for _, factor in matches]
+
+        return [
+            (
+                abs(line_number - secret_line_number) if secret_line_number else 0,
+                factor,
+            )
+            for line_number, factor in matches
+        ]
+
+    def _verify(self, result, content):
+        """
+        :type result: PotentialSecret
+        :type content: str
+        :rtype: VerifiedResult
+        """
+        try:
+            return self.verify(
+                result.secret_value, content=content,
+                potential_secret=result,
+            )
+        except requests.exceptions.RequestException as error:
+            log.info('Unable to verify %s: %s', self.secret_type, error)
+            return VerifiedResult.UNVERIFIED
+
+    def _get_line_cache_context(self, filename):
+        """Results for a line may depend on the file it was found in, rather
+        than just the contents of the line itself. Subclasses should extend
+        this if they keep any other state that affects `analyze_line`.
+
+        :type filename: str
+        :rtype: tuple
+        """
+        return (
+            determine_file_type(filename),
+            get_decoders(filename),
+        )
+
+    def _analyze_line_within_budget(self, string, line_num, filename, output_raw=False):
+        """Same as `_analyze_line_with_cache`, but lines that take longer than
+        the time budget (if any) are abandoned, and have no results.
+        """
+        if self.time_budget is None:
+            return self._analyze_line_with_cache(string, line_num, filename, output_raw)
+
+        self.time_budget.start_line(self, line_num)
+        try:
+            results = self._analyze_line_with_cache(string, line_num, filename, output_raw)
+        except LineTimeBudgetExceeded as error:
+            self.time_budget.end_line(error)
+            return {}
+
+        if not self.time_budget.end_line():
+            return {}
+
+        return results
+
+    def _analyze_line_with_cache(self, string, line_num, filename, output_raw=False):
+        """Same as `analyze_line`, but remembers the secrets found in recently
+        seen lines, so that identical lines in different files are not scanned
+        again.
+
+        Only the type and value of each secret is cached. Verification depends on
+        the surrounding lines, so it is always done separately for each occurrence.
+        """
+        if self.long_line_threshold and len(string) > self.long_line_threshold:
+            return self._analyze_long_line(string, line_num, filename, output_raw)
+
+        if not self.line_cache.is_cacheable(string):
+            return self.analyze_line(string, line_num, filename, output_raw)
+
+        key = (
+            self._get_line_cache_context(filename),
+            # Some decoders only apply to some lines of the file.
+            self.decoder_pipeline.get_decoders(filename, line_num),
+            string,
+        )
+        cached_secrets = self.line_cache.get(key)
+        if cached_secrets is None:
+            results = self.analyze_line(string, line_num, filename, output_raw)
+            if not any(_has_additional_state(result) for result in results):
+                self.line_cache.put(
+                    key,
+                    tuple((result.type, result.secret_value) for result in results),
+                )
+
+            return results
+
+        output = {}
+        for secret_type, secret_value in cached_secrets:
+            secret = PotentialSecret(
+                secret_type,
+                filename,
+                secret_value,
+                line_num,
+                output_raw=output_raw,
+            )
+            output[secret] = secret
+
+        return output
+
+    def _analyze_long_line(self, string, line_num, filename, output_raw=False):
+        """Same as `analyze_line`, but runs over overlapping windows of the line,
+        so that the cost of each regex is bounded for minified files, inline
+        source maps, etc.
+
+        Windows overlap by more than the longest possible match, so every secret
+        is entirely within at least one of them. Secrets touching the edge of a
+        window may have been cut off, so they are left to the neighboring window.
+        """
+        overlap = self._get_max_match_length() + 1
+        window_size = max(self.long_line_threshold, 2 * overlap)
+
+        output = {}
+        start = 0
+        while True:
+            end = min(start + window_size, len(string))
+            window = string[start:end]
+
+            for secret in self.analyze_line(window, line_num, filename, output_raw):
+                if (
+                    (start > 0 and window.startswith(secret.secret_value))
+                    or (end < len(string) and window.endswith(secret.secret_value))
+                ):
+                    continue
+
+                # Secrets in the overlap are found twice.
+                if secret not in output:
+                    output[secret] = secret
+
+            if end == len(string):
+                return output
+
+            start = end - overlap
+
+    def _get_max_match_length(self):
+        """
+        :rtype: int
+        :returns: the length of the longest secret that this plugin can find
+            in a single line.
+        """
+        return MAX_SECRET_LENGTH
 
     def analyze_line(self, string, line_num, filename, output_raw=False):
         """
@@ -180,7 +632,6 @@ class BasePlugin:
         :returns:         dictionary
         NOTE: line_num and filename are used for PotentialSecret creation only.
         """
-        # First, look for a result in the raw input string.
         result = self.analyze_string_content(
             string,
             line_num,
@@ -188,7 +639,8 @@ class BasePlugin:
             output_raw,
         )
 
-        # If there was no result in the raw, look for encoded values.
+        # If there was no result in the raw line, look for encoded values (in
+        # files with decoders). So a secret is never reported in both forms.
         if not result:
             result = self.analyze_encoded_line(
                 string,
@@ -197,12 +649,11 @@ class BasePlugin:
                 output_raw,
             )
 
-        # Return the result, if any.
-        return result if result else {}
+        return result
 
     def analyze_encoded_line(self, string, line_num, filename, output_raw=False):
-        """Analyzes lines in certain files to identify and parse encoded values.
-        TODO Move this to a plugin system, to support multiple decoders.
+        """Analyzes the values which are encoded in a line, once they are
+        decoded by the decoder pipeline (e.g. `_auth` fields in .npmrc files).
 
         :param string:    string; the line to analyze
         :param line_num:  integer; line number that is currently being analyzed
@@ -210,35 +661,18 @@ class BasePlugin:
         :returns:         dictionary
         NOTE: line_num and filename are used for PotentialSecret creation only.
         """
-        # Only process .npmrc files for encoded values.
-        if not filename.endswith('.npmrc'):
-            return
-
-        # Look for an encoded _auth or _password field.
-        pattern = r'(?P<key>_auth|_password) ?= ?(?P<encoded>[a-z0-9+/]+=*)'
-        match = re.search(pattern, string, flags=re.IGNORECASE)
-        if not match:
-            return
+        result = {}
+        for decoded in self.decoder_pipeline.decode(string, filename, line_num):
+            for secret in self.analyze_string_content(
+                decoded,
+                line_num,
+                filename,
+                output_raw,
+            ):
+                if secret not in result:
+                    result[secret] = secret
 
-        # Decode the encoded value, if possible.
-        encoded = match.group('encoded')
-        start = match.start('encoded')
-        end = match.end('encoded')
-        try:
-            decoded = base64.b64decode(encoded).decode('utf-8')
-        except (binascii.Error, binascii.Incomplete):
-            # Ignore any errors encountered while decoding the line.
-            # This is a fail-safe for any invalid or corrupted encoding.
-            return
-
-        # Generate a new string, using the decoded value, and analyze it.
-        processed_string = string[:start] + decoded + string[end:]
-        return self.analyze_string_content(
-            processed_string,
-            line_num,
-            filename,
-            output_raw,
-        )
+        return result
 
     @abstractmethod
     def analyze_string_content(self, string, line_num, filename, output_raw=False):
@@ -350,6 +784,36 @@ class BasePlugin:
         }
 
 
+def _has_additional_state(secret):
+    """
+    :type secret: PotentialSecret
+    :returns: True if the secret cannot be recreated from its type and value alone.
+    """
+    return (
+        secret.is_secret is not None
+        or secret.is_verified
+        or secret.verified_result is not None
+        or bool(secret.other_factors)
+    )
+
+
+def _find_line_number(content, secret):
+    """
+    :type content: str
+    :type secret: PotentialSecret|None
+    :rtype: int|None
+    :returns: of the first line in the content that contains the secret.
+    """
+    if secret is None or not secret.secret_value:
+        return None
+
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if secret.secret_value in line:
+            return line_number
+
+    return None
+
+
 class RegexBasedDetector(BasePlugin):
     """Parent class for regular-expression based detectors.
 
@@ -367,6 +831,10 @@ class RegexBasedDetector(BasePlugin):
     """
     __metaclass__ = ABCMeta
 
+    # The engine that the denylist is run with.
+    # See detect_secrets.plugins.common.regex_backend.
+    regex_engine = regex_backend.DEFAULT_ENGINE
+
     @abstractproperty
     def denylist(self):
         raise NotImplementedError
@@ -407,6 +875,212 @@ class RegexBasedDetector(BasePlugin):
             ), flags=re.IGNORECASE,
         )
 
+    def can_analyze_buffer(self, buffer, filename):
+        """Whether `analyze_buffer` is guaranteed to find the same secrets as `analyze`.
+
+        :type buffer: str
+        :type filename: str
+        :rtype: bool
+        """
+        if not self._can_skip_unmatched_lines(filename):
+            return False
+
+        if has_other_line_boundaries(buffer):
+            return False
+
+        return self._get_compiled_denylist(compile_for_buffer) is not None
+
+    def analyze_buffer(self, buffer, filename, output_raw=False, output_verified_false=False):
+        """Same as `analyze`, but runs each regex in the denylist over the entire
+        file at once, rather than line by line. Only lines that have a match are
+        then analyzed as usual. Callers should check `can_analyze_buffer` first.
+
+        :type buffer: str
+        :param buffer: the contents of the file.
+
+        :type filename: str
+        :type output_raw: bool
+        :type output_verified_false: bool
+        :rtype: dict
+        """
+        index = LineIndex(buffer)
+
+        candidate_lines = set()
+        for regex in self._get_compiled_denylist(compile_for_buffer):
+            for match in regex.finditer(buffer):
+                line_num = index.get_line_number(match.start())
+                candidate_lines.add(line_num)
+
+                if match.start() == match.end() and line_num > 1:
+                    # Empty matches at the very end of a line are found at the
+                    # start of the next line, when scanning the entire buffer.
+                    candidate_lines.add(line_num - 1)
+
+        potential_secrets = {}
+        file_lines = None
+        should_verify = self._should_verify_results()
+        factor_index = self._get_factor_index()
+        for line_num in sorted(candidate_lines):
+            line = index.get_line(line_num)
+            if self._is_excluded_line(line):
+                continue
+
+            results = self._analyze_line_within_budget(line, line_num, filename, output_raw)
+            if not results:
+                continue
+
+            if not should_verify:
+                potential_secrets.update(results)
+                continue
+
+            if file_lines is None:
+                file_lines = index.get_lines()
+
+            potential_secrets.update(
+                self._verify_results(
+                    results,
+                    file_lines,
+                    output_verified_false,
+                    factor_index,
+                ),
+            )
+
+        return potential_secrets
+
+    def can_analyze_mapped_file(self, mapped_file, filename):
+        """Whether `analyze_mapped_file` is guaranteed to find the same secrets
+        as `analyze`, for valid UTF-8 files.
+
+        :type mapped_file: detect_secrets.plugins.common.buffer_scan.MappedFile
+        :type filename: str
+        :rtype: bool
+        """
+        if not self._can_skip_unmatched_lines(filename):
+            return False
+
+        if mapped_file.has_other_line_boundaries():
+            return False
+
+        return self._get_compiled_denylist(compile_for_bytes) is not None
+
+    def analyze_mapped_file(
+        self,
+        mapped_file,
+        filename,
+        output_raw=False,
+        output_verified_false=False,
+    ):
+        """Same as `analyze_buffer`, but runs bytes patterns over the raw contents
+        of the file. Only lines that may contain secrets (and their verification
+        context) are decoded. Callers should check `can_analyze_mapped_file` first.
+
+        :type mapped_file: detect_secrets.plugins.common.buffer_scan.MappedFile
+        :type filename: str
+        :type output_raw: bool
+        :type output_verified_false: bool
+        :rtype: dict
+        """
+        potential_secrets = {}
+        should_verify = self._should_verify_results()
+        for line_num, line_start, line in mapped_file.get_candidate_lines(
+            self._get_compiled_denylist(compile_for_bytes),
+        ):
+            if self._is_excluded_line(line):
+                continue
+
+            results = self._analyze_line_within_budget(line, line_num, filename, output_raw)
+            if not results:
+                continue
+
+            if not should_verify:
+                potential_secrets.update(results)
+                continue
+
+            content = mapped_file.get_context(line_start, line_num, LINES_OF_CONTEXT)
+            for result in results:
+                if self._verify_result(result, content, output_verified_false):
+                    potential_secrets[result] = result
+
+        return potential_secrets
+
+    def _can_skip_unmatched_lines(self, filename):
+        """
+        :returns: True if lines that don't match the denylist can't contain secrets.
+        """
+        if not self._has_default_analysis():
+            # We can't tell whether customized plugins would find secrets on lines
+            # that their denylist doesn't match.
+            return False
+
+        # Encoded values need to be decoded before the denylist can match them.
+        return not self.decoder_pipeline.get_decoders(filename)
+
+    def _has_default_analysis(self):
+        """
+        :returns: True if secrets are only ever found by the denylist.
+        """
+        cls = type(self)
+        return (
+            cls.analyze is BasePlugin.analyze
+            and cls.analyze_line is BasePlugin.analyze_line
+            and cls.analyze_string_content is RegexBasedDetector.analyze_string_content
+            and cls.secret_generator is RegexBasedDetector.secret_generator
+        )
+
+    def _get_max_match_length(self):
+        if not self._has_default_analysis():
+            return MAX_SECRET_LENGTH
+
+        max_length = 0
+        for regex in self.denylist:
+            length = get_max_match_length(regex)
+            if length is None or length > MAX_SECRET_LENGTH:
+                return MAX_SECRET_LENGTH
+
+            max_length = max(max_length, length)
+
+        return max_length
+
+    def _get_compiled_denylist(self, compile_function=None):
+        """
+        :type compile_function: function|None
+        :param compile_function: compiles a single regex for scanning entire files.
+            Returns None if this isn't possible. If not provided, the denylist is
+            used as-is, for scanning single lines.
+
+        :rtype: list of Pattern|None
+        :returns: the compiled denylist, using this plugin's regex engine.
+            None, if any regex in the denylist can't be run over entire files.
+        """
+        denylist = tuple(self.denylist)
+        cache = getattr(self, '_compiled_denylists', None)
+        if cache is None:
+            cache = self._compiled_denylists = {}
+
+        key = (compile_function, self.regex_engine)
+        if key in cache and cache[key][0] == denylist:
+            return cache[key][1]
+
+        compiled_denylist = None
+        if compile_function is None:
+            compiled_denylist = list(denylist)
+        elif all(is_line_local(regex) for regex in denylist):
+            compiled_denylist = [
+                compile_function(regex)
+                for regex in denylist
+            ]
+            if None in compiled_denylist:
+                compiled_denylist = None
+
+        if compiled_denylist is not None:
+            compiled_denylist = [
+                regex_backend.compile(regex, self.regex_engine)
+                for regex in compiled_denylist
+            ]
+
+        cache[key] = (denylist, compiled_denylist)
+        return compiled_denylist
+
     def analyze_string_content(self, string, line_num, filename, output_raw=False):
         output = {}
 
@@ -428,6 +1102,10 @@ class RegexBasedDetector(BasePlugin):
         *args,
         **kwargs
     ):
-        for regex in self.denylist:
+        denylist = self.denylist
+        if self.regex_engine != regex_backend.DEFAULT_ENGINE:
+            denylist = self._get_compiled_denylist()
+
+        for regex in denylist:
             for match in regex.findall(string):
                 yield match
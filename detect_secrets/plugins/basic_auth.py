@@ -1,6 +1,7 @@
 import re
 
 from .base import RegexBasedDetector
+from .common.applicability import Applicability
 
 
 # This list is derived from RFC 3986 Section 2.2.
@@ -16,6 +17,8 @@ class BasicAuthDetector(RegexBasedDetector):
     """Scans for Basic Auth formatted URIs."""
     secret_type = 'Basic Auth Credentials'
 
+    applicability = Applicability(content_literals=('://',))
+
     denylist = [
         re.compile(
             r'://[^{}\s]+:([^{}\s]+)@'.format(
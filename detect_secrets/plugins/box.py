@@ -42,39 +42,59 @@ class BoxDetector(RegexBasedDetector):
     enterpriseid_factor_keyword = r'(?:id)'
     enterpriseid_factor = r'([0-9]+)'
 
-    def verify(self, token, content, potential_secret):
-        clientid_matches = find_other_factor(
-            content, self.clientid_prefix,
-            self.clientid_factor_keyword, self.clientid_factor,
+    factor_regexes = {
+        'clientid': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=clientid_prefix,
+            password_keyword_regex=clientid_factor_keyword,
+            password_regex=clientid_factor,
+        ),
+        'publickeyid': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=publickeyid_prefix,
+            password_keyword_regex=publickeyid_factor_keyword,
+            password_regex=publickeyid_factor,
+        ),
+        'privatekey': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=privatekey_prefix,
+            password_keyword_regex=privatekey_factor_keyword,
+            password_regex=privatekey_factor,
+        ),
+        'passphrase': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=passphrase_prefix,
+            password_keyword_regex=passphrase_factor_keyword,
+            password_regex=passphrase_factor,
+        ),
+        'enterpriseid': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=enterpriseid_prefix,
+            password_keyword_regex=enterpriseid_factor_keyword,
+            password_regex=enterpriseid_factor,
+        ),
+    }
+
+    def get_verification_factors(self, content, potential_secret=None):
+        # Secrets are verified with every combination of the other factors.
+        return tuple(
+            tuple(self.find_factors(name, content, potential_secret))
+            for name in self.factor_regexes
         )
+
+    def verify(self, token, content, potential_secret):
+        clientid_matches = self.find_factors('clientid', content, potential_secret)
         if not clientid_matches:
             return VerifiedResult.UNVERIFIED
 
-        publickeyid_matches = find_other_factor(
-            content, self.publickeyid_prefix,
-            self.publickeyid_factor_keyword, self.publickeyid_factor,
-        )
+        publickeyid_matches = self.find_factors('publickeyid', content, potential_secret)
         if not publickeyid_matches:
             return VerifiedResult.UNVERIFIED
 
-        privatekey_matches = find_other_factor(
-            content, self.privatekey_prefix,
-            self.privatekey_factor_keyword, self.privatekey_factor,
-        )
+        privatekey_matches = self.find_factors('privatekey', content, potential_secret)
         if not privatekey_matches:
             return VerifiedResult.UNVERIFIED
 
-        passphrase_matches = find_other_factor(
-            content, self.passphrase_prefix,
-            self.passphrase_factor_keyword, self.passphrase_factor,
-        )
+        passphrase_matches = self.find_factors('passphrase', content, potential_secret)
         if not passphrase_matches:
             return VerifiedResult.UNVERIFIED
 
-        enterpriseid_matches = find_other_factor(
-            content, self.enterpriseid_prefix,
-            self.enterpriseid_factor_keyword, self.enterpriseid_factor,
-        )
+        enterpriseid_matches = self.find_factors('enterpriseid', content, potential_secret)
         if not enterpriseid_matches:
             return VerifiedResult.UNVERIFIED
 
@@ -3,6 +3,7 @@ import re
 import requests
 
 from .base import RegexBasedDetector
+from .common import http_session
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -60,9 +61,36 @@ class CloudantDetector(RegexBasedDetector):
         ),
     ]
 
+    opt_hostname_keyword = r'(?:hostname|host|username|id|user|userid|user-id|user-name|' \
+        'name|user_id|user_name|uname|account)'
+    account = r'(\w[\w\-]*)'
+    opt_basic_auth = r'(?:[\w\-:%]*\@)?'
+    factor_regexes = {
+        'account': (
+            RegexBasedDetector.assign_regex_generator(
+                prefix_regex=cl,
+                password_keyword_regex=opt_hostname_keyword,
+                password_regex=account,
+            ),
+            re.compile(
+                r'{http}{opt_basic_auth}{cl_account}{dot}{cloudant_api_url}'.format(
+                    http=http,
+                    opt_basic_auth=opt_basic_auth,
+                    cl_account=account,
+                    dot=dot,
+                    cloudant_api_url=cloudant_api_url,
+                ),
+                flags=re.IGNORECASE,
+            ),
+        ),
+    }
+
+    def get_verification_factors(self, content, potential_secret=None):
+        return tuple(self.find_factors('account', content, potential_secret))
+
     def verify(self, token, content, potential_secret=None):
 
-        hosts = find_account(content)
+        hosts = self.find_factors('account', content, potential_secret)
         if not hosts:
             return VerifiedResult.UNVERIFIED
 
@@ -73,28 +101,7 @@ class CloudantDetector(RegexBasedDetector):
 
 
 def find_account(content):
-    opt_hostname_keyword = r'(?:hostname|host|username|id|user|userid|user-id|user-name|' \
-        'name|user_id|user_name|uname|account)'
-    account = r'(\w[\w\-]*)'
-    opt_basic_auth = r'(?:[\w\-:%]*\@)?'
-
-    regexes = (
-        RegexBasedDetector.assign_regex_generator(
-            prefix_regex=CloudantDetector.cl,
-            password_keyword_regex=opt_hostname_keyword,
-            password_regex=account,
-        ),
-        re.compile(
-            r'{http}{opt_basic_auth}{cl_account}{dot}{cloudant_api_url}'.format(
-                http=CloudantDetector.http,
-                opt_basic_auth=opt_basic_auth,
-                cl_account=account,
-                dot=CloudantDetector.dot,
-                cloudant_api_url=CloudantDetector.cloudant_api_url,
-            ),
-            flags=re.IGNORECASE,
-        ),
-    )
+    regexes = CloudantDetector.factor_regexes['account']
 
     return [
         match
@@ -107,16 +114,12 @@ def find_account(content):
 def verify_cloudant_key(hostname, token, potential_secret=None):
     try:
         headers = {'Content-type': 'application/json'}
-        request_url = 'https://{hostname}:' \
-            '{token}' \
-            '@{hostname}.' \
-            'cloudant.com'.format(
-                hostname=hostname,
-                token=token,
-            )
-
-        response = requests.get(
+        request_url = 'https://{hostname}.cloudant.com'.format(hostname=hostname)
+
+        # Same as credentials in the URL, without them being part of it.
+        response = http_session.get(
             request_url,
+            auth=(hostname, token),
             headers=headers,
         )
 
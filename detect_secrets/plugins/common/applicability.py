@@ -0,0 +1,159 @@
+import re
+import threading
+from fnmatch import fnmatchcase
+
+from .filetype import determine_file_type
+
+# Files are searched for literals a chunk at a time, rather than being read
+# all at once.
+CHUNK_SIZE = 1024 * 1024
+
+
+class Applicability:
+    """Declares the files that a plugin can find secrets in, so that it isn't
+    run on the others.
+
+    A file must match each of the constraints that are given: one of the
+    file types, one of the path globs, and contain one of the literals.
+    Literals must be sound: every secret that the plugin finds has to
+    contain one of them.
+    """
+
+    def __init__(
+        self,
+        file_types=(),
+        path_globs=(),
+        content_literals=(),
+        ignore_case=False,
+    ):
+        """
+        :type file_types: iterable of FileType
+        :type path_globs: iterable of str
+        :param path_globs: matched against the whole path, with forward slashes.
+
+        :type content_literals: iterable of str
+        :type ignore_case: bool
+        :param ignore_case: whether the literals are matched case insensitively,
+            for plugins whose regexes are.
+        """
+        self.file_types = frozenset(file_types)
+        self.path_globs = tuple(path_globs)
+        self.content_literals = tuple(content_literals)
+        self.ignore_case = ignore_case
+
+        self._text_regex = None
+        self._bytes_regex = None
+        if self.content_literals:
+            flags = re.IGNORECASE if ignore_case else 0
+            pattern = '|'.join(re.escape(literal) for literal in self.content_literals)
+
+            self._text_regex = re.compile(pattern, flags)
+            self._bytes_regex = re.compile(pattern.encode('utf-8'), flags)
+
+    @property
+    def needs_content(self):
+        """
+        :rtype: bool
+        :returns: whether the contents of files are needed to decide if the
+            plugin applies to them.
+        """
+        return bool(self.content_literals)
+
+    @property
+    def max_literal_length(self):
+        """
+        :rtype: int
+        :returns: the length of the longest literal, in UTF-8 encoded bytes.
+        """
+        return max(
+            (len(literal.encode('utf-8')) for literal in self.content_literals),
+            default=0,
+        )
+
+    def applies_to_path(self, filename):
+        """
+        :type filename: str
+        :rtype: bool
+        """
+        if self.file_types and determine_file_type(filename) not in self.file_types:
+            return False
+
+        if self.path_globs:
+            path = filename.replace('\\', '/')
+            return any(fnmatchcase(path, glob) for glob in self.path_globs)
+
+        return True
+
+    def applies_to_content(self, content):
+        """
+        :type content: str|bytes|mmap.mmap
+        :rtype: bool
+        """
+        if not self.content_literals:
+            return True
+
+        regex = self._text_regex if isinstance(content, str) else self._bytes_regex
+        return regex.search(content) is not None
+
+
+def iter_chunks(f, overlap, chunk_size=CHUNK_SIZE):
+    """Reads a file a chunk at a time, to search for literals in.
+
+    :type f: file object, opened in binary mode
+    :type overlap: int
+    :param overlap: number of bytes that consecutive chunks overlap by, so that
+        literals (up to one byte longer) which span them are found.
+
+    :type chunk_size: int
+    :rtype: iterable of bytes
+    :returns: at least one chunk, even if the file is empty.
+    """
+    chunk = f.read(chunk_size)
+    yield chunk
+
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            return
+
+        chunk = (chunk[-overlap:] if overlap else b'') + data
+        yield chunk
+
+
+class ApplicabilityStatistics:
+    """Counts the files that a plugin was run on, and those that it was
+    skipped for, because it doesn't apply to them.
+    """
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.files_skipped = 0
+        self.seconds_scanning = 0.0
+
+        # Files may be scanned from multiple threads.
+        self._lock = threading.Lock()
+
+    def record_scan(self, seconds):
+        """
+        :type seconds: float
+        :param seconds: spent running the plugin on the file.
+        """
+        with self._lock:
+            self.files_scanned += 1
+            self.seconds_scanning += seconds
+
+    def record_skip(self):
+        with self._lock:
+            self.files_skipped += 1
+
+    @property
+    def seconds_saved(self):
+        """
+        :rtype: float
+        :returns: an estimate of the time that skipping files saved, from the
+            average time spent on the files that were scanned.
+        """
+        if not self.files_scanned:
+            return 0.0
+
+        return self.files_skipped * self.seconds_scanning / self.files_scanned
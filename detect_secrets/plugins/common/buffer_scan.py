@@ -0,0 +1,513 @@
+"""
+Utilities for running regexes once over an entire file, rather than
+separately for each line.
+"""
+import codecs
+import re
+from bisect import bisect_right
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:     # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+
+_NEWLINE = re.compile(r'\n')
+
+# `file.readlines()` splits on these characters too (when opened with `codecs`),
+# so we can't use the line index for buffers containing them.
+_OTHER_LINE_BOUNDARIES = re.compile(r'\r(?!\n)|[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+_OTHER_BYTE_LINE_BOUNDARIES = re.compile(
+    rb'\r(?!\n)|[\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]',
+)
+
+# Bytes patterns only behave like their text counterparts on plain ASCII
+# (e.g. `\w` doesn't match any multi-byte characters), so lines with
+# anything else always need to be decoded and checked.
+_NON_PRINTABLE_ASCII_BYTES = re.compile(rb'[^\t\n\r\x20-\x7e]')
+
+# Used to count newlines without copying the entire file at once.
+_CHUNK_SIZE = 1024 * 1024
+
+# Characters that `str.splitlines` ends a line on, other than `\r`
+# (which may be followed by `\n`).
+_LINE_ENDINGS = frozenset('\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
+
+# `codecs` readers only read a few characters at a time when iterating
+# over lines, which is much slower than reading larger chunks.
+_READ_SIZE = 64 * 1024
+
+_CATEGORIES_MATCHING_NEWLINE = {
+    sre_constants.CATEGORY_LINEBREAK,
+    sre_constants.CATEGORY_NOT_DIGIT,
+    sre_constants.CATEGORY_NOT_WORD,
+    sre_constants.CATEGORY_SPACE,
+}
+
+_REPEAT_OPCODES = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):     # pragma: no cover
+    _REPEAT_OPCODES.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+class LineIndex:
+    """Maps offsets in a buffer to line numbers, with the same line numbering
+    as `file.readlines()`.
+    """
+
+    def __init__(self, buffer):
+        """
+        :type buffer: str
+        """
+        self.buffer = buffer
+
+        # Each line spans [line_starts[i], line_starts[i + 1]).
+        self.line_starts = [0]
+        self.line_starts.extend(match.end() for match in _NEWLINE.finditer(buffer))
+        if self.line_starts[-1] != len(buffer):
+            self.line_starts.append(len(buffer))
+
+    @property
+    def num_lines(self):
+        return len(self.line_starts) - 1
+
+    def get_line_number(self, offset):
+        """
+        :type offset: int
+        :rtype: int
+        :returns: 1-indexed line number
+        """
+        return min(
+            bisect_right(self.line_starts, offset),
+            self.num_lines,
+        )
+
+    def get_line(self, line_number):
+        """
+        :type line_number: int
+        :param line_number: 1-indexed line number
+
+        :rtype: str
+        :returns: the line, including its line ending
+        """
+        return self.buffer[self.line_starts[line_number - 1]:self.line_starts[line_number]]
+
+    def get_lines(self):
+        """
+        :rtype: tuple of str
+        :returns: same as `tuple(file.readlines())`
+        """
+        return tuple(
+            self.get_line(line_number)
+            for line_number in range(1, self.num_lines + 1)
+        )
+
+
+class MappedFile:
+    """Provides line-based access to the raw (e.g. memory-mapped) contents of a
+    file, only decoding the parts that are needed. Line numbering is the same as
+    `file.readlines()`, and invalid UTF-8 is replaced, rather than raising errors.
+    """
+
+    def __init__(self, buffer, encoding='utf-8'):
+        """
+        :type buffer: bytes|mmap.mmap
+        :type encoding: str
+        """
+        self.buffer = buffer
+        self.encoding = encoding
+
+        self._has_other_line_boundaries = None
+
+    def has_other_line_boundaries(self):
+        """
+        :returns: True if lines in this file are separated by anything
+            other than `\\n` or `\\r\\n`.
+        """
+        if self._has_other_line_boundaries is None:
+            self._has_other_line_boundaries = bool(
+                _OTHER_BYTE_LINE_BOUNDARIES.search(self.buffer),
+            )
+
+        return self._has_other_line_boundaries
+
+    def get_candidate_lines(self, regexes):
+        """
+        :type regexes: list of Pattern
+        :param regexes: bytes patterns, compiled with `compile_for_bytes`.
+
+        :rtype: iterable of (int, int, str)
+        :returns: line number, offset of the start of the line, and decoded line,
+            for every line that any of the regexes could match.
+        """
+        line_starts = set()
+        for regex in list(regexes) + [_NON_PRINTABLE_ASCII_BYTES]:
+            position = 0
+            while True:
+                match = regex.search(self.buffer, position)
+                if not match:
+                    break
+
+                line_start = self._get_line_start(match.start())
+                line_starts.add(line_start)
+                if match.start() == match.end() and match.start() == line_start > 0:
+                    # Empty matches at the very end of a line are found at the
+                    # start of the next line, when scanning the entire buffer.
+                    line_starts.add(self._get_line_start(line_start - 1))
+
+                # We only care about which lines match, so move on to the next one.
+                position = self._get_line_end(match.start())
+                if position >= len(self.buffer):
+                    break
+
+        line_number = 1
+        previous_line_start = 0
+        for line_start in sorted(line_starts):
+            if line_start >= len(self.buffer):
+                # Past the last line
+                break
+
+            line_number += self._count_newlines(previous_line_start, line_start)
+            previous_line_start = line_start
+
+            yield (
+                line_number,
+                line_start,
+                self._decode(line_start, self._get_line_end(line_start)),
+            )
+
+    def get_context(self, line_start, line_number, lines_of_context):
+        """
+        :type line_start: int
+        :type line_number: int
+        :type lines_of_context: int
+
+        :rtype: str
+        :returns: same as `str(CodeSnippetHighlighter().get_code_snippet(...))`
+        """
+        start = line_start
+        for _ in range(min(lines_of_context, line_number - 1)):
+            start = self._get_line_start(start - 1)
+
+        end = self._get_line_end(line_start)
+        for _ in range(lines_of_context):
+            if end >= len(self.buffer):
+                break
+
+            end = self._get_line_end(end)
+
+        return '\n'.join(self._decode(start, end).splitlines(True))
+
+    def _get_line_start(self, offset):
+        return self.buffer.rfind(b'\n', 0, offset) + 1
+
+    def _get_line_end(self, offset):
+        """
+        :returns: offset of the start of the following line.
+        """
+        end = self.buffer.find(b'\n', offset)
+        if end == -1:
+            return len(self.buffer)
+
+        return end + 1
+
+    def _count_newlines(self, start, end):
+        count = 0
+        for offset in range(start, end, _CHUNK_SIZE):
+            count += self.buffer[offset:min(offset + _CHUNK_SIZE, end)].count(b'\n')
+
+        return count
+
+    def _decode(self, start, end):
+        return self.buffer[start:end].decode(self.encoding, errors='replace')
+
+
+def iter_lines(file, read_size=_READ_SIZE):
+    """Same lines as `file.readlines()`, without reading the entire file at once.
+
+    :type file: file object
+    :type read_size: int
+    :rtype: iterable of str
+    """
+    if not isinstance(file, (codecs.StreamReader, codecs.StreamReaderWriter)):
+        for line in file:
+            yield line
+
+        return
+
+    # Parts of a line that we haven't found the end of yet.
+    pending = []
+    while True:
+        chunk = file.read(read_size)
+        if not chunk:
+            break
+
+        if pending and pending[-1].endswith('\r'):
+            if chunk.startswith('\n'):
+                pending.append('\n')
+                chunk = chunk[1:]
+
+            yield ''.join(pending)
+            pending = []
+            if not chunk:
+                continue
+
+        lines = chunk.splitlines(True)
+        if pending:
+            pending.append(lines[0])
+            lines[0] = ''.join(pending)
+            pending = []
+
+        last_line = lines.pop()
+        for line in lines:
+            yield line
+
+        if last_line[-1] in _LINE_ENDINGS:
+            yield last_line
+        else:
+            pending.append(last_line)
+
+    if pending:
+        yield ''.join(pending)
+
+
+def has_other_line_boundaries(buffer):
+    """
+    :type buffer: str
+    :returns: True if lines in this buffer are separated by anything
+        other than `\\n` or `\\r\\n`.
+    """
+    return bool(_OTHER_LINE_BOUNDARIES.search(buffer))
+
+
+def compile_for_buffer(regex):
+    """
+    :type regex: Pattern
+    :rtype: Pattern
+    :returns: a version of `regex` where `^` and `$` match at every line
+        boundary in the buffer, like they would at the ends of a single line.
+    """
+    return re.compile(regex.pattern, regex.flags | re.MULTILINE)
+
+
+def compile_for_bytes(regex):
+    """
+    :type regex: Pattern
+    :rtype: Pattern|None
+    :returns: a bytes version of `compile_for_buffer(regex)`, or None
+        if the regex only makes sense for text (e.g. it has non-ASCII characters).
+    """
+    try:
+        return re.compile(
+            regex.pattern.encode('ascii'),
+            (regex.flags & ~re.UNICODE) | re.MULTILINE,
+        )
+    except (UnicodeEncodeError, re.error):
+        return None
+
+
+def is_line_local(regex):
+    """A regex is line-local if running it over an entire buffer finds a
+    match on every line that it would find a match on, if it were run over
+    that line alone. This is the case if:
+
+        1. It can't consume a newline (so matches never span multiple lines),
+        2. It doesn't use `\\A` or `\\Z`, and
+        3. It doesn't have a negative lookaround that could see a newline.
+
+    Positive lookarounds are fine, since they can only succeed *more* often
+    when they can see into neighboring lines.
+
+    :type regex: Pattern
+    :rtype: bool
+    """
+    if not isinstance(regex.pattern, str):
+        return False
+
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:   # pragma: no cover
+        return False
+
+    return _is_line_local(parsed, bool(regex.flags & re.DOTALL))
+
+
+def get_max_match_length(regex):
+    """
+    :type regex: Pattern
+    :rtype: int|None
+    :returns: the length of the longest possible match, or None if it is unbounded.
+    """
+    try:
+        _, max_width = sre_parse.parse(regex.pattern, regex.flags).getwidth()
+    except Exception:   # pragma: no cover
+        return None
+
+    if max_width >= sre_constants.MAXREPEAT:
+        return None
+
+    return max_width
+
+
+def _is_line_local(items, dotall, is_consuming=True):
+    for opcode, value in items:
+        if opcode in (
+            sre_constants.LITERAL,
+            sre_constants.NOT_LITERAL,
+            sre_constants.ANY,
+            sre_constants.IN,
+        ):
+            if is_consuming and _matches_newline(opcode, value, dotall):
+                return False
+
+        elif opcode == sre_constants.AT:
+            if value in (
+                sre_constants.AT_BEGINNING_STRING,
+                sre_constants.AT_END_STRING,
+            ):
+                return False
+
+        elif opcode == sre_constants.ASSERT:
+            if not _is_line_local(value[1], dotall, is_consuming=False):
+                return False
+
+        elif opcode == sre_constants.ASSERT_NOT:
+            if (
+                _can_match_newline(value[1], dotall)
+                or not _is_line_local(value[1], dotall, is_consuming=False)
+            ):
+                return False
+
+        elif opcode == sre_constants.SUBPATTERN:
+            if not _is_line_local(
+                value[-1],
+                _get_dotall(dotall, value),
+                is_consuming,
+            ):
+                return False
+
+        elif opcode in _REPEAT_OPCODES:
+            if not _is_line_local(value[2], dotall, is_consuming):
+                return False
+
+        elif opcode == sre_constants.BRANCH:
+            if not all(
+                _is_line_local(branch, dotall, is_consuming)
+                for branch in value[1]
+            ):
+                return False
+
+        elif opcode == sre_constants.GROUPREF_EXISTS:
+            if not all(
+                _is_line_local(branch, dotall, is_consuming)
+                for branch in value[1:]
+                if branch is not None
+            ):
+                return False
+
+        elif opcode == getattr(sre_constants, 'ATOMIC_GROUP', None):
+            if not _is_line_local(value, dotall, is_consuming):
+                return False
+
+        elif opcode != sre_constants.GROUPREF:
+            # Be conservative with anything we don't know about.
+            return False
+
+    return True
+
+
+def _can_match_newline(items, dotall):
+    """
+    :returns: True if any character consumed by `items` could be a newline.
+    """
+    for opcode, value in items:
+        if opcode in (
+            sre_constants.LITERAL,
+            sre_constants.NOT_LITERAL,
+            sre_constants.ANY,
+            sre_constants.IN,
+        ):
+            if _matches_newline(opcode, value, dotall):
+                return True
+
+        elif opcode == sre_constants.SUBPATTERN:
+            if _can_match_newline(value[-1], _get_dotall(dotall, value)):
+                return True
+
+        elif opcode in _REPEAT_OPCODES:
+            if _can_match_newline(value[2], dotall):
+                return True
+
+        elif opcode == sre_constants.BRANCH:
+            if any(_can_match_newline(branch, dotall) for branch in value[1]):
+                return True
+
+        elif opcode == sre_constants.GROUPREF_EXISTS:
+            if any(
+                _can_match_newline(branch, dotall)
+                for branch in value[1:]
+                if branch is not None
+            ):
+                return True
+
+        elif opcode == getattr(sre_constants, 'ATOMIC_GROUP', None):
+            if _can_match_newline(value, dotall):
+                return True
+
+        elif opcode not in (
+            sre_constants.AT,
+            sre_constants.ASSERT,
+            sre_constants.ASSERT_NOT,
+            sre_constants.GROUPREF,
+        ):
+            return True
+
+    return False
+
+
+def _matches_newline(opcode, value, dotall):
+    newline = ord('\n')
+
+    if opcode == sre_constants.LITERAL:
+        return value == newline
+    if opcode == sre_constants.NOT_LITERAL:
+        return value != newline
+    if opcode == sre_constants.ANY:
+        return dotall
+
+    # IN: a character class
+    is_negated = False
+    is_match = False
+    for item_opcode, item_value in value:
+        if item_opcode == sre_constants.NEGATE:
+            is_negated = True
+        elif item_opcode == sre_constants.LITERAL:
+            is_match = is_match or item_value == newline
+        elif item_opcode == sre_constants.RANGE:
+            is_match = is_match or item_value[0] <= newline <= item_value[1]
+        elif item_opcode == sre_constants.CATEGORY:
+            is_match = is_match or item_value in _CATEGORIES_MATCHING_NEWLINE
+        else:
+            # Be conservative with anything we don't know about.
+            return True
+
+    return is_match != is_negated
+
+
+def _get_dotall(dotall, subpattern):
+    """Applies inline flags, e.g. `(?s:...)`"""
+    if len(subpattern) < 4:     # pragma: no cover
+        return dotall
+
+    _, add_flags, del_flags, _ = subpattern
+    if add_flags & re.DOTALL:
+        return True
+    if del_flags & re.DOTALL:
+        return False
+
+    return dotall
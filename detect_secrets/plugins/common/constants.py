@@ -5,14 +5,21 @@ ALLOWLIST_REGEXES = [
     re.compile(r)
     for r in [
         # Note: Always use allowlist, whitelist will be deprecated in the future
-        r'[ \t]+{} *pragma: ?(allow|white)list[ -]secret.*?{}[ \t]*$'.format(start, end)
+        #
+        # The comment must end the line, which is checked once (from the start
+        # of the line). Whitespace is only matched from the start of each run,
+        # so that the regexes scan lines in linear time.
+        r'^{}.*?(?<![ \t])[ \t]+{}pragma: ?(allow|white)list[ -]secret'.format(
+            r'(?={}[ \t]*$)'.format(end) if end else '',
+            start,
+        )
         for start, end in (
-            ('#', ''),                    # e.g. python or yaml
-            ('//', ''),                   # e.g. golang
-            (r'/\*', r' *\*/'),           # e.g. c
-            ('\'', ''),                   # e.g. visual basic .net
-            ('--', ''),                   # e.g. sql
-            (r'<!--[# \t]*?', ' *?-->'),  # e.g. xml
+            ('# *', ''),                        # e.g. python or yaml
+            ('// *', ''),                       # e.g. golang
+            (r'/\* *', r'.*\*/'),               # e.g. c
+            ('\' *', ''),                       # e.g. visual basic .net
+            ('-- *', ''),                       # e.g. sql
+            (r'<!--[# \t]*', '.*-->'),          # e.g. xml
             # many other inline comment syntaxes are not included,
             # because we want to be performant for
             # any(regex.search(line) for regex in ALLOWLIST_REGEXES)
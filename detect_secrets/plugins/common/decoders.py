@@ -0,0 +1,356 @@
+"""
+Decoders for values which are encoded in a line (e.g. base64 in an .npmrc
+file, or in the `data` of a Kubernetes Secret), so that plugins can scan
+their decoded contents, for lines without results in their raw form.
+"""
+import base64
+import binascii
+import re
+import threading
+from contextlib import contextmanager
+from urllib.parse import unquote
+
+from .buffer_scan import iter_lines
+from .filetype import determine_file_type
+from .filetype import FileType
+from .line_cache import DEFAULT_MAX_SIZE
+from .line_cache import LineResultCache
+
+
+class Decoder:
+    """Finds the values in a line that match its regex (in the `encoded`
+    group), and decodes them.
+    """
+
+    def __init__(self, name, regex, decode, find_lines=None):
+        """
+        :type name: str
+        :type regex: Pattern
+        :param regex: with an `encoded` group.
+
+        :type decode: function
+        :param decode: str => str|None, which returns None for values that
+            can't be decoded (into text).
+
+        :type find_lines: function|None
+        :param find_lines: iterable of str => frozenset of int, which returns
+            the numbers of the lines of a file that the decoder applies to.
+            If None, it applies to all of them.
+        """
+        self.name = name
+        self.regex = regex
+        self.decode = decode
+        self.find_lines = find_lines
+
+    def decode_line(self, line):
+        """
+        :type line: str
+        :rtype: str|None
+        :returns: the line, with each of the values that could be decoded
+            replaced by their decoded contents. None, if there were none.
+        """
+        parts = []
+        position = 0
+        for match in self.regex.finditer(line):
+            decoded = self.decode(match.group('encoded'))
+            if decoded is None:
+                continue
+
+            parts.append(line[position:match.start('encoded')])
+            parts.append(decoded)
+            position = match.end('encoded')
+
+        if not parts:
+            return None
+
+        parts.append(line[position:])
+        return ''.join(parts)
+
+
+def decode_base64(value):
+    """
+    :type value: str
+    :rtype: str|None
+    """
+    try:
+        return _as_text(base64.b64decode(value, validate=True))
+    except (binascii.Error, ValueError):
+        # Invalid or corrupted encoding.
+        return None
+
+
+def decode_hex(value):
+    """
+    :type value: str
+    :rtype: str|None
+    """
+    try:
+        return _as_text(bytes.fromhex(value))
+    except ValueError:
+        return None
+
+
+def decode_url(value):
+    """
+    :type value: str
+    :rtype: str|None
+    """
+    try:
+        decoded = unquote(value, errors='strict')
+    except UnicodeDecodeError:
+        return None
+
+    if decoded == value or not decoded.isprintable():
+        return None
+
+    return decoded
+
+
+def _as_text(data):
+    """Encoded values which don't decode into printable text are much more
+    likely to be binary (or random strings that happened to be valid
+    encodings) than secrets.
+
+    :type data: bytes
+    :rtype: str|None
+    """
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+    if not text or not text.isprintable():
+        return None
+
+    return text
+
+
+# `_auth` and `_password` in .npmrc files are base64 encoded.
+NPMRC_AUTH = Decoder(
+    'npmrc_auth',
+    re.compile(r'(?:_auth|_password) ?= ?(?P<encoded>[a-z0-9+/]+=*)', flags=re.IGNORECASE),
+    decode_base64,
+)
+
+_SECRET_KIND_REGEX = re.compile(r'kind:\s*(?P<quote>["\']?)Secret(?P=quote)\s*(?:#.*)?$')
+_SECRET_DATA_REGEX = re.compile(r'(?:data|binaryData):\s*(?:#.*)?$')
+
+
+def find_secret_data_lines(lines):
+    """
+    :type lines: iterable of str
+    :param lines: of a YAML file.
+
+    :rtype: frozenset of int
+    :returns: numbers of the lines (from 1) in the top level `data` and
+        `binaryData` of documents with `kind: Secret`.
+    """
+    secret_data_lines = set()
+
+    # Of the current document.
+    is_secret = False
+    is_data = False
+    data_lines = []
+    for line_num, line in enumerate(lines, start=1):
+        if line.startswith(('---', '...')):
+            if is_secret:
+                secret_data_lines.update(data_lines)
+
+            is_secret = False
+            is_data = False
+            data_lines = []
+            continue
+
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+
+        if line[0] not in ' \t':
+            # A top level key.
+            is_data = bool(_SECRET_DATA_REGEX.match(line))
+            is_secret = is_secret or bool(_SECRET_KIND_REGEX.match(line))
+        elif is_data:
+            data_lines.append(line_num)
+
+    if is_secret:
+        secret_data_lines.update(data_lines)
+
+    return frozenset(secret_data_lines)
+
+
+# Values in the `data` of Kubernetes Secrets are base64 encoded, e.g.
+#   kind: Secret
+#   data:
+#     password: aHVudGVyMg==
+KUBERNETES_SECRET_DATA = Decoder(
+    'kubernetes_secret_data',
+    re.compile(
+        r'^\s+[\w.-]+:\s*(?P<quote>["\']?)(?P<encoded>[A-Za-z0-9+/]{8,}={0,2})(?P=quote)\s*$',
+    ),
+    decode_base64,
+    find_lines=find_secret_data_lines,
+)
+
+# Shorter values are too likely to happen to be valid encodings.
+BASE64 = Decoder(
+    'base64',
+    re.compile(r'(?<![\w+/])(?P<encoded>[A-Za-z0-9+/]{12,}={0,2})(?![\w+/=])'),
+    decode_base64,
+)
+HEX = Decoder(
+    'hex',
+    re.compile(r'(?<![\w])(?P<encoded>(?:[0-9A-Fa-f]{2}){8,})(?![\w])'),
+    decode_hex,
+)
+URL_ENCODED = Decoder(
+    'url_encoded',
+    re.compile(r'(?P<encoded>[^\s\'"]*%[0-9A-Fa-f]{2}[^\s\'"]*)'),
+    decode_url,
+)
+
+# Suffix of the filename => decoders applied to its lines. Config files
+# often hold encoded credentials, while decoding source code would mostly
+# waste time on hashes and test vectors.
+DECODERS_BY_SUFFIX = (
+    ('.npmrc', (NPMRC_AUTH,)),
+    ('.env', (BASE64, HEX, URL_ENCODED)),
+    ('.properties', (BASE64, HEX, URL_ENCODED)),
+    ('.ini', (BASE64, HEX, URL_ENCODED)),
+    ('.cfg', (BASE64, HEX, URL_ENCODED)),
+    ('.conf', (BASE64, HEX, URL_ENCODED)),
+)
+
+DECODERS_BY_FILE_TYPE = {
+    FileType.YAML: (KUBERNETES_SECRET_DATA,),
+}
+
+
+def get_decoders(filename):
+    """
+    :type filename: str
+    :rtype: tuple of Decoder
+    :returns: the decoders which may be applied to the lines of the file
+        (see `DecoderPipeline.get_decoders`).
+    """
+    for suffix, decoders in DECODERS_BY_SUFFIX:
+        if filename.endswith(suffix):
+            return decoders
+
+    return DECODERS_BY_FILE_TYPE.get(determine_file_type(filename), ())
+
+
+class _FileState(threading.local):
+    """The file being scanned, which is tracked separately for each thread."""
+
+    def __init__(self):
+        self.filename = None
+
+        # Decoder => numbers of the lines that it applies to.
+        self.lines = {}
+
+
+class DecoderPipeline:
+    """Decodes the lines of files, once for all of the plugins which scan them.
+
+    Plugins scan a file one after another, so the decoded views of recently
+    seen lines are remembered, and the plugins after the first reuse them.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAX_SIZE):
+        """
+        :type maxsize: int
+        :param maxsize: maximum number of lines to remember.
+        """
+        self.cache = LineResultCache(maxsize=maxsize)
+
+        self._state = _FileState()
+
+    @contextmanager
+    def file(self, filename, file):
+        """Finds the lines of the file that its decoders apply to, for the
+        enclosed block. Decoders which only apply to some lines (e.g. to the
+        `data` of Kubernetes Secrets) aren't applied to the file otherwise.
+
+        :type filename: str
+        :type file: file object
+        :param file: at its start. If it is read, it is returned to its start.
+        """
+        if self._state.filename == filename:
+            # The file is already being scanned, e.g. by SecretsCollection.
+            yield
+            return
+
+        lines = {}
+        for decoder in get_decoders(filename):
+            if decoder.find_lines is not None:
+                lines[decoder] = decoder.find_lines(iter_lines(file))
+                file.seek(0)
+
+        self._state.filename = filename
+        self._state.lines = lines
+        try:
+            yield
+        finally:
+            self._state.filename = None
+            self._state.lines = {}
+
+    def get_decoders(self, filename, line_num=None):
+        """
+        :type filename: str
+        :type line_num: int|None
+        :param line_num: if None, the decoders which apply to any line of
+            the file.
+
+        :rtype: tuple of Decoder
+        """
+        decoders = get_decoders(filename)
+        if not any(decoder.find_lines for decoder in decoders):
+            return decoders
+
+        lines = self._state.lines if self._state.filename == filename else {}
+        return tuple(
+            decoder
+            for decoder in decoders
+            if decoder.find_lines is None or (
+                line_num in lines.get(decoder, ())
+                if line_num is not None
+                else lines.get(decoder)
+            )
+        )
+
+    def decode(self, line, filename, line_num=None):
+        """
+        :type line: str
+        :type filename: str
+        :type line_num: int|None
+        :param line_num: of the line in the file. If None, it is decoded by
+            the decoders which apply to any line of the file.
+
+        :rtype: tuple of str
+        :returns: decoded views of the line (one for each decoder which found
+            values that it could decode), for the decoders of the file.
+        """
+        decoders = self.get_decoders(filename, line_num)
+        if not decoders:
+            return ()
+
+        if not self.cache.is_cacheable(line):
+            return _decode_line(line, decoders)
+
+        key = (decoders, line)
+        views = self.cache.get(key)
+        if views is None:
+            views = _decode_line(line, decoders)
+            self.cache.put(key, views)
+
+        return views
+
+
+def _decode_line(line, decoders):
+    views = []
+    for decoder in decoders:
+        decoded = decoder.decode_line(line)
+        if decoded is not None:
+            views.append(decoded)
+
+    return tuple(views)
@@ -0,0 +1,94 @@
+import bisect
+
+
+class FactorIndex:
+    """The other factors (e.g. usernames, hostnames or account IDs) that
+    multi-factor secrets are verified with, found in the lines of a file.
+
+    Many secrets in a file share the same lines of context, so each line is
+    only searched once. Verifiers then look up the factors within the lines
+    of context around a secret, rather than searching the context again.
+
+    Lines must be added in order. Lines which have already been added are
+    skipped, so that the (overlapping) lines of context around each secret
+    can be added as they are found.
+    """
+
+    def __init__(self, regexes):
+        """
+        :type regexes: dict
+        :param regexes: name of factor => compiled regex (or tuple of them),
+            whose matches in a line are the factors found in it.
+        """
+        self.regexes = {
+            name: regex if isinstance(regex, tuple) else (regex,)
+            for name, regex in regexes.items()
+        }
+
+        # Name => line numbers of the factors, and the factors themselves.
+        # These are only ever appended to, so they can be read by threads
+        # verifying secrets while more lines are added.
+        self._line_numbers = {name: [] for name in regexes}
+        self._factors = {name: [] for name in regexes}
+
+        self._last_line_number = 0
+
+    @classmethod
+    def from_content(cls, regexes, content):
+        """
+        :type regexes: dict
+        :type content: str
+        :rtype: FactorIndex
+        """
+        index = cls(regexes)
+        index.add_lines(content.splitlines())
+
+        return index
+
+    def add_lines(self, lines, first_line_number=1):
+        """
+        :type lines: iterable of str
+        :type first_line_number: int
+        :param first_line_number: of the first line in `lines`.
+        """
+        for line_number, line in enumerate(lines, start=first_line_number):
+            if line_number <= self._last_line_number:
+                continue
+
+            for name, regexes in self.regexes.items():
+                for regex in regexes:
+                    for factor in regex.findall(line):
+                        self._line_numbers[name].append(line_number)
+                        self._factors[name].append(factor)
+
+            self._last_line_number = line_number
+
+    def find(self, name, line_number=None, lines_of_context=0, with_line_numbers=False):
+        """
+        :type name: str
+        :type line_number: int|None
+        :param line_number: if given, only factors within `lines_of_context`
+            of this line are returned.
+
+        :type lines_of_context: int
+
+        :type with_line_numbers: bool
+        :param with_line_numbers: if True, each factor is returned with the
+            number of the line that it was found on.
+
+        :rtype: list
+        :returns: matches of the regexes for the factor (as from `findall`),
+            in the order that they appear.
+        """
+        line_numbers = self._line_numbers[name]
+        factors = self._factors[name]
+
+        start, end = 0, len(factors)
+        if line_number is not None:
+            start = bisect.bisect_left(line_numbers, line_number - lines_of_context)
+            end = bisect.bisect_right(line_numbers, line_number + lines_of_context)
+
+        if with_line_numbers:
+            return list(zip(line_numbers[start:end], factors[start:end]))
+
+        return factors[start:end]
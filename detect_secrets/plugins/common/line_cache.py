@@ -0,0 +1,106 @@
+import threading
+from collections import namedtuple
+from collections import OrderedDict
+
+
+# Lines longer than this are rarely repeated verbatim (e.g. minified code),
+# and would take up a disproportionate amount of memory in the cache.
+MAX_CACHED_LINE_LENGTH = 1000
+
+DEFAULT_MAX_SIZE = 10000
+
+
+class CacheInfo(namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])):
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """
+        :rtype: float
+        :returns: between 0.0 and 1.0
+        """
+        total = self.hits + self.misses
+        if not total:
+            return 0.0
+
+        return self.hits / total
+
+
+class LineResultCache:
+    """A bounded, thread-safe LRU cache for the results of scanning a single line.
+
+    Monorepos contain many identical lines (license headers, generated
+    imports, lockfile entries), which would otherwise be scanned again
+    for every file that they appear in. Only the secret values found are
+    stored, so that results are not tied to a specific file or line number.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAX_SIZE, max_line_length=MAX_CACHED_LINE_LENGTH):
+        """
+        :type maxsize: int
+        :param maxsize: maximum number of lines to remember. If 0, nothing is cached.
+
+        :type max_line_length: int
+        :param max_line_length: lines longer than this are never cached.
+        """
+        self.maxsize = maxsize
+        self.max_line_length = max_line_length
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def is_cacheable(self, line):
+        """
+        :type line: str
+        :rtype: bool
+        """
+        return self.maxsize > 0 and len(line) <= self.max_line_length
+
+    def get(self, key):
+        """
+        :type key: tuple
+        :rtype: tuple|None
+        :returns: None, if the key is not in the cache.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        :type key: tuple
+        :type value: tuple
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self):
+        """
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self.maxsize,
+                currsize=len(self._data),
+            )
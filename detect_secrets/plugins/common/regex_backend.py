@@ -0,0 +1,892 @@
+"""
+Optionally runs detector patterns with RE2, which matches in linear time, so
+that no input can cause catastrophic backtracking.
+
+Patterns are written for Python's `re`, and the two engines don't agree on
+everything (e.g. what `$` or `\\d` match, or which characters are equal when
+ignoring case). So rather than passing patterns to RE2 as they are, they are
+translated from `re`'s own parse tree, with every character class spelled out
+explicitly. Patterns using features that RE2 doesn't support (e.g. lookarounds
+or backreferences) are left to `re`.
+
+The exception is a lookbehind at the start of a pattern, for the character
+before the match (e.g. `(?:(?<=\\W)|(?<=^))`, as most keyword based detectors
+start with). That character is matched instead, outside of the match that
+is reported.
+"""
+import functools
+import re
+import sys
+from bisect import bisect_left
+from bisect import bisect_right
+
+from detect_secrets.core.log import log
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:     # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+try:
+    import re2
+except ImportError:     # pragma: no cover
+    re2 = None
+
+
+DEFAULT_ENGINE = 're'
+
+ENGINES = (
+    DEFAULT_ENGINE,
+    're2',
+)
+
+# RE2 rejects counted repetitions larger than this.
+_MAX_REPEAT_COUNT = 1000
+
+_SURROGATES = (0xd800, 0xdfff)
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: r'\d',
+    sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_SPACE: r'\s',
+    sre_constants.CATEGORY_NOT_SPACE: r'\S',
+    sre_constants.CATEGORY_WORD: r'\w',
+    sre_constants.CATEGORY_NOT_WORD: r'\W',
+}
+
+_REPEAT_OPCODES = {
+    sre_constants.MAX_REPEAT: '',
+    sre_constants.MIN_REPEAT: '?',
+}
+
+_UNSUPPORTED_OPCODES = {
+    sre_constants.ASSERT: 'lookaround',
+    sre_constants.ASSERT_NOT: 'lookaround',
+    sre_constants.GROUPREF: 'backreference',
+    sre_constants.GROUPREF_EXISTS: 'conditional group',
+}
+if hasattr(sre_constants, 'ATOMIC_GROUP'):     # pragma: no cover
+    _UNSUPPORTED_OPCODES[sre_constants.ATOMIC_GROUP] = 'atomic group'
+    _UNSUPPORTED_OPCODES[sre_constants.POSSESSIVE_REPEAT] = 'possessive repeat'
+
+
+def is_available(engine):
+    """
+    :type engine: str
+    :rtype: bool
+    """
+    if engine == 're2':
+        return re2 is not None
+
+    return engine == DEFAULT_ENGINE
+
+
+def get_incompatibilities(regex):
+    """
+    :type regex: Pattern
+    :rtype: list of str
+    :returns: descriptions of the features in `regex` that prevent it from
+        running with RE2, if any.
+    """
+    return _translate_for_re2(regex)[2]
+
+
+def compile(regex, engine=DEFAULT_ENGINE):
+    """
+    :type regex: Pattern
+    :type engine: str
+
+    :rtype: Pattern|Re2Pattern
+    :returns: `regex`, compiled with the given engine. If that isn't possible
+        (e.g. the engine isn't installed), `regex` itself is returned.
+    """
+    if engine == DEFAULT_ENGINE or not is_available(engine):
+        return regex
+
+    translated_pattern, following_pattern, incompatibilities = _translate_for_re2(regex)
+    if incompatibilities:
+        log.info(
+            'Using re for %r: %s',
+            regex.pattern,
+            ', '.join(incompatibilities),
+        )
+        return regex
+
+    options = re2.Options()
+    options.log_errors = False
+    if isinstance(regex.pattern, bytes):
+        options.encoding = re2.Options.Encoding.LATIN1
+        translated_pattern = translated_pattern.encode('ascii')
+
+    if following_pattern is not None:
+        # Text is matched as bytes, so that it is only encoded once.
+        # See _Re2BoundaryPattern.
+        translated_pattern = _encode_pattern(translated_pattern)
+        following_pattern = _encode_pattern(following_pattern)
+
+    try:
+        compiled_regex = re2.compile(translated_pattern, options)
+        if following_pattern is None:
+            return Re2Pattern(regex, compiled_regex)
+
+        return _Re2BoundaryPattern(
+            regex,
+            compiled_regex,
+            re2.compile(following_pattern, options),
+        )
+    except re2.error as e:
+        log.info('Using re for %r: %s', regex.pattern, e)
+        return regex
+
+
+def _encode_pattern(pattern):
+    """
+    :type pattern: str|bytes
+    :rtype: bytes
+    """
+    if isinstance(pattern, bytes):
+        return pattern
+
+    # Translated patterns only contain ASCII (other characters are escaped).
+    return pattern.encode('ascii')
+
+
+class Re2Pattern:
+    """Runs a pattern with RE2. Results are the same as the `re` pattern that
+    it was translated from.
+
+    Text that can't be encoded as UTF-8 (i.e. has lone surrogates) can't be
+    passed to RE2, so it is matched with the original pattern instead.
+    """
+
+    def __init__(self, regex, compiled_regex):
+        """
+        :type regex: Pattern
+        :param regex: the original pattern.
+
+        :param compiled_regex: its translation, compiled with RE2.
+        """
+        self.regex = regex
+        self.compiled_regex = compiled_regex
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    @property
+    def flags(self):
+        return self.regex.flags
+
+    @property
+    def groups(self):
+        return self.regex.groups
+
+    def search(self, string, *args):
+        try:
+            return self.compiled_regex.search(string, *args)
+        except UnicodeEncodeError:
+            return self.regex.search(string, *args)
+
+    def findall(self, string, *args):
+        try:
+            return self.compiled_regex.findall(string, *args)
+        except UnicodeEncodeError:
+            return self.regex.findall(string, *args)
+
+    def finditer(self, string, *args):
+        # RE2 encodes the entire string before finding the first match.
+        try:
+            yield from self.compiled_regex.finditer(string, *args)
+        except UnicodeEncodeError:
+            yield from self.regex.finditer(string, *args)
+
+    def __repr__(self):
+        return 'Re2Pattern({!r})'.format(self.regex)
+
+
+class _Re2BoundaryPattern(Re2Pattern):
+    """Runs a pattern which starts with a lookbehind for the character before
+    the match (e.g. `(?:(?<=\\W)|(?<=^))secret`) with RE2.
+
+    RE2 doesn't support lookbehinds, so that character is matched instead,
+    and the rest of the pattern is matched in group 1. Searches start a
+    character early, so that matches may still start right after the end
+    of the previous one (as the lookbehind could see into it).
+
+    Text is encoded once, rather than for every search, so that finding
+    every match in it stays linear.
+    """
+
+    def __init__(self, regex, compiled_regex, following_regex):
+        """
+        :type regex: Pattern
+        :param regex: the original pattern.
+
+        :param compiled_regex: its translation, compiled with RE2.
+
+        :param following_regex: its translation, without the start of the
+            text as an alternative to the character before the match, for
+            searching after the start.
+        """
+        super(_Re2BoundaryPattern, self).__init__(regex, compiled_regex)
+        self.following_regex = following_regex
+
+    def search(self, string, pos=0, endpos=sys.maxsize):
+        try:
+            text = _EncodedText(string)
+        except UnicodeEncodeError:
+            return self.regex.search(string, pos, endpos)
+
+        return self._search(text, pos, endpos)
+
+    def findall(self, string, pos=0, endpos=sys.maxsize):
+        output = []
+        for match in self.finditer(string, pos, endpos):
+            if not self.groups:
+                output.append(match.group())
+            elif self.groups == 1:
+                output.append(match.groups('')[0])
+            else:
+                output.append(match.groups(''))
+
+        return output
+
+    def finditer(self, string, pos=0, endpos=sys.maxsize):
+        try:
+            text = _EncodedText(string)
+        except UnicodeEncodeError:
+            yield from self.regex.finditer(string, pos, endpos)
+            return
+
+        while True:
+            match = self._search(text, pos, endpos)
+            if match is None:
+                return
+
+            yield match
+
+            # Patterns that can match empty strings aren't run with RE2, so
+            # this always moves forward.
+            pos = match.end()
+
+    def _search(self, text, pos, endpos):
+        """
+        :type text: _EncodedText
+        :type pos: int
+        :type endpos: int
+        :rtype: _Re2BoundaryMatch|None
+        """
+        pos = max(pos, 0)
+        endpos = min(endpos, len(text.string))
+        if pos > endpos:
+            return None
+
+        if pos == 0:
+            match = self.compiled_regex.search(
+                text.encoded,
+                0,
+                text.to_bytes(endpos),
+            )
+        else:
+            # So that the character before `pos` is matched.
+            match = self.following_regex.search(
+                text.encoded,
+                text.to_bytes(pos - 1),
+                text.to_bytes(endpos),
+            )
+
+        if not match:
+            return None
+
+        return _Re2BoundaryMatch(self.regex, match, text)
+
+
+class _Re2BoundaryMatch:
+    """A match of _Re2BoundaryPattern, which is reported as the match of the
+    original pattern (i.e. without the character before it).
+    """
+
+    def __init__(self, regex, match, text):
+        """
+        :type regex: Pattern
+        :param regex: the original pattern.
+
+        :param match: of the translated pattern, in the encoded text.
+        :type text: _EncodedText
+        """
+        self.re = regex
+        self._match = match
+        self._text = text
+
+    def span(self, group=0):
+        start, end = self._match.span(self._get_index(group))
+        if start == -1:
+            return -1, -1
+
+        return self._text.to_chars(start), self._text.to_chars(end)
+
+    def start(self, group=0):
+        return self.span(group)[0]
+
+    def end(self, group=0):
+        return self.span(group)[1]
+
+    def group(self, *groups):
+        if len(groups) > 1:
+            return tuple(self.group(group) for group in groups)
+
+        start, end = self._match.span(self._get_index(groups[0] if groups else 0))
+        if start == -1:
+            return None
+
+        return self._text.decode(start, end)
+
+    def groups(self, default=None):
+        return tuple(
+            default if value is None else value
+            for value in (
+                self.group(index)
+                for index in range(1, self.re.groups + 1)
+            )
+        )
+
+    def groupdict(self, default=None):
+        return {
+            name: default if value is None else value
+            for name, value in (
+                (name, self.group(name))
+                for name in self.re.groupindex
+            )
+        }
+
+    def __getitem__(self, group):
+        return self.group(group)
+
+    def _get_index(self, group):
+        """
+        :type group: int|str
+        :rtype: int
+        :returns: the index of the group in the translated pattern, where
+            the original pattern is group 1.
+        """
+        if not isinstance(group, int):
+            group = self.re.groupindex[group]
+
+        return group + 1
+
+
+class _EncodedText:
+    """Text to match with RE2 (as bytes), which converts between the offsets
+    of characters in the text, and of bytes in its encoding.
+    """
+
+    def __init__(self, string):
+        """
+        :type string: str|bytes|mmap.mmap
+        :raises: UnicodeEncodeError, if the text has lone surrogates.
+        """
+        self.string = string
+        self.is_text = isinstance(string, str)
+        self.encoded = string.encode('utf-8') if self.is_text else string
+
+        self._is_ascii = len(self.encoded) == len(string)
+
+        # Offsets that have been converted, in order, so that conversions
+        # only need to decode the text after the nearest one.
+        self._byte_offsets = [0]
+        self._char_offsets = [0]
+
+    def to_bytes(self, offset):
+        """
+        :type offset: int
+        :param offset: of a character.
+        :rtype: int
+        """
+        if self._is_ascii:
+            return offset
+
+        index = bisect_right(self._char_offsets, offset) - 1
+        byte_offset = self._byte_offsets[index] + len(
+            self.string[self._char_offsets[index]:offset].encode('utf-8'),
+        )
+        self._remember(byte_offset, offset)
+
+        return byte_offset
+
+    def to_chars(self, offset):
+        """
+        :type offset: int
+        :param offset: of a byte in the encoded text.
+        :rtype: int
+        """
+        if self._is_ascii:
+            return offset
+
+        index = bisect_right(self._byte_offsets, offset) - 1
+        char_offset = self._char_offsets[index] + len(
+            self.encoded[self._byte_offsets[index]:offset].decode('utf-8'),
+        )
+        self._remember(offset, char_offset)
+
+        return char_offset
+
+    def decode(self, start, end):
+        """
+        :type start: int
+        :type end: int
+        :param start, end: offsets of bytes in the encoded text.
+        :rtype: str|bytes
+        """
+        value = self.encoded[start:end]
+        return value.decode('utf-8') if self.is_text else value
+
+    def _remember(self, byte_offset, char_offset):
+        index = bisect_right(self._byte_offsets, byte_offset)
+        if self._byte_offsets[index - 1] != byte_offset:
+            self._byte_offsets.insert(index, byte_offset)
+            self._char_offsets.insert(index, char_offset)
+
+
+def _translate_for_re2(regex):
+    """
+    :type regex: Pattern
+    :rtype: (str, str|None, list of str)
+    :returns: RE2 syntax for `regex`, and the reasons why that syntax can't
+        be used (if any). For patterns that start with a lookbehind, the
+        syntax for searching after the start of the text is also returned
+        (see _Re2BoundaryPattern). Otherwise, that is None.
+    """
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:   # pragma: no cover
+        return '', None, ['unparseable']
+
+    translator = _Re2Translator(
+        is_bytes=isinstance(regex.pattern, bytes),
+        group_names={
+            index: name
+            for name, index in parsed.state.groupdict.items()
+        },
+    )
+    flags = parsed.state.flags
+    following_pattern = None
+    boundary = translator.translate_leading_boundary(parsed, flags)
+    if boundary is None:
+        translated_pattern = translator.translate(parsed, flags)
+    else:
+        characters, is_at_start = boundary
+        rest = translator.translate(parsed[1:], flags)
+
+        following_pattern = '(?:{})({})'.format(characters, rest)
+        translated_pattern = following_pattern
+        if is_at_start:
+            translated_pattern = '(?:\\A|{})({})'.format(characters, rest)
+
+    if flags & re.LOCALE:
+        translator.incompatibilities.append('locale-dependent matching')
+
+    if parsed.getwidth()[0] == 0:
+        # RE2 and `re` skip over empty matches differently.
+        translator.incompatibilities.append('empty match')
+
+    return (
+        translated_pattern,
+        following_pattern,
+        sorted(set(translator.incompatibilities)),
+    )
+
+
+class _Re2Translator:
+
+    def __init__(self, is_bytes, group_names):
+        """
+        :type is_bytes: bool
+        :type group_names: dict
+        :param group_names: group index => group name, for named groups.
+        """
+        self.is_bytes = is_bytes
+        self.group_names = group_names
+
+        self.incompatibilities = []
+
+    def translate_leading_boundary(self, items, flags):
+        """Patterns often start with lookbehinds for the character before the
+        match, e.g. `(?:(?<=\\W)|(?<=^))`. RE2 can match that character
+        instead (see _Re2BoundaryPattern).
+
+        :type items: sre_parse.SubPattern
+        :type flags: int
+
+        :rtype: (str, bool)|None
+        :returns: RE2 syntax for the characters which may come before the
+            match, and whether it may also be at the start of the text. None,
+            if the pattern doesn't start with such lookbehinds.
+        """
+        if not items:
+            return None
+
+        opcode, value = items[0]
+        if opcode == sre_constants.BRANCH:
+            branches = value[1]
+        elif opcode == sre_constants.ASSERT:
+            branches = [[items[0]]]
+        else:
+            return None
+
+        characters = []
+        is_at_start = False
+        for branch in branches:
+            if len(branch) != 1 or branch[0][0] != sre_constants.ASSERT:
+                return None
+
+            direction, lookbehind = branch[0][1]
+            lookbehind = list(lookbehind)
+            if direction != -1 or len(lookbehind) != 1:
+                return None
+
+            opcode, value = lookbehind[0]
+            if opcode == sre_constants.AT and value in (
+                sre_constants.AT_BEGINNING,
+                sre_constants.AT_BEGINNING_STRING,
+            ):
+                is_at_start = True
+                if value == sre_constants.AT_BEGINNING and flags & re.MULTILINE:
+                    characters.append(self._escape(ord('\n')))
+            elif opcode in (
+                sre_constants.LITERAL,
+                sre_constants.NOT_LITERAL,
+                sre_constants.IN,
+            ):
+                characters.append(self.translate(lookbehind, flags))
+            else:
+                return None
+
+        if not characters:
+            return None
+
+        return '|'.join(characters), is_at_start
+
+    def translate(self, items, flags):
+        """
+        :type items: sre_parse.SubPattern|list
+        :type flags: int
+        :rtype: str
+        """
+        return ''.join(
+            self._translate_item(opcode, value, flags)
+            for opcode, value in items
+        )
+
+    def _translate_item(self, opcode, value, flags):
+        if opcode == sre_constants.LITERAL:
+            if flags & re.IGNORECASE:
+                return self._translate_set([(opcode, value)], flags)
+
+            return self._escape(value)
+
+        if opcode == sre_constants.NOT_LITERAL:
+            return self._translate_set(
+                [(sre_constants.NEGATE, None), (sre_constants.LITERAL, value)],
+                flags,
+            )
+
+        if opcode == sre_constants.IN:
+            return self._translate_set(value, flags)
+
+        if opcode == sre_constants.ANY:
+            return '(?s:.)' if flags & re.DOTALL else r'[^\n]'
+
+        if opcode == sre_constants.AT:
+            return self._translate_anchor(value, flags)
+
+        if opcode == sre_constants.SUBPATTERN:
+            group, add_flags, del_flags, items = value
+            translated = self.translate(items, (flags | add_flags) & ~del_flags)
+            if group is None:
+                return '(?:{})'.format(translated)
+            if group in self.group_names:
+                return '(?P<{}>{})'.format(self.group_names[group], translated)
+
+            return '({})'.format(translated)
+
+        if opcode == sre_constants.BRANCH:
+            return '(?:{})'.format(
+                '|'.join(self.translate(branch, flags) for branch in value[1]),
+            )
+
+        if opcode in _REPEAT_OPCODES:
+            min_count, max_count, items = value
+            if max_count == sre_constants.MAXREPEAT:
+                count = '{},'.format(min_count)
+            else:
+                count = '{},{}'.format(min_count, max_count)
+
+            if min_count > _MAX_REPEAT_COUNT or (
+                max_count != sre_constants.MAXREPEAT
+                and max_count > _MAX_REPEAT_COUNT
+            ):
+                self.incompatibilities.append('large repetition count')
+
+            return '(?:{}){{{}}}{}'.format(
+                self.translate(items, flags),
+                count,
+                _REPEAT_OPCODES[opcode],
+            )
+
+        self.incompatibilities.append(_UNSUPPORTED_OPCODES.get(opcode, str(opcode)))
+        return ''
+
+    def _translate_anchor(self, value, flags):
+        if value == sre_constants.AT_BEGINNING:
+            return '(?m:^)' if flags & re.MULTILINE else r'\A'
+
+        if value == sre_constants.AT_END:
+            if flags & re.MULTILINE:
+                return '(?m:$)'
+
+            # Without MULTILINE, `$` also matches before a newline at the end.
+            self.incompatibilities.append('$ without MULTILINE')
+            return ''
+
+        if value == sre_constants.AT_BEGINNING_STRING:
+            return r'\A'
+
+        if value == sre_constants.AT_END_STRING:
+            return r'\z'
+
+        # RE2's word boundaries are ASCII only.
+        if not self.is_bytes and not flags & re.ASCII:
+            self.incompatibilities.append('Unicode word boundary')
+            return ''
+
+        return r'\b' if value == sre_constants.AT_BOUNDARY else r'\B'
+
+    def _translate_set(self, items, flags):
+        """
+        :type items: list
+        :param items: contents of a character class, as parsed by `re`.
+
+        :type flags: int
+        :rtype: str
+        """
+        is_negated = False
+        ranges = []
+        for opcode, value in items:
+            if opcode == sre_constants.NEGATE:
+                is_negated = True
+            elif opcode == sre_constants.LITERAL:
+                ranges.append((value, value))
+            elif opcode == sre_constants.RANGE:
+                ranges.append(value)
+            elif opcode == sre_constants.CATEGORY:
+                ranges.extend(
+                    _get_category_ranges(
+                        value,
+                        self.is_bytes,
+                        bool(flags & re.ASCII),
+                    ),
+                )
+            else:   # pragma: no cover
+                self.incompatibilities.append(str(opcode))
+                return ''
+
+        if flags & re.IGNORECASE:
+            ranges = _get_ignorecase_ranges(
+                ranges,
+                is_negated,
+                self.is_bytes,
+                bool(flags & re.ASCII),
+            )
+
+        ranges = _merge_ranges(ranges)
+        if not self.is_bytes:
+            ranges = _remove_surrogates(ranges)
+
+        if not ranges:
+            return '(?s:.)' if is_negated else '[^{}-{}]'.format(
+                self._escape(0),
+                self._escape(0xff if self.is_bytes else sys.maxunicode),
+            )
+
+        return '[{}{}]'.format(
+            '^' if is_negated else '',
+            ''.join(
+                self._escape(start) if start == end
+                else '{}-{}'.format(self._escape(start), self._escape(end))
+                for start, end in ranges
+            ),
+        )
+
+    def _escape(self, character):
+        """
+        :type character: int
+        :rtype: str
+        """
+        if character < 0x80 and chr(character).isalnum():
+            return chr(character)
+
+        if not self.is_bytes and _SURROGATES[0] <= character <= _SURROGATES[1]:
+            self.incompatibilities.append('surrogate characters')
+
+        return r'\x{{{:x}}}'.format(character)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_all_characters(is_bytes):
+    """
+    :rtype: str|bytes
+    :returns: every possible character, where the index of each character
+        is its code point.
+    """
+    if is_bytes:
+        return bytes(range(0x100))
+
+    return ''.join(map(chr, range(sys.maxunicode + 1)))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cased_characters(is_bytes):
+    """
+    :rtype: tuple of int
+    :returns: code points of the characters that `re` may consider equal to
+        others, when ignoring case.
+    """
+    if is_bytes:
+        return tuple(range(0x100))
+
+    return tuple(
+        index
+        for index, character in enumerate(_get_all_characters(False))
+        if (
+            character.lower() != character
+            or character.upper() != character
+            or character.casefold() != character
+        )
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_category_ranges(category, is_bytes, is_ascii):
+    """
+    :rtype: tuple of (int, int)
+    :returns: the ranges of characters that `re` matches with the given
+        category (e.g. `\\d`).
+    """
+    pattern = '(?:{})+'.format(_CATEGORIES[category])
+    if is_bytes:
+        regex = re.compile(pattern.encode('ascii'))
+    else:
+        regex = re.compile(pattern, re.ASCII if is_ascii else 0)
+
+    return tuple(
+        (match.start(), match.end() - 1)
+        for match in regex.finditer(_get_all_characters(is_bytes))
+    )
+
+
+def _get_ignorecase_ranges(ranges, is_negated, is_bytes, is_ascii):
+    """`re` and RE2 don't agree on which characters are equal when ignoring
+    case (they use different Unicode versions and case folding rules). So the
+    characters that `re` considers equal are listed explicitly instead.
+
+    :type ranges: list of (int, int)
+    :type is_negated: bool
+    :type is_bytes: bool
+    :type is_ascii: bool
+
+    :rtype: list of (int, int)
+    :returns: for a set, every character that `re` matches with it when ignoring
+        case. For a negated set, every character that `re` doesn't match.
+    """
+    if not ranges:
+        return []
+
+    flags = re.IGNORECASE
+    if is_ascii and not is_bytes:
+        flags |= re.ASCII
+    regex = re.compile(_format_python_set(ranges, is_negated, is_bytes), flags)
+
+    characters = _get_all_characters(is_bytes)
+    cased_characters = _get_cased_characters(is_bytes)
+
+    output = _remove_characters(ranges, cased_characters)
+    output.extend(
+        (character, character)
+        for character in cased_characters
+        if bool(regex.match(characters, character, character + 1)) != is_negated
+    )
+
+    return output
+
+
+def _format_python_set(ranges, is_negated, is_bytes):
+    """
+    :type ranges: list of (int, int)
+    :type is_negated: bool
+    :type is_bytes: bool
+    :rtype: str|bytes
+    """
+    escape = '\\x{:02x}' if is_bytes else '\\U{:08x}'
+    pattern = '[{}{}]'.format(
+        '^' if is_negated else '',
+        ''.join(
+            escape.format(start) + '-' + escape.format(end)
+            for start, end in ranges
+        ),
+    )
+
+    return pattern.encode('ascii') if is_bytes else pattern
+
+
+def _remove_characters(ranges, characters):
+    """
+    :type ranges: list of (int, int)
+    :type characters: tuple of int
+    :param characters: sorted code points.
+
+    :rtype: list of (int, int)
+    """
+    output = []
+    for start, end in ranges:
+        index = bisect_left(characters, start)
+        while index < len(characters) and characters[index] <= end:
+            if characters[index] > start:
+                output.append((start, characters[index] - 1))
+
+            start = characters[index] + 1
+            index += 1
+
+        if start <= end:
+            output.append((start, end))
+
+    return output
+
+
+def _merge_ranges(ranges):
+    """
+    :type ranges: list of (int, int)
+    :rtype: list of (int, int)
+    :returns: sorted, non-overlapping ranges, covering the same characters.
+    """
+    output = []
+    for start, end in sorted(ranges):
+        if output and start <= output[-1][1] + 1:
+            output[-1] = (output[-1][0], max(end, output[-1][1]))
+        else:
+            output.append((start, end))
+
+    return output
+
+
+def _remove_surrogates(ranges):
+    """RE2 matches UTF-8, which can't encode surrogates.
+
+    :type ranges: list of (int, int)
+    :rtype: list of (int, int)
+    """
+    return _remove_characters(
+        ranges,
+        tuple(range(_SURROGATES[0], _SURROGATES[1] + 1)),
+    )
@@ -1,7 +1,10 @@
+import itertools
 import os
 import re
 import subprocess
 import sys
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import ibm_db
@@ -33,14 +36,27 @@ except ImportError as ie:  # pragma: no cover
 
 from .base import classproperty
 from .base import RegexBasedDetector
+from .common.applicability import Applicability
 from detect_secrets.core.constants import VerifiedResult
 
 
+# Each attempt to connect may wait for the full timeout, so only the most
+# likely combinations of factors are tried, a few at a time.
+MAX_ATTEMPTS = 8
+MAX_PARALLEL_ATTEMPTS = 4
+
+
 class Db2Detector(RegexBasedDetector):
     """ Scans for DB2 Credentials """
 
     secret_type = 'DB2 Credentials'
 
+    # Each of the password keywords contains one of these.
+    applicability = Applicability(
+        content_literals=('pass', 'pwd', 'cred', 'auth'),
+        ignore_case=True,
+    )
+
     begin = r'(?:(?<=\W)|(?<=^))'
     opt_quote = r'(?:"|\'|)'
     opt_db = r'(?:db2|dashdb|db|)'
@@ -86,59 +102,180 @@ class Db2Detector(RegexBasedDetector):
         r'*(?:.\[A-Za-z0-9]|[A-Za-z0-9][A-Za-z0-9\-]*[A-Za-z0-9]))'
     )
 
+    factor_regexes = {
+        'username': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=opt_db,
+            password_keyword_regex=username_keyword_regex,
+            password_regex=username_regex,
+        ),
+        'database': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=opt_db,
+            password_keyword_regex=database_keyword_regex,
+            password_regex=database_regex,
+        ),
+        'port': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=opt_db,
+            password_keyword_regex=port_keyword_regex,
+            password_regex=port_regex,
+        ),
+        'hostname': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=opt_db,
+            password_keyword_regex=hostname_keyword_regex,
+            password_regex=hostname_regex,
+        ),
+        # e.g. jdbc:db2://hostname:port/database
+        'url': re.compile(
+            r'jdbc:db2:\/\/{hostname}:{port}\/{database}'.format(
+                hostname=hostname_regex,
+                port=port_regex,
+                database=database_regex,
+            ),
+        ),
+    }
+
     @classproperty
     def flag_text(cls):
         return 'db2-scan'
 
+    def get_verification_factors(self, content, potential_secret=None):
+        # Only the candidates that are tried affect the result.
+        return tuple(self.get_candidates(content, potential_secret)[:MAX_ATTEMPTS])
+
     def verify(self, token, content, potential_secret, timeout=5):
+        candidates = self.get_candidates(content, potential_secret)
+        if not candidates:
+            return VerifiedResult.UNVERIFIED
 
-        username_matches = find_other_factor(
-            content, self.username_keyword_regex,
-            self.username_regex,
+        verify_result, candidate = verify_db2_candidates(
+            token,
+            candidates[:MAX_ATTEMPTS],
+            timeout,
         )
-        if not username_matches:
+        if verify_result == VerifiedResult.VERIFIED_TRUE:
+            username, database, port, hostname = candidate
+            potential_secret.other_factors['database'] = database
+            potential_secret.other_factors['hostname'] = hostname
+            potential_secret.other_factors['port'] = port
+            potential_secret.other_factors['username'] = username
+        elif len(candidates) > MAX_ATTEMPTS:
+            # The candidates that weren't tried may still be valid.
             return VerifiedResult.UNVERIFIED
 
-        database_matches = find_other_factor(
-            content, self.database_keyword_regex,
-            self.database_regex,
+        return verify_result
+
+    def get_candidates(self, content, potential_secret=None):
+        """
+        :type content: str
+        :param content: lines of context around the secret.
+
+        :type potential_secret: PotentialSecret|None
+
+        :rtype: list of (str, str, str, str)
+        :returns: combinations of (username, database, port, hostname) to
+            verify the secret with, in the order that they should be tried.
+            See `rank_candidates`.
+        """
+        usernames = self.find_factors(
+            'username', content, potential_secret, with_distances=True,
         )
-        port_matches = find_other_factor(
-            content, self.port_keyword_regex,
-            self.port_regex,
+        if not usernames:
+            return []
+
+        databases = self.find_factors(
+            'database', content, potential_secret, with_distances=True,
         )
-        hostname_matches = find_other_factor(
-            content, self.hostname_keyword_regex,
-            self.hostname_regex,
+        ports = self.find_factors('port', content, potential_secret, with_distances=True)
+        hostnames = self.find_factors(
+            'hostname', content, potential_secret, with_distances=True,
         )
 
-        url_matches = get_hostname_port_database_from_url(
-            content, self.hostname_regex, self.port_regex, self.database_regex,
-        )
-        for match in url_matches:
-            hostname, port, database = match
-            hostname_matches.append(hostname)
-            port_matches.append(port)
-            database_matches.append(database)
+        url_matches = self.find_factors('url', content, potential_secret, with_distances=True)
+        for distance, (hostname, port, database) in url_matches:
+            hostnames.append((distance, hostname))
+            ports.append((distance, port))
+            databases.append((distance, database))
 
-        if not database_matches or not port_matches or not hostname_matches:
-            return VerifiedResult.UNVERIFIED
+        if not databases or not ports or not hostnames:
+            return []
+
+        return rank_candidates(usernames, databases, ports, hostnames)
+
+
+def rank_candidates(usernames, databases, ports, hostnames):
+    """Factors found closest to the secret most likely belong with it, so
+    combinations of them are tried first.
+
+    :type usernames: list of (int, str)
+    :type databases: list of (int, str)
+    :type ports: list of (int, str)
+    :type hostnames: list of (int, str)
+    :param hostnames: each factor found, with its distance (in lines) from
+        the secret.
+
+    :rtype: list of (str, str, str, str)
+    :returns: unique combinations of (username, database, port, hostname),
+        in the order that they should be tried.
+    """
+    ranked = sorted(
+        itertools.product(usernames, databases, ports, hostnames),
+        key=lambda factors: sum(distance for distance, _ in factors),
+    )
+
+    candidates = []
+    seen = set()
+    for factors in ranked:
+        candidate = tuple(factor for _, factor in factors)
+        if candidate not in seen:
+            seen.add(candidate)
+            candidates.append(candidate)
+
+    return candidates
+
+
+def verify_db2_candidates(token, candidates, timeout=5):
+    """Tries to connect with each candidate, a few at a time, until one of
+    them succeeds. Candidates that haven't been tried by then are skipped.
+
+    :type token: str
+    :type candidates: list of (str, str, str, str)
+    :param candidates: (username, database, port, hostname), in the order
+        that they should be tried.
+
+    :type timeout: int
+    :rtype: (VerifiedResult, tuple|None)
+    :returns: VERIFIED_TRUE (with the candidate that succeeded), VERIFIED_FALSE
+        if every candidate failed, or UNVERIFIED otherwise.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(MAX_PARALLEL_ATTEMPTS, len(candidates))),
+    )
+    futures = {
+        executor.submit(
+            verify_db2_credentials,
+            database, hostname, port, username, token, timeout,
+        ): (username, database, port, hostname)
+        for username, database, port, hostname in candidates
+    }
+
+    verify_results = set()
+    try:
+        for future in as_completed(futures):
+            verify_result = future.result()
+            if verify_result == VerifiedResult.VERIFIED_TRUE:
+                return verify_result, futures[future]
+
+            verify_results.add(verify_result)
+    finally:
+        for future in futures:
+            future.cancel()
+
+        # Attempts in progress can't be interrupted, but aren't waited for.
+        executor.shutdown(wait=False)
+
+    if verify_results == {VerifiedResult.VERIFIED_FALSE}:
+        return VerifiedResult.VERIFIED_FALSE, None
 
-        for username in username_matches:  # pragma: no cover
-            for database in database_matches:  # pragma: no cover
-                for port in port_matches:  # pragma: no cover
-                    for hostname in hostname_matches:  # pragma: no cover
-                        verify_result = verify_db2_credentials(
-                            database, hostname, port, username, token, timeout,
-                        )
-                        if verify_result == VerifiedResult.VERIFIED_TRUE:
-                            potential_secret.other_factors['database'] = database
-                            potential_secret.other_factors['hostname'] = hostname
-                            potential_secret.other_factors['port'] = port
-                            potential_secret.other_factors['username'] = username
-                        return verify_result
-
-        return VerifiedResult.VERIFIED_FALSE
+    return VerifiedResult.UNVERIFIED, None
 
 
 def verify_db2_credentials(
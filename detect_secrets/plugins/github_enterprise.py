@@ -3,6 +3,7 @@ import re
 import requests
 
 from .base import RegexBasedDetector
+from .common import http_session
 from detect_secrets.constants import DEFAULT_GHE_INSTANCE
 from detect_secrets.core.constants import VerifiedResult
 
@@ -80,7 +81,7 @@ class GheDetector(RegexBasedDetector):
             if type(token) == bytes:
                 token = token.decode('UTF-8')
             headers = {'Authorization': 'token %s' % token}
-            response = requests.get(f'https://{self.ghe_instance}/api/v3', headers=headers)
+            response = http_session.get(f'https://{self.ghe_instance}/api/v3', headers=headers)
             if response.status_code == 200:
                 return VerifiedResult.VERIFIED_TRUE
             elif response.status_code == 401:
@@ -4,12 +4,17 @@ This plugin searches for GitHub tokens
 import re
 
 from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.common.applicability import Applicability
 
 
 class GitHubTokenDetector(RegexBasedDetector):
     """Scans for GitHub tokens."""
     secret_type = 'GitHub Token'
 
+    applicability = Applicability(
+        content_literals=('ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_'),
+    )
+
     denylist = [
         # ref. https://github.blog/2021-04-05-behind-githubs-new-authentication-token-formats/
         re.compile(r'(ghp|gho|ghu|ghs|ghr)_[A-Za-z0-9_]{36}'),
@@ -5,7 +5,6 @@ import re
 import string
 from abc import ABCMeta
 from abc import abstractmethod
-from contextlib import contextmanager
 
 import yaml
 
@@ -37,6 +36,15 @@ class HighEntropyStringsPlugin(BasePlugin):
         self.entropy_limit = limit
         self.regex = re.compile(r'([\'"])([%s]+)(\1)' % charset)
 
+        # These are passed explicitly where needed (rather than replacing
+        # self.regex), so that instances can be shared between threads.
+        self._non_quoted_string_regex = re.compile(
+            r'([{}]+)'.format(re.escape(charset)),
+        )
+        self._exact_non_quoted_string_regex = re.compile(
+            r'^([{}]+)$'.format(re.escape(charset)),
+        )
+
         false_positive_heuristics = [
             get_aho_corasick_helper(automaton),
             is_sequential_string,
@@ -70,6 +78,12 @@ class HighEntropyStringsPlugin(BasePlugin):
 
         return {}
 
+    def _get_line_cache_context(self, filename):
+        # Results depend on self.regex, which may be changed after initialization.
+        return super(HighEntropyStringsPlugin, self)._get_line_cache_context(filename) + (
+            self.regex.pattern,
+        )
+
     def calculate_shannon_entropy(self, data):
         """Returns the entropy of a given string.
 
@@ -99,13 +113,16 @@ class HighEntropyStringsPlugin(BasePlugin):
             )
         }
 
-    def analyze_string_content(self, string, line_num, filename, output_raw=False):
+    def analyze_string_content(self, string, line_num, filename, output_raw=False, regex=None):
         """Searches string for custom pattern, and captures all high entropy strings that
         match self.regex, with a limit defined as self.entropy_limit.
+
+        :type regex: Pattern|None
+        :param regex: to search with, instead of self.regex.
         """
         output = {}
 
-        for result in self.secret_generator(string):
+        for result in self.secret_generator(string, regex=regex):
             if self.is_secret_false_positive(result):
                 continue
 
@@ -120,11 +137,14 @@ class HighEntropyStringsPlugin(BasePlugin):
 
         return output
 
-    def secret_generator(self, string, *args, **kwargs):
+    def secret_generator(self, string, regex=None, *args, **kwargs):
+        if regex is None:
+            regex = self.regex
+
         # There may be multiple strings on the same line
-        results = self.regex.findall(string)
+        results = regex.findall(string)
         for result in results:
-            # To accommodate changing self.regex, due to different filetypes
+            # To accommodate different regexes, for different filetypes
             if isinstance(result, tuple):
                 result = result[1]
 
@@ -135,66 +155,58 @@ class HighEntropyStringsPlugin(BasePlugin):
     def adhoc_scan(self, string):
         # Since it's an individual string, it's just bad UX to require quotes
         # around the expected secret.
-        with self.non_quoted_string_regex(is_exact_match=False):
-            results = self.analyze_line(
-                string,
-                line_num=0,
-                filename='does_not_matter',
-            )
+        regex = self.get_non_quoted_string_regex(is_exact_match=False)
+        results = self.analyze_string_content(
+            string,
+            line_num=0,
+            filename='does_not_matter',
+            regex=regex,
+        )
 
-            # NOTE: Trailing space allows for nicer formatting
-            output = 'False' if not results else 'True '
-            if results:
-                # We currently assume that there's at most one secret per line.
-                output += ' ({})'.format(
-                    round(
-                        self.calculate_shannon_entropy(
-                            list(results.keys())[0].secret_value,
-                        ),
-                        3,
+        # NOTE: Trailing space allows for nicer formatting
+        output = 'False' if not results else 'True '
+        if results:
+            # We currently assume that there's at most one secret per line.
+            output += ' ({})'.format(
+                round(
+                    self.calculate_shannon_entropy(
+                        list(results.keys())[0].secret_value,
                     ),
+                    3,
+                ),
+            )
+        elif ' ' not in string:
+            # In the case where the string is a single word, and it
+            # matches the regex, we can show the entropy calculation,
+            # to assist investigation when it's unclear *why* something
+            # is not flagged.
+            #
+            # Conversely, if there are multiple words in the string,
+            # the entropy value would be confusing, since it's not clear
+            # which word the entropy is calculated for.
+            matches = regex.search(string)
+            if matches and matches.group(1) == string:
+                output += ' ({})'.format(
+                    round(self.calculate_shannon_entropy(string), 3),
                 )
-            elif ' ' not in string:
-                # In the case where the string is a single word, and it
-                # matches the regex, we can show the entropy calculation,
-                # to assist investigation when it's unclear *why* something
-                # is not flagged.
-                #
-                # Conversely, if there are multiple words in the string,
-                # the entropy value would be confusing, since it's not clear
-                # which word the entropy is calculated for.
-                matches = self.regex.search(string)
-                if matches and matches.group(1) == string:
-                    output += ' ({})'.format(
-                        round(self.calculate_shannon_entropy(string), 3),
-                    )
 
-            return output
+        return output
 
-    @contextmanager
-    def non_quoted_string_regex(self, is_exact_match=True):
+    def get_non_quoted_string_regex(self, is_exact_match=True):
         """For certain file formats, strings need not necessarily follow the
         normal convention of being denoted by single or double quotes. In these
-        cases, we modify the regex accordingly.
-
-        Public, because detect_secrets.core.audit needs to reference it.
+        cases, this regex is used instead of self.regex.
 
         :param is_exact_match: True if you need to scan the string itself.
             However, if the string is a line of text, and you want to see
             whether a secret exists in this line, use False.
-        """
-        old_regex = self.regex
 
-        regex_alternative = r'([{}]+)'.format(re.escape(self.charset))
+        :rtype: Pattern
+        """
         if is_exact_match:
-            regex_alternative = r'^' + regex_alternative + r'$'
+            return self._exact_non_quoted_string_regex
 
-        self.regex = re.compile(regex_alternative)
-
-        try:
-            yield
-        finally:
-            self.regex = old_regex
+        return self._non_quoted_string_regex
 
     def _analyze_ini_file(self, add_header=False):
         """
@@ -203,23 +215,24 @@ class HighEntropyStringsPlugin(BasePlugin):
         def wrapped(file, filename):
             output = {}
 
-            with self.non_quoted_string_regex():
-                for key, value, lineno in IniFileParser(
-                    file,
-                    add_header,
-                    exclude_lines_regex=self.exclude_lines_regex,
-                ).iterator():
-                    potential_secrets = self.analyze_string_content(
-                        value,
-                        lineno,
-                        filename,
-                    )
-                    line = u'{key}={value}'.format(key=key, value=value)
-                    potential_secrets = self._filter_false_positives_with_line_ctx(
-                        potential_secrets,
-                        line,
-                    )
-                    output.update(potential_secrets)
+            regex = self.get_non_quoted_string_regex()
+            for key, value, lineno in IniFileParser(
+                file,
+                add_header,
+                exclude_lines_regex=self.exclude_lines_regex,
+            ).iterator():
+                potential_secrets = self.analyze_string_content(
+                    value,
+                    lineno,
+                    filename,
+                    regex=regex,
+                )
+                line = u'{key}={value}'.format(key=key, value=value)
+                potential_secrets = self._filter_false_positives_with_line_ctx(
+                    potential_secrets,
+                    line,
+                )
+                output.update(potential_secrets)
 
             return output
 
@@ -248,47 +261,48 @@ class HighEntropyStringsPlugin(BasePlugin):
         potential_secrets = {}
 
         to_search = [data]
-        with self.non_quoted_string_regex():
-            while len(to_search) > 0:
-                item = to_search.pop()
-
-                if '__line__' not in item:
-                    for key in item:
-                        obj = item[key] if isinstance(item, dict) else key
-                        if isinstance(obj, dict):
-                            to_search.append(obj)
-                    continue
-
-                if item['__line__'] in ignored_lines:
-                    continue
-
-                # An isinstance check doesn't work in py2
-                # so we need the __is_binary__ field.
-                string_to_scan = (
-                    self.decode_binary(item['__value__'])
-                    if item['__is_binary__']
-                    else item['__value__']
-                )
+        regex = self.get_non_quoted_string_regex()
+        while len(to_search) > 0:
+            item = to_search.pop()
+
+            if '__line__' not in item:
+                for key in item:
+                    obj = item[key] if isinstance(item, dict) else key
+                    if isinstance(obj, dict):
+                        to_search.append(obj)
+                continue
 
-                secrets = self.analyze_string_content(
-                    string_to_scan,
-                    item['__line__'],
-                    filename,
-                )
+            if item['__line__'] in ignored_lines:
+                continue
+
+            # An isinstance check doesn't work in py2
+            # so we need the __is_binary__ field.
+            string_to_scan = (
+                self.decode_binary(item['__value__'])
+                if item['__is_binary__']
+                else item['__value__']
+            )
+
+            secrets = self.analyze_string_content(
+                string_to_scan,
+                item['__line__'],
+                filename,
+                regex=regex,
+            )
 
-                if item['__is_binary__']:
-                    secrets = self._encode_yaml_binary_secrets(secrets)
+            if item['__is_binary__']:
+                secrets = self._encode_yaml_binary_secrets(secrets)
 
-                dumped_key_value = yaml.dump({
-                    item['__original_key__']: item['__value__'],
-                }).replace('\n', '')
+            dumped_key_value = yaml.dump({
+                item['__original_key__']: item['__value__'],
+            }).replace('\n', '')
 
-                secrets = self._filter_false_positives_with_line_ctx(
-                    secrets,
-                    dumped_key_value,
-                )
+            secrets = self._filter_false_positives_with_line_ctx(
+                secrets,
+                dumped_key_value,
+            )
 
-                potential_secrets.update(secrets)
+            potential_secrets.update(secrets)
 
         return potential_secrets
 
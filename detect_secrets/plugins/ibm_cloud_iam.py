@@ -1,6 +1,7 @@
 import requests
 
 from .base import RegexBasedDetector
+from .common import http_session
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -48,7 +49,7 @@ def verify_cloud_iam_api_key(apikey):  # pragma: no cover
         'Content-Type': 'application/x-www-form-urlencoded',
         'Accept': 'application/json',
     }
-    response = requests.post(
+    response = http_session.post(
         'https://iam.cloud.ibm.com/identity/introspect',
         headers=headers,
         data={
@@ -5,6 +5,7 @@ import hmac
 import requests
 
 from .base import RegexBasedDetector
+from .common import http_session
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -29,8 +30,21 @@ class IbmCosHmacDetector(RegexBasedDetector):
         ),
     )
 
+    key_id_keyword_regex = r'(?:access[-_]?(?:key)?[-_]?(?:id)?|key[-_]?id)'
+    key_id_regex = r'([a-f0-9]{32})'
+    factor_regexes = {
+        'access_key_id': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=token_prefix,
+            password_keyword_regex=key_id_keyword_regex,
+            password_regex=key_id_regex,
+        ),
+    }
+
+    def get_verification_factors(self, content, potential_secret=None):
+        return tuple(self.find_factors('access_key_id', content, potential_secret))
+
     def verify(self, token, content, potential_secret=None):
-        key_id_matches = find_access_key_id(content)
+        key_id_matches = self.find_factors('access_key_id', content, potential_secret)
 
         if not key_id_matches:
             return VerifiedResult.UNVERIFIED
@@ -50,14 +64,7 @@ class IbmCosHmacDetector(RegexBasedDetector):
 
 
 def find_access_key_id(content):
-    key_id_keyword_regex = r'(?:access[-_]?(?:key)?[-_]?(?:id)?|key[-_]?id)'
-    key_id_regex = r'([a-f0-9]{32})'
-
-    regex = RegexBasedDetector.assign_regex_generator(
-        prefix_regex=IbmCosHmacDetector.token_prefix,
-        password_keyword_regex=key_id_keyword_regex,
-        password_regex=key_id_regex,
-    )
+    regex = IbmCosHmacDetector.factor_regexes['access_key_id']
 
     return [
         match
@@ -157,6 +164,6 @@ def query_ibm_cos_hmac(
     # the 'requests' package autmatically adds the required 'host' header
     request_url = endpoint + standardized_resource + standardized_querystring
 
-    request = requests.get(request_url, headers=headers)
+    request = http_session.get(request_url, headers=headers)
 
     return request
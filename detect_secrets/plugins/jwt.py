@@ -7,11 +7,14 @@ import re
 
 from .base import classproperty
 from .base import RegexBasedDetector
+from .common.applicability import Applicability
 
 
 class JwtTokenDetector(RegexBasedDetector):
     """Scans for JWTs."""
     secret_type = 'JSON Web Token'
+
+    applicability = Applicability(content_literals=('eyJ',))
     denylist = [
         re.compile(r'eyJ[A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*?'),
     ]
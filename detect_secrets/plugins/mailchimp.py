@@ -4,9 +4,9 @@ This plugin searches for Mailchimp keys
 import re
 from base64 import b64encode
 
-import requests
-
 from .base import RegexBasedDetector
+from .common import http_session
+from .common.applicability import Applicability
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -14,6 +14,8 @@ class MailchimpDetector(RegexBasedDetector):
     """Scans for Mailchimp keys."""
     secret_type = 'Mailchimp Access Key'
 
+    applicability = Applicability(content_literals=('-us',))
+
     denylist = (
         re.compile(r'[0-9a-z]{32}-us[0-9]{1,2}'),
     )
@@ -21,7 +23,7 @@ class MailchimpDetector(RegexBasedDetector):
     def verify(self, token, *args, **kwargs):  # pragma: no cover
         _, datacenter_number = token.split('-us')
 
-        response = requests.get(
+        response = http_session.get(
             'https://us{}.api.mailchimp.com/3.0/'.format(
                 datacenter_number,
             ),
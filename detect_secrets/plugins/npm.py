@@ -4,12 +4,15 @@ This plugin searches for NPM tokens
 import re
 
 from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.common.applicability import Applicability
 
 
 class NpmDetector(RegexBasedDetector):
     """Scans for NPM tokens."""
     secret_type = 'NPM tokens'
 
+    applicability = Applicability(content_literals=('/:_authToken=',))
+
     denylist = [
         # npmrc authToken
         # ref. https://stackoverflow.com/questions/53099434/using-auth-tokens-in-npmrc
@@ -27,6 +27,7 @@ THE SOFTWARE.
 import re
 
 from .base import RegexBasedDetector
+from .common.applicability import Applicability
 
 
 class PrivateKeyDetector(RegexBasedDetector):
@@ -39,6 +40,10 @@ class PrivateKeyDetector(RegexBasedDetector):
 
     secret_type = 'Private Key'
 
+    applicability = Applicability(
+        content_literals=('PRIVATE KEY', 'PuTTY-User-Key-File-2'),
+    )
+
     denylist = [  # lgtm [py/non-iterable-in-for-loop]
         re.compile(regexp)
         for regexp in (
@@ -3,9 +3,9 @@ This plugin searches for Slack tokens
 """
 import re
 
-import requests
-
 from .base import RegexBasedDetector
+from .common import http_session
+from .common.applicability import Applicability
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -13,6 +13,11 @@ class SlackDetector(RegexBasedDetector):
     """Scans for Slack tokens."""
     secret_type = 'Slack Token'
 
+    applicability = Applicability(
+        content_literals=('xox', 'https://hooks'),
+        ignore_case=True,
+    )
+
     denylist = (
         # Slack Token
         re.compile(r'xox(?:a|b|p|o|s|r)-(?:\d+-)+[a-z0-9]+', flags=re.IGNORECASE),
@@ -27,7 +32,7 @@ class SlackDetector(RegexBasedDetector):
 
     def verify(self, token, *args, **kwargs):  # pragma: no cover
         if token.startswith('https://hooks.slack.com/services/T'):
-            response = requests.post(
+            response = http_session.post(
                 token,
                 json={
                     'text': '',
@@ -38,7 +43,7 @@ class SlackDetector(RegexBasedDetector):
                 or response.text == 'no_text'
             )
         else:
-            response = requests.post(
+            response = http_session.post(
                 'https://slack.com/api/auth.test',
                 data={
                     'token': token,
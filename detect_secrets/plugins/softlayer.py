@@ -3,6 +3,7 @@ import re
 import requests
 
 from .base import RegexBasedDetector
+from .common import http_session
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -28,8 +29,22 @@ class SoftlayerDetector(RegexBasedDetector):
         ),
     ]
 
+    username_keyword = r'(?:username|id|user|userid|user-id|user-name|' + \
+        r'name|user_id|user_name|uname)'
+    username = r'(\w(?:\w|_|@|\.|-)+)'
+    factor_regexes = {
+        'username': RegexBasedDetector.assign_regex_generator(
+            prefix_regex=sl,
+            password_keyword_regex=username_keyword,
+            password_regex=username,
+        ),
+    }
+
+    def get_verification_factors(self, content, potential_secret=None):
+        return tuple(self.find_factors('username', content, potential_secret))
+
     def verify(self, token, content, potential_secret=None):
-        usernames = find_username(content)
+        usernames = self.find_factors('username', content, potential_secret)
         if not usernames:
             return VerifiedResult.UNVERIFIED
 
@@ -40,17 +55,7 @@ class SoftlayerDetector(RegexBasedDetector):
 
 
 def find_username(content):
-    # opt means optional
-    username_keyword = r'(?:username|id|user|userid|user-id|user-name|' + \
-        r'name|user_id|user_name|uname)'
-    username = r'(\w(?:\w|_|@|\.|-)+)'
-    regex = re.compile(
-        RegexBasedDetector.assign_regex_generator(
-            prefix_regex=SoftlayerDetector.sl,
-            password_keyword_regex=username_keyword,
-            password_regex=username,
-        ),
-    )
+    regex = SoftlayerDetector.factor_regexes['username']
 
     return [
         match
@@ -62,7 +67,7 @@ def find_username(content):
 def verify_softlayer_key(username, token, potential_secret=None):
     try:
         headers = {'Content-type': 'application/json'}
-        response = requests.get(
+        response = http_session.get(
             'https://api.softlayer.com/rest/v3/SoftLayer_Account.json',
             auth=(username, token), headers=headers,
         )
@@ -1,12 +1,15 @@
 import re
 
 from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.common.applicability import Applicability
 
 
 class SquareOAuthDetector(RegexBasedDetector):
     """Scans for Square OAuth Secrets"""
     secret_type = 'Square OAuth Secret'
 
+    applicability = Applicability(content_literals=('sq0csp-',))
+
     denylist = [
         re.compile(r'sq0csp-[0-9A-Za-z\\\-_]{43}'),
     ]
@@ -1,9 +1,9 @@
 import re
 from base64 import b64encode
 
-import requests
-
 from .base import RegexBasedDetector
+from .common import http_session
+from .common.applicability import Applicability
 from detect_secrets.core.constants import VerifiedResult
 
 
@@ -11,13 +11,15 @@ class StripeDetector(RegexBasedDetector):
     """Scans for Stripe keys."""
     secret_type = 'Stripe Access Key'
 
+    applicability = Applicability(content_literals=('k_live_',))
+
     denylist = (
         # Stripe standard keys begin with sk_live and restricted with rk_live
         re.compile(r'(?:r|s)k_live_[0-9a-zA-Z]{24}'),
     )
 
     def verify(self, token, *args, **kwargs):  # pragma: no cover
-        response = requests.get(
+        response = http_session.get(
             'https://api.stripe.com/v1/charges',
             headers={
                 'Authorization': b'Basic ' + b64encode(
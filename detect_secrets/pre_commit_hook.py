@@ -11,6 +11,7 @@ from detect_secrets.core.common import write_baseline_to_file
 from detect_secrets.core.log import get_logger
 from detect_secrets.core.secrets_collection import SecretsCollection
 from detect_secrets.core.usage import ParserBuilder
+from detect_secrets.core.verification_cache import get_verification_cache
 from detect_secrets.plugins.common import initialize
 from detect_secrets.util import build_automaton
 from detect_secrets.util import version_check
@@ -64,7 +65,12 @@ def main(argv=None):
         )
         baseline_collection.plugins = plugins
 
-    results_collection = find_secrets_in_files(args, plugins)
+    results_collection = find_secrets_in_files(
+        args,
+        plugins,
+        # Files are scanned consistently with the baseline.
+        file_policies=baseline_collection.file_policies if baseline_collection else None,
+    )
     if baseline_collection:
         original_results_collection = results_collection
         results_collection = get_secrets_not_in_baseline(
@@ -142,11 +148,14 @@ def get_baseline(baseline_filename, plugin_filenames=None):
 
     raise_exception_if_baseline_file_is_unstaged(baseline_filename)
 
+    # The hook only needs to materialize the baseline secrets of the
+    # files being committed, so we load the baseline lazily.
     return SecretsCollection.load_baseline_from_string(
         _get_baseline_string_from_file(
             baseline_filename,
         ),
         plugin_filenames=plugin_filenames,
+        lazy=True,
     )
 
 
@@ -197,8 +206,12 @@ def raise_exception_if_baseline_file_is_unstaged(filename):
         raise ValueError
 
 
-def find_secrets_in_files(args, plugins):
-    collection = SecretsCollection(plugins)
+def find_secrets_in_files(args, plugins, file_policies=None):
+    collection = SecretsCollection(
+        plugins,
+        file_policies=file_policies,
+        verification_cache=get_verification_cache(args),
+    )
 
     for filename in args.filenames:
         # Don't scan the baseline file
@@ -207,6 +220,7 @@ def find_secrets_in_files(args, plugins):
 
         collection.scan_file(filename)
 
+    collection.wait_for_verification()
     return collection
 
 
@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+"""
+Compares eager and lazy baseline loading, for a generated baseline.
+
+Each mode is measured in a separate process, so that the peak RSS of
+one does not affect the other.
+"""
+import argparse
+import hashlib
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from monotonic import monotonic
+
+from detect_secrets.core.baseline import get_unaudited_secrets_from_baseline
+from detect_secrets.core.secrets_collection import SecretsCollection
+
+
+MODES = ('eager', 'lazy')
+
+
+def main():
+    args = get_arguments()
+    if args.mode:
+        print(json.dumps(run_single(args.mode, args.baseline_file)))
+        return 0
+
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as f:
+        json.dump(generate_baseline(args.num_entries, args.entries_per_file), f)
+        f.flush()
+
+        results = {}
+        for mode in MODES:
+            runs = [
+                json.loads(
+                    subprocess.check_output([
+                        sys.executable,
+                        __file__,
+                        '--mode', mode,
+                        '--baseline-file', f.name,
+                    ]),
+                )
+                for _ in range(args.num_iterations)
+            ]
+
+            results[mode] = {
+                key: round(statistics.mean(run[key] for run in runs), 5)
+                for key in runs[0]
+            }
+
+    if args.pretty:
+        print('{} entries'.format(args.num_entries))
+        for mode, result in results.items():
+            print(
+                '{:6}: load {load}s, unaudited {unaudited}s, peak RSS {peak_rss_mb}MB'.format(
+                    mode,
+                    **result
+                ),
+            )
+    else:
+        print(json.dumps(results, indent=2))
+
+    return 0
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark baseline loading.')
+    parser.add_argument(
+        '--num-entries',
+        default=100000,
+        type=assert_positive(int),
+        help='Number of results in the generated baseline.',
+    )
+    parser.add_argument(
+        '--entries-per-file',
+        default=10,
+        type=assert_positive(int),
+        help='Number of results per file in the generated baseline.',
+    )
+    parser.add_argument(
+        '-n',
+        '--num-iterations',
+        default=1,
+        type=assert_positive(int),
+        help=(
+            'Specifies the number of times to run the test. '
+            'Results will be averaged over this value.'
+        ),
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Human readable output.',
+    )
+
+    # Used internally, to measure a single mode in a fresh process.
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--baseline-file', help=argparse.SUPPRESS)
+
+    return parser.parse_args()
+
+
+def assert_positive(type):
+    def wrapped(string):
+        value = type(string)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(
+                '{} must be a positive {}.'.format(
+                    string,
+                    type.__name__,
+                ),
+            )
+
+        return value
+
+    return wrapped
+
+
+def generate_baseline(num_entries, entries_per_file):
+    """
+    :type num_entries: int
+    :type entries_per_file: int
+    :rtype: dict
+    """
+    results = {}
+    for index in range(num_entries):
+        filename = 'path/to/file_{}.py'.format(index // entries_per_file)
+        results.setdefault(filename, []).append({
+            'type': 'Secret Keyword',
+            'line_number': index % entries_per_file + 1,
+            'hashed_secret': hashlib.sha1(str(index).encode('utf-8')).hexdigest(),
+            'is_verified': False,
+            'verified_result': None,
+            'is_secret': False if index % 2 else None,
+        })
+
+    return {
+        'exclude': {
+            'files': None,
+            'lines': None,
+        },
+        'generated_at': '2020-01-01T00:00:00Z',
+        'plugins_used': [],
+        'results': results,
+        'version': '0.13.1',
+    }
+
+
+def run_single(mode, baseline_file):
+    """
+    :type mode: str
+    :type baseline_file: str
+    :rtype: dict
+    """
+    with open(baseline_file) as f:
+        data = json.load(f)
+
+    start_time = monotonic()
+    baseline = SecretsCollection.load_baseline_from_dict(
+        data,
+        lazy=mode == 'lazy',
+    )
+    load_time = monotonic() - start_time
+
+    start_time = monotonic()
+    get_unaudited_secrets_from_baseline(baseline)
+    unaudited_time = monotonic() - start_time
+
+    # ru_maxrss is in kilobytes on Linux.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        'load': round(load_time, 5),
+        'unaudited': round(unaudited_time, 5),
+        'peak_rss_mb': round(peak_rss / 1024, 2),
+    }
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""
+Benchmark for verifying DB2 credentials, when many candidates for the
+other factors (usernames, hostnames, ports and databases) are found around
+the password.
+
+Connections are made to a stub of `ibm_db.connect`, which waits for
+`--latency` seconds before accepting (only) the factors nearest to the
+password, like a real server would.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+import mock
+from monotonic import monotonic
+
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.potential_secret import PotentialSecret
+from detect_secrets.plugins import db2
+from detect_secrets.plugins.db2 import Db2Detector
+
+
+PASSWORD = 'benchmark_password'
+
+
+def main():
+    args = get_arguments()
+
+    lines = []
+    for index in range(args.num_candidates):
+        lines.extend([
+            'user=user_{}'.format(index),
+            'hostname=host{}.example.com'.format(index),
+            'port={}'.format(50000 + index),
+            'database=database_{}'.format(index),
+        ])
+    lines.append('password={}'.format(PASSWORD))
+    content = '\n'.join(lines)
+
+    # The factors on the lines right above the password.
+    valid = {
+        'uid': 'user_{}'.format(args.num_candidates - 1),
+        'hostname': 'host{}.example.com'.format(args.num_candidates - 1),
+        'port': str(50000 + args.num_candidates - 1),
+        'database': 'database_{}'.format(args.num_candidates - 1),
+    }
+
+    attempts = []
+    lock = threading.Lock()
+
+    def connect(conn_str, user, password):
+        with lock:
+            attempts.append(conn_str)
+
+        time.sleep(args.latency)
+
+        factors = dict(
+            factor.split('=', 1)
+            for factor in conn_str.split(';')
+        )
+        if all(factors[key] == value for key, value in valid.items()):
+            return True
+
+        raise Exception('SQL30082N Security processing failed: invalid password')
+
+    potential_secret = PotentialSecret(
+        Db2Detector.secret_type,
+        'benchmark',
+        PASSWORD,
+        lineno=len(lines),
+    )
+    with mock.patch.object(db2.ibm_db, 'connect', connect):
+        start_time = monotonic()
+        verify_result = Db2Detector().verify(PASSWORD, content, potential_secret)
+        elapsed = monotonic() - start_time
+
+    results = {
+        'candidates': args.num_candidates ** 4,
+        'attempts': len(attempts),
+        'verified': verify_result == VerifiedResult.VERIFIED_TRUE,
+        'seconds': round(elapsed, 5),
+    }
+
+    if args.pretty:
+        for key, value in results.items():
+            print('{:15}: {}'.format(key, value))
+    else:
+        print(json.dumps(results, indent=2))
+
+    return 0
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark DB2 verification.')
+    parser.add_argument(
+        '--num-candidates',
+        default=4,
+        type=assert_positive(int),
+        help='Number of candidates found for each of the other factors.',
+    )
+    parser.add_argument(
+        '--latency',
+        default=0.5,
+        type=assert_positive(float),
+        help='Seconds that each attempt to connect takes.',
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Human readable output.',
+    )
+
+    return parser.parse_args()
+
+
+def assert_positive(type):
+    def wrapped(string):
+        value = type(string)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(
+                '{} must be a positive {}.'.format(
+                    string,
+                    type.__name__,
+                ),
+            )
+
+        return value
+
+    return wrapped
+
+
+if __name__ == '__main__':
+    sys.exit(main())
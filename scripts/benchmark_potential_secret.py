@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Micro-benchmark for PotentialSecret: construction, hashing and
+insertion into a set.
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+
+from monotonic import monotonic
+
+from detect_secrets.core.potential_secret import PotentialSecret
+
+
+def main():
+    args = get_arguments()
+
+    secrets = [
+        'secret_{}'.format(index)
+        for index in range(args.num_instances)
+    ]
+    filenames = [
+        'path/to/file_{}.py'.format(index)
+        for index in range(args.num_files)
+    ]
+
+    timings = {}
+
+    tracemalloc.start()
+    start_time = monotonic()
+    instances = [
+        PotentialSecret(
+            'Secret Keyword',
+            # Copies, as would be the case when read from different files.
+            ''.join(filenames[index % args.num_files]),
+            secret,
+            lineno=index,
+        )
+        for index, secret in enumerate(secrets)
+    ]
+    timings['construct'] = monotonic() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start_time = monotonic()
+    for instance in instances:
+        hash(instance)
+    timings['hash'] = monotonic() - start_time
+
+    start_time = monotonic()
+    output = set()
+    for instance in instances:
+        output.add(instance)
+    timings['set'] = monotonic() - start_time
+
+    assert len(output) == args.num_instances
+
+    results = {
+        key: round(value, 5)
+        for key, value in timings.items()
+    }
+    results['peak_memory_mb'] = round(peak_memory / 1024 / 1024, 2)
+
+    if args.pretty:
+        print('{} instances'.format(args.num_instances))
+        for key, value in results.items():
+            print('{:15}: {}'.format(key, value))
+    else:
+        print(json.dumps(results, indent=2))
+
+    return 0
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark PotentialSecret.')
+    parser.add_argument(
+        '--num-instances',
+        default=1000000,
+        type=assert_positive(int),
+        help='Number of PotentialSecrets to create.',
+    )
+    parser.add_argument(
+        '--num-files',
+        default=1000,
+        type=assert_positive(int),
+        help='Number of distinct filenames to spread the secrets across.',
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Human readable output.',
+    )
+
+    return parser.parse_args()
+
+
+def assert_positive(type):
+    def wrapped(string):
+        value = type(string)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(
+                '{} must be a positive {}.'.format(
+                    string,
+                    type.__name__,
+                ),
+            )
+
+        return value
+
+    return wrapped
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,514 @@
+#!/usr/bin/python3
+"""
+Worst-case benchmark for the regexes that plugins run over file contents.
+
+Each regex is run over adversarial inputs of increasing length: long runs of
+quotes, spaces, `=` and other delimiters, and repeated near-misses of the
+regex itself (e.g. `AKIA000...` without enough characters to match). Exits
+with an error if the time taken for any input grows faster than linearly,
+or doesn't finish within the timeout.
+"""
+import argparse
+import json
+import math
+import re
+import signal
+import sys
+
+from monotonic import monotonic
+
+from detect_secrets.plugins import aws
+from detect_secrets.plugins import box
+from detect_secrets.plugins import cloudant
+from detect_secrets.plugins import db2
+from detect_secrets.plugins import ibm_cos_hmac
+from detect_secrets.plugins import keyword
+from detect_secrets.plugins import softlayer
+from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.common.constants import ALLOWLIST_REGEXES
+from detect_secrets.plugins.common.util import import_plugins
+from detect_secrets.plugins.high_entropy_strings import Base64HighEntropyString
+from detect_secrets.plugins.high_entropy_strings import HexHighEntropyString
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:     # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+
+FILLERS = (' ', '=', '"', "'", ':', '-', 'a', '0', '\\')
+
+
+class Timeout(Exception):
+    pass
+
+
+def main():
+    args = get_arguments()
+
+    lengths = [
+        args.min_length * 2 ** step
+        for step in range(args.num_steps)
+    ]
+
+    results = []
+    for name, evaluate, samples in get_targets():
+        if args.filter and args.filter not in name:
+            continue
+
+        results.append(
+            benchmark_target(name, evaluate, samples, lengths, args),
+        )
+
+    failures = [result for result in results if not result['passed']]
+
+    if args.pretty:
+        print_results(results, lengths)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if failures:
+        print(
+            '{} of {} regexes grow faster than linearly: {}'.format(
+                len(failures),
+                len(results),
+                ', '.join(result['name'] for result in failures),
+            ),
+            file=sys.stderr,
+        )
+        return 1
+
+    return 0
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser(
+        description='Benchmark plugin regexes on adversarial inputs.',
+    )
+    parser.add_argument(
+        '--min-length',
+        default=1000,
+        type=assert_positive(int),
+        help='Length of the shortest input, in characters.',
+    )
+    parser.add_argument(
+        '--num-steps',
+        default=4,
+        type=assert_positive(int),
+        help='Number of input lengths to time. Each is double the previous one.',
+    )
+    parser.add_argument(
+        '--max-exponent',
+        default=1.5,
+        type=assert_positive(float),
+        help=(
+            'Fail if time grows faster than length to this power, between '
+            'the two longest inputs.'
+        ),
+    )
+    parser.add_argument(
+        '--min-seconds',
+        default=0.01,
+        type=assert_positive(float),
+        help=(
+            'Ignore growth for inputs that take less than this, since the '
+            'timings are mostly noise.'
+        ),
+    )
+    parser.add_argument(
+        '--timeout',
+        default=5,
+        type=assert_positive(float),
+        help='Fail if a single input takes longer than this, in seconds.',
+    )
+    parser.add_argument(
+        '--filter',
+        help='Only benchmark regexes with names containing this.',
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Human readable output.',
+    )
+
+    return parser.parse_args()
+
+
+def assert_positive(type):
+    def wrapped(string):
+        value = type(string)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(
+                '{} must be a positive {}.'.format(
+                    string,
+                    type.__name__,
+                ),
+            )
+
+        return value
+
+    return wrapped
+
+
+def get_targets():
+    """
+    :rtype: list of (str, function, list of str)
+    :returns: the name of each regex, a function that runs it over some text
+        (the same way that plugins do), and samples of text that it matches.
+    """
+    targets = []
+    for name, plugin_class in sorted(import_plugins().items()):
+        if not issubclass(plugin_class, RegexBasedDetector):
+            continue
+
+        for index, regex in enumerate(plugin_class().denylist):
+            targets.append(
+                (
+                    '{}.denylist[{}]'.format(name, index),
+                    regex.findall,
+                    [get_sample(regex)],
+                ),
+            )
+
+    for name, regex in sorted(vars(keyword).items()):
+        if isinstance(regex, re.Pattern):
+            # Lines are lowered before they are searched.
+            targets.append(
+                ('keyword.{}'.format(name), regex.search, [get_sample(regex)]),
+            )
+
+    for plugin in (
+        HexHighEntropyString(hex_limit=3),
+        Base64HighEntropyString(base64_limit=4.5),
+    ):
+        name = plugin.__class__.__name__
+        targets.append(
+            ('{}.regex'.format(name), plugin.regex.findall, [get_sample(plugin.regex)]),
+        )
+
+        regex = plugin.get_non_quoted_string_regex(is_exact_match=False)
+        targets.append(
+            (
+                '{}.non_quoted_string_regex'.format(name),
+                regex.findall,
+                [get_sample(regex)],
+            ),
+        )
+
+    for index, regex in enumerate(ALLOWLIST_REGEXES):
+        targets.append(
+            (
+                'ALLOWLIST_REGEXES[{}]'.format(index),
+                regex.search,
+                [get_sample(regex)],
+            ),
+        )
+
+    targets.extend(get_verification_targets())
+    return targets
+
+
+def get_verification_targets():
+    """These regexes are built when verifying secrets, and run over the lines
+    of context around each secret. So they are benchmarked through the
+    functions that build them.
+    """
+    targets = [
+        (
+            'aws.get_secret_access_keys',
+            aws.get_secret_access_keys,
+            ['= "' + 'A' * 39],
+        ),
+        (
+            'cloudant.find_account',
+            cloudant.find_account,
+            ['cloudant_host = ', 'https://a.cloudant.co'],
+        ),
+        (
+            'ibm_cos_hmac.find_access_key_id',
+            ibm_cos_hmac.find_access_key_id,
+            ['access_key_id = ' + '0' * 31],
+        ),
+        (
+            'softlayer.find_username',
+            softlayer.find_username,
+            ['softlayer_username = '],
+        ),
+        (
+            'db2.get_hostname_port_database_from_url',
+            lambda content: db2.get_hostname_port_database_from_url(
+                content,
+                db2.Db2Detector.hostname_regex,
+                db2.Db2Detector.port_regex,
+                db2.Db2Detector.database_regex,
+            ),
+            ['jdbc:db2://a-a.a-a:5000/'],
+        ),
+    ]
+
+    for factor in ('clientid', 'publickeyid', 'privatekey', 'passphrase', 'enterpriseid'):
+        prefix, factor_keyword, factor_regex = (
+            getattr(box.BoxDetector, '{}_{}'.format(factor, attribute))
+            for attribute in ('prefix', 'factor_keyword', 'factor')
+        )
+        targets.append(
+            (
+                'box.find_other_factor({})'.format(factor),
+                lambda content, arguments=(prefix, factor_keyword, factor_regex): (
+                    box.find_other_factor(content, *arguments)
+                ),
+                [
+                    get_sample(
+                        RegexBasedDetector.assign_regex_generator(
+                            prefix,
+                            factor_keyword,
+                            factor_regex,
+                        ),
+                    ),
+                ],
+            ),
+        )
+
+    for factor in ('username', 'database', 'port', 'hostname'):
+        factor_keyword, factor_regex = (
+            getattr(db2.Db2Detector, '{}_{}'.format(factor, attribute))
+            for attribute in ('keyword_regex', 'regex')
+        )
+        targets.append(
+            (
+                'db2.find_other_factor({})'.format(factor),
+                lambda content, arguments=(factor_keyword, factor_regex): (
+                    db2.find_other_factor(content, *arguments)
+                ),
+                [
+                    get_sample(
+                        RegexBasedDetector.assign_regex_generator(
+                            db2.Db2Detector.opt_db,
+                            factor_keyword,
+                            factor_regex,
+                        ),
+                    ),
+                ],
+            ),
+        )
+
+    return targets
+
+
+def get_sample(regex):
+    """
+    :type regex: Pattern
+    :rtype: str
+    :returns: a short string that matches (most of) `regex`. Lookarounds and
+        backreferences are ignored.
+    """
+    return _get_sample(sre_parse.parse(regex.pattern, regex.flags))
+
+
+def _get_sample(items):
+    output = ''
+    for opcode, value in items:
+        if opcode == sre_constants.LITERAL:
+            output += chr(value)
+        elif opcode == sre_constants.NOT_LITERAL:
+            output += 'b' if chr(value) == 'a' else 'a'
+        elif opcode == sre_constants.ANY:
+            output += 'a'
+        elif opcode == sre_constants.IN:
+            output += _get_sample_character(value)
+        elif opcode == sre_constants.SUBPATTERN:
+            output += _get_sample(value[-1])
+        elif opcode == sre_constants.BRANCH:
+            output += _get_sample(value[1][0])
+        elif opcode in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            min_count, _, repeated_items = value
+            output += _get_sample(repeated_items) * max(min_count, 1)
+
+    return output
+
+
+def _get_sample_character(items):
+    if items[0][0] == sre_constants.NEGATE:
+        excluded = set()
+        for opcode, value in items[1:]:
+            if opcode == sre_constants.LITERAL:
+                excluded.add(value)
+            elif opcode == sre_constants.RANGE:
+                excluded.update(range(value[0], value[1] + 1))
+
+        return next(
+            character
+            for character in 'a0=_ '
+            if ord(character) not in excluded
+        )
+
+    opcode, value = items[0]
+    if opcode == sre_constants.LITERAL:
+        return chr(value)
+    if opcode == sre_constants.RANGE:
+        return chr(value[0])
+
+    return {
+        sre_constants.CATEGORY_DIGIT: '0',
+        sre_constants.CATEGORY_SPACE: ' ',
+        sre_constants.CATEGORY_NOT_WORD: ' ',
+    }.get(value, 'a')
+
+
+def get_inputs(samples, length):
+    """
+    :type samples: list of str
+    :param samples: text that the regex matches.
+
+    :type length: int
+    :rtype: dict
+    :returns: description => adversarial input of the given length.
+    """
+    inputs = {}
+    for filler in FILLERS:
+        inputs['{!r} * n'.format(filler)] = filler * length
+
+    for sample in samples:
+        # Drop the end of each sample, so that it (almost) never matches.
+        near_miss = sample[:-1] or sample
+        inputs['{!r} * n'.format(near_miss)] = _repeat(near_miss, length)
+
+        for filler in FILLERS:
+            inputs['{!r} * n'.format(near_miss + filler)] = _repeat(
+                near_miss + filler,
+                length,
+            )
+            inputs['{!r} + {!r} * n'.format(near_miss, filler)] = (
+                near_miss + filler * (length - len(near_miss))
+            )
+
+    return inputs
+
+
+def _repeat(text, length):
+    return (text * (length // len(text) + 1))[:length]
+
+
+def benchmark_target(name, evaluate, samples, lengths, args):
+    """
+    :rtype: dict
+    :returns: the timings for the slowest-growing input.
+    """
+    worst_result = None
+    for description in get_inputs(samples, lengths[0]):
+        timings = []
+        for length in lengths:
+            text = get_inputs(samples, length)[description]
+            seconds = time_evaluation(evaluate, text, args.timeout)
+            timings.append(seconds)
+            if seconds is None:
+                break
+
+        result = {
+            'name': name,
+            'input': description,
+            'seconds': [
+                round(seconds, 5) if seconds is not None else None
+                for seconds in timings
+            ],
+            'exponent': get_exponent(timings, lengths, args.min_seconds),
+        }
+        result['passed'] = (
+            None not in timings
+            and result['exponent'] <= args.max_exponent
+        )
+
+        if (
+            worst_result is None
+            or (worst_result['passed'] and not result['passed'])
+            or (
+                worst_result['passed'] == result['passed']
+                and _get_slowest(result) > _get_slowest(worst_result)
+            )
+        ):
+            worst_result = result
+
+    return worst_result
+
+
+def _get_slowest(result):
+    if None in result['seconds']:
+        return math.inf
+
+    return result['seconds'][-1]
+
+
+def time_evaluation(evaluate, text, timeout, num_iterations=3):
+    """
+    :rtype: float|None
+    :returns: the fastest time taken to evaluate `text`, or None if that
+        exceeded the timeout.
+    """
+    def handler(signum, frame):
+        raise Timeout
+
+    previous_handler = signal.signal(signal.SIGALRM, handler)
+    try:
+        fastest = math.inf
+        for _ in range(num_iterations):
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+            start_time = monotonic()
+            try:
+                evaluate(text)
+            except Timeout:
+                return None
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+
+            fastest = min(fastest, monotonic() - start_time)
+    finally:
+        signal.signal(signal.SIGALRM, previous_handler)
+
+    return fastest
+
+
+def get_exponent(timings, lengths, min_seconds):
+    """
+    :rtype: float
+    :returns: k, such that time grows like length ** k between the two longest
+        inputs. Timings that are too short to be meaningful count as linear.
+    """
+    if None in timings:
+        return math.inf
+
+    if timings[-1] < min_seconds or len(timings) < 2:
+        return 1.0
+
+    return round(
+        math.log(timings[-1] / max(timings[-2], 1e-9))
+        / math.log(lengths[-1] / lengths[-2]),
+        2,
+    )
+
+
+def print_results(results, lengths):
+    print(
+        '{:55} {:>8} {}'.format(
+            'regex',
+            'exponent',
+            ' '.join('{:>9}'.format(length) for length in lengths),
+        ),
+    )
+    for result in results:
+        print(
+            '{:55} {:>8} {}{}'.format(
+                result['name'][:55],
+                result['exponent'],
+                ' '.join(
+                    '{:>9}'.format(seconds if seconds is not None else 'timeout')
+                    for seconds in result['seconds']
+                ),
+                '' if result['passed'] else '  FAILED on {}'.format(result['input']),
+            ),
+        )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/python3
+"""
+Benchmark for verifying secrets, offline.
+
+Scans a corpus of files (seeded with secrets for each of the providers that
+can be verified) with verification on, against a local server which
+emulates the providers, and reports the throughput and latency of
+verification.
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import threading
+
+import mock
+from monotonic import monotonic
+
+from detect_secrets.core import baseline
+from detect_secrets.core.verification import DEFAULT_MAX_WORKERS
+from detect_secrets.plugins.artifactory import ArtifactoryDetector
+from detect_secrets.plugins.aws import AWSKeyDetector
+from detect_secrets.plugins.base import BasePlugin
+from detect_secrets.plugins.cloudant import CloudantDetector
+from detect_secrets.plugins.common.http_session import RequestPolicy
+from detect_secrets.plugins.github_enterprise import GheDetector
+from detect_secrets.plugins.ibm_cloud_iam import IbmCloudIamDetector
+from detect_secrets.plugins.ibm_cos_hmac import IbmCosHmacDetector
+from detect_secrets.plugins.mailchimp import MailchimpDetector
+from detect_secrets.plugins.slack import SlackDetector
+from detect_secrets.plugins.softlayer import SoftlayerDetector
+from detect_secrets.plugins.stripe import StripeDetector
+from testing.provider_server import MockProviderServer
+
+
+def main():
+    args = get_arguments()
+    rng = random.Random(args.seed)
+
+    plugins = tuple(
+        plugin(should_verify=True)
+        for plugin in (
+            ArtifactoryDetector,
+            AWSKeyDetector,
+            CloudantDetector,
+            GheDetector,
+            IbmCloudIamDetector,
+            IbmCosHmacDetector,
+            MailchimpDetector,
+            SlackDetector,
+            SoftlayerDetector,
+            StripeDetector,
+        )
+    )
+
+    durations = []
+    lock = threading.Lock()
+    verify_result = BasePlugin.verify_result
+
+    def timed_verify_result(self, *args):
+        start_time = monotonic()
+        try:
+            return verify_result(self, *args)
+        finally:
+            with lock:
+                durations.append(monotonic() - start_time)
+
+    with tempfile.TemporaryDirectory() as directory:
+        valid_secrets = create_corpus(directory, args.num_files, args.valid_ratio, rng)
+
+        server = MockProviderServer(
+            valid_secrets=valid_secrets,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed,
+        )
+        # Only files within the current directory are scanned.
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            with server, mock.patch.object(BasePlugin, 'verify_result', timed_verify_result):
+                start_time = monotonic()
+                secrets = baseline.initialize(
+                    path=['.'],
+                    plugins=plugins,
+                    should_scan_all_files=True,
+                    output_verified_false=True,
+                    verification_threads=args.verification_threads,
+                    request_policy=RequestPolicy(timeout=args.timeout),
+                )
+                elapsed = monotonic() - start_time
+        finally:
+            os.chdir(cwd)
+
+    results = secrets.json()
+    verified = [
+        secret.get('verified_result')
+        for filename in results
+        for secret in results[filename]
+    ]
+
+    durations.sort()
+    output = {
+        'files': args.num_files,
+        'secrets': len(verified),
+        'verifications': len(durations),
+        'verified_true': verified.count(True),
+        'verified_false': verified.count(False),
+        'requests': sum(server.requests.values()),
+        'seconds': round(elapsed, 5),
+        'verifications_per_second': round(len(durations) / elapsed, 2),
+        'p50_latency_ms': round(percentile(durations, 50) * 1000, 2),
+        'p99_latency_ms': round(percentile(durations, 99) * 1000, 2),
+    }
+
+    if args.pretty:
+        for key, value in output.items():
+            print('{:25}: {}'.format(key, value))
+    else:
+        print(json.dumps(output, indent=2))
+
+    return 0
+
+
+def create_corpus(directory, num_files, valid_ratio, rng):
+    """Each file has a secret for one of the providers (in turn).
+
+    :rtype: set
+    :returns: the secrets (or access key IDs) that the providers accept.
+    """
+    templates = (
+        ('aws', 'access_key_id = "{key_id}"\nsecret_access_key = "{secret}"\n'),
+        ('artifactory', 'artifactory_token = "{token}"\n'),
+        ('cloudant', 'cloudant_host = {account}\ncloudant_password = "{hex_key}"\n'),
+        ('ghe', 'github_token = "{ghe_token}"\n'),
+        ('iam', 'ibm_cloud_iam_api_key = "{iam_key}"\n'),
+        (
+            'cos_hmac',
+            'access_key_id = "{hex_key_id}"\nsecret_access_key = "{hex_secret}"\n',
+        ),
+        ('mailchimp', 'mailchimp_key = "{mailchimp_key}"\n'),
+        ('slack', 'slack_token = "{slack_token}"\n'),
+        ('softlayer', 'softlayer_username = {account}\nsoftlayer_api_key = "{hex_key}"\n'),
+        ('stripe', 'stripe_key = "{stripe_key}"\n'),
+    )
+
+    valid_secrets = set()
+    for index in range(num_files):
+        name, template = templates[index % len(templates)]
+        values = {
+            'key_id': 'AKIA' + random_string(rng, string.ascii_uppercase + string.digits, 16),
+            'secret': random_string(rng, string.ascii_letters + string.digits, 40),
+            'token': 'AKCp' + random_string(rng, string.ascii_letters + string.digits, 60),
+            'account': 'account' + random_string(rng, string.digits, 8),
+            'hex_key': random_string(rng, string.hexdigits.lower()[:16], 64),
+            'ghe_token': random_string(rng, string.hexdigits.lower()[:16], 40),
+            'iam_key': random_string(rng, string.ascii_letters + string.digits, 44),
+            'hex_key_id': random_string(rng, string.hexdigits.lower()[:16], 32),
+            'hex_secret': random_string(rng, string.hexdigits.lower()[:16], 48),
+            'mailchimp_key': '{}-us{}'.format(
+                random_string(rng, string.ascii_lowercase + string.digits, 32),
+                rng.randint(1, 20),
+            ),
+            'slack_token': 'xoxb-{}-{}'.format(
+                random_string(rng, string.digits, 12),
+                random_string(rng, string.ascii_lowercase + string.digits, 24),
+            ),
+            'stripe_key': 'sk_live_' + random_string(
+                rng,
+                string.ascii_letters + string.digits,
+                24,
+            ),
+        }
+
+        if rng.random() < valid_ratio:
+            # Signed requests only include the access key ID.
+            valid_secrets.update(values.values())
+
+        with open(os.path.join(directory, '{}_{}.txt'.format(name, index)), 'w') as f:
+            f.write(template.format(**values))
+
+    return valid_secrets
+
+
+def random_string(rng, characters, length):
+    return ''.join(rng.choice(characters) for _ in range(length))
+
+
+def percentile(values, percent):
+    """
+    :type values: list of float
+    :param values: sorted.
+
+    :type percent: float
+    :rtype: float
+    """
+    if not values:
+        return 0.0
+
+    index = int(round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark verifying secrets.')
+    parser.add_argument(
+        '--num-files',
+        default=200,
+        type=assert_positive(int),
+        help='Number of files (each with a secret) to scan.',
+    )
+    parser.add_argument(
+        '--valid-ratio',
+        default=0.5,
+        type=float,
+        help='Fraction of the secrets that are valid.',
+    )
+    parser.add_argument(
+        '--latency',
+        default=0.05,
+        type=float,
+        help='Seconds that providers take to respond.',
+    )
+    parser.add_argument(
+        '--error-rate',
+        default=0,
+        type=float,
+        help='Fraction of requests that fail with 503 Service Unavailable.',
+    )
+    parser.add_argument(
+        '--rate-limit-rate',
+        default=0,
+        type=float,
+        help='Fraction of requests that are rate limited.',
+    )
+    parser.add_argument(
+        '--timeout',
+        default=10,
+        type=assert_positive(float),
+        help='Seconds to wait for each request.',
+    )
+    parser.add_argument(
+        '--verification-threads',
+        default=DEFAULT_MAX_WORKERS,
+        type=assert_positive(int),
+        help='Number of secrets to verify at the same time.',
+    )
+    parser.add_argument(
+        '--seed',
+        default=0,
+        type=int,
+        help='Seed for generating the corpus, and the requests that fail.',
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Human readable output.',
+    )
+
+    return parser.parse_args()
+
+
+def assert_positive(type):
+    def wrapped(string):
+        value = type(string)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(
+                '{} must be a positive {}.'.format(
+                    string,
+                    type.__name__,
+                ),
+            )
+
+        return value
+
+    return wrapped
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -36,6 +36,9 @@ setup(
         'db2': [
             'ibm_db',
         ],
+        're2': [
+            'google-re2',
+        ],
     },
     entry_points={
         'console_scripts': [
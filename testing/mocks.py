@@ -108,14 +108,18 @@ def Any(cls):
 
 
 @contextmanager
-def mock_open(data, namespace):
+def mock_open(data, namespace, create=False):
     """We heavily rely on file.seek(0), and until we can change this, we need
     to do a bit more overhead mocking, since the library doesn't support it.
 
     https://github.com/testing-cabal/mock/issues/426
+
+    :type create: bool
+    :param create: whether `namespace` may not exist yet (e.g. when mocking
+        the builtin `open` within a module).
     """
     m = mock.mock_open(read_data=data)
-    with mock.patch(namespace, m):
+    with mock.patch(namespace, m, create=create):
         # This is the patch that we do, because it seems that that the
         # side_effect resets the data (exactly what we want with our use
         # case of seek).
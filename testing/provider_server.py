@@ -0,0 +1,270 @@
+"""A local HTTP server which emulates the endpoints that secrets are verified
+against, so that verification can be tested and benchmarked offline.
+
+Verifiers are pointed at it with `http_session.set_endpoint_overrides`. It
+can also be run on its own, which prints the overrides to pass to that, e.g.
+
+    $ python -m testing.provider_server --latency 0.05
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+
+from detect_secrets.constants import DEFAULT_GHE_INSTANCE
+from detect_secrets.plugins.common import http_session
+
+
+# Provider => host patterns of the endpoints that it is verified against.
+ENDPOINTS = {
+    'aws': ('sts.amazonaws.com',),
+    'slack': ('slack.com',),
+    'slack_webhook': ('hooks.slack.com',),
+    'stripe': ('api.stripe.com',),
+    'artifactory': ('*.artifactory.swg-devops.com',),
+    'cloudant': ('*.cloudant.com',),
+    'softlayer': ('api.softlayer.com',),
+    'ibm_cloud_iam': ('iam.cloud.ibm.com',),
+    'ibm_cos_hmac': ('*.cloud-object-storage.appdomain.cloud',),
+    'mailchimp': ('*.api.mailchimp.com',),
+    'github_enterprise': (DEFAULT_GHE_INSTANCE,),
+}
+
+# Provider => (status, body) of the responses to valid and invalid secrets,
+# as the verifiers expect them.
+RESPONSES = {
+    'aws': (
+        (200, '<GetCallerIdentityResponse />'),
+        (403, '<ErrorResponse />'),
+    ),
+    'slack': (
+        (200, '{"ok": true}'),
+        (200, '{"ok": false, "error": "invalid_auth"}'),
+    ),
+    'slack_webhook': (
+        (400, 'no_text'),
+        (403, 'invalid_token'),
+    ),
+    'stripe': ((200, '{"data": []}'), (401, '{"error": {}}')),
+    'artifactory': ((200, 'OK'), (401, '{"errors": []}')),
+    'cloudant': ((200, '{"couchdb": "Welcome"}'), (401, '{"error": "unauthorized"}')),
+    'softlayer': ((200, '{"id": 1}'), (401, '{"error": "Access Denied."}')),
+    'ibm_cloud_iam': ((200, '{"active": true}'), (200, '{"active": false}')),
+    'ibm_cos_hmac': ((200, '<ListAllMyBucketsResult />'), (403, '<Error />')),
+    'mailchimp': ((200, '{"account_id": "1"}'), (401, '{"status": 401}')),
+    'github_enterprise': ((200, '{}'), (401, '{"message": "Bad credentials"}')),
+}
+
+
+class MockProviderServer:
+    """Emulates the providers in ENDPOINTS, on a random local port.
+
+    A secret is valid if any of `valid_secrets` appears in the request (in
+    its path, headers, body or basic auth). Signed requests only include the
+    access key ID, so that is what should be given for AWS and COS HMAC.
+
+    Requests wait for `latency` seconds before they are answered, and a
+    fraction of them (chosen at random) fail with 503 Service Unavailable, or
+    are rate limited with 429 Too Many Requests.
+    """
+
+    def __init__(
+        self,
+        valid_secrets=(),
+        latency=0,
+        error_rate=0,
+        rate_limit_rate=0,
+        seed=None,
+    ):
+        """
+        :type valid_secrets: iterable of str
+        :type latency: float
+        :type error_rate: float
+        :type rate_limit_rate: float
+        :type seed: int|None
+        :param seed: for choosing the requests that fail.
+        """
+        self.valid_secrets = set(valid_secrets)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+
+        # Provider => number of requests.
+        self.requests = Counter()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._previous_overrides = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return 'http://{}:{}'.format(host, port)
+
+    @property
+    def endpoints(self):
+        """
+        :rtype: dict
+        :returns: overrides for `http_session.set_endpoint_overrides`, which
+            send requests to the providers to this server.
+        """
+        return {
+            pattern: '{}/{}'.format(self.url, provider)
+            for provider, patterns in ENDPOINTS.items()
+            for pattern in patterns
+        }
+
+    def start(self):
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), _RequestHandler)
+        self._server.provider_server = self
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            # So that it stops promptly.
+            kwargs={'poll_interval': 0.05},
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        """Starts the server, and sends requests to the providers to it."""
+        self.start()
+        self._previous_overrides = http_session.set_endpoint_overrides(self.endpoints)
+        http_session.close_sessions()
+
+        return self
+
+    def __exit__(self, *args):
+        http_session.set_endpoint_overrides(self._previous_overrides)
+        http_session.close_sessions()
+        self.stop()
+
+    def respond(self, provider, request):
+        """
+        :type provider: str
+        :type request: str
+        :param request: the request line, headers and body.
+
+        :rtype: (int, str)
+        :returns: status and body of the response.
+        """
+        with self._lock:
+            self.requests[provider] += 1
+            chance = self._random.random()
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if chance < self.error_rate:
+            return 503, 'Service Unavailable'
+
+        if chance < self.error_rate + self.rate_limit_rate:
+            return 429, 'Too Many Requests'
+
+        valid, invalid = RESPONSES[provider]
+        if any(secret in request for secret in self.valid_secrets):
+            return valid
+
+        return invalid
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # Otherwise, the body waits for the headers to be acknowledged, which
+    # adds tens of milliseconds to every request.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8', 'replace')
+
+        provider = self.path.lstrip('/').split('/', 1)[0].split('?', 1)[0]
+        if provider not in RESPONSES:
+            self._send(404, 'Not Found')
+            return
+
+        request = '\n'.join([self.requestline, str(self.headers), body])
+        authorization = self.headers.get('Authorization', '')
+        if authorization.startswith('Basic '):
+            request += '\n' + base64.b64decode(
+                authorization[len('Basic '):],
+            ).decode('utf-8', 'replace')
+
+        self._send(*self.server.provider_server.respond(provider, request))
+
+    def _send(self, status, body):
+        content = body.encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(content)))
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Emulate the providers that secrets are verified against.',
+    )
+    parser.add_argument(
+        '--valid-secret',
+        action='append',
+        default=[],
+        dest='valid_secrets',
+        help='A secret (or access key ID) that is valid. May be repeated.',
+    )
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0)
+    args = parser.parse_args(argv)
+
+    server = MockProviderServer(
+        valid_secrets=args.valid_secrets,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    server.start()
+    print(json.dumps(server.endpoints))
+    sys.stdout.flush()
+
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        server.stop()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
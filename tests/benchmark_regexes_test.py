@@ -0,0 +1,71 @@
+import argparse
+import re
+
+import pytest
+
+from scripts import benchmark_regexes
+
+
+@pytest.fixture
+def args():
+    return argparse.Namespace(
+        max_exponent=1.5,
+        min_seconds=0.01,
+        timeout=0.1,
+    )
+
+
+def test_linear_regex_passes(args):
+    regex = re.compile(r'secret_[a-z]+')
+
+    result = benchmark_regexes.benchmark_target(
+        'linear',
+        regex.findall,
+        [benchmark_regexes.get_sample(regex)],
+        [100, 200],
+        args,
+    )
+
+    assert result['passed']
+    assert result['exponent'] == 1.0
+
+
+def test_catastrophic_regex_fails(args):
+    regex = re.compile(r'(a+)+b')
+
+    result = benchmark_regexes.benchmark_target(
+        'catastrophic',
+        regex.search,
+        [benchmark_regexes.get_sample(regex)],
+        [100, 200],
+        args,
+    )
+
+    assert not result['passed']
+    assert None in result['seconds']
+
+
+def test_get_sample():
+    regex = re.compile(r'AKIA[0-9A-Z]{16}')
+
+    assert regex.match(benchmark_regexes.get_sample(regex))
+
+
+def test_allowlist_regexes_are_linear(args):
+    targets = [
+        target
+        for target in benchmark_regexes.get_targets()
+        if target[0].startswith('ALLOWLIST_REGEXES')
+    ]
+    assert targets
+
+    for name, evaluate, samples in targets:
+        result = benchmark_regexes.benchmark_target(
+            name,
+            evaluate,
+            samples,
+            [2000, 4000],
+            args,
+        )
+
+        assert result['passed'], result
@@ -0,0 +1,153 @@
+import gzip
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from detect_secrets.core.archive import ArchiveLimits
+from detect_secrets.core.archive import is_archive
+from detect_secrets.core.archive import iter_members
+from detect_secrets.core.archive import read_member
+
+
+def create_zip(files):
+    """
+    :type files: dict
+    :param files: path => contents, in bytes.
+
+    :rtype: bytes
+    """
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path, data in files.items():
+            archive.writestr(path, data)
+
+    return output.getvalue()
+
+
+def create_tar(files, mode='w:gz'):
+    output = io.BytesIO()
+    with tarfile.open(fileobj=output, mode=mode) as archive:
+        for path, data in files.items():
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    return output.getvalue()
+
+
+def get_members(data, filename='archive.zip', limits=ArchiveLimits()):
+    return list(iter_members(io.BytesIO(data), filename, limits))
+
+
+@pytest.mark.parametrize(
+    'filename, expected',
+    (
+        ('archive.zip', True),
+        ('lib/package.JAR', True),
+        ('dist/package-1.0-py3-none-any.whl', True),
+        ('release.tar.gz', True),
+        ('config.json.gz', True),
+        ('archive.zip.py', False),
+        ('image.png', False),
+    ),
+)
+def test_is_archive(filename, expected):
+    assert is_archive(filename) is expected
+
+
+class TestIterMembers:
+
+    def test_zip(self):
+        data = create_zip({
+            'config/settings.py': b'password = "hunter2"\n',
+            'image.png': b'\x89PNG',
+        })
+
+        assert get_members(data) == [
+            ('archive.zip!/config/settings.py', b'password = "hunter2"\n'),
+        ]
+
+    @pytest.mark.parametrize('mode', ('w', 'w:gz', 'w:bz2'))
+    def test_tar(self, mode):
+        data = create_tar({'a.txt': b'a\n', 'b/c.txt': b'c\n'}, mode=mode)
+
+        assert get_members(data, 'archive.tar') == [
+            ('archive.tar!/a.txt', b'a\n'),
+            ('archive.tar!/b/c.txt', b'c\n'),
+        ]
+
+    def test_gzip(self):
+        data = gzip.compress(b'{"key": "value"}\n')
+
+        assert get_members(data, 'path/to/config.json.gz') == [
+            ('path/to/config.json.gz!/config.json', b'{"key": "value"}\n'),
+        ]
+
+    def test_nested_archives(self):
+        data = create_zip({
+            'lib/inner.jar': create_zip({'application.properties': b'key=value\n'}),
+            'README': b'readme\n',
+        })
+
+        assert get_members(data, 'outer.zip') == [
+            ('outer.zip!/lib/inner.jar!/application.properties', b'key=value\n'),
+            ('outer.zip!/README', b'readme\n'),
+        ]
+
+    def test_max_depth(self):
+        data = create_zip({
+            'inner.zip': create_zip({'a.txt': b'a\n'}),
+            'b.txt': b'b\n',
+        })
+
+        assert get_members(data, limits=ArchiveLimits(max_depth=1)) == [
+            ('archive.zip!/b.txt', b'b\n'),
+        ]
+
+    def test_max_members(self):
+        data = create_zip({
+            'inner.zip': create_zip({'a.txt': b'a\n', 'b.txt': b'b\n'}),
+            'c.txt': b'c\n',
+        })
+
+        # The nested archive counts as a member too.
+        assert get_members(data, limits=ArchiveLimits(max_members=2)) == [
+            ('archive.zip!/inner.zip!/a.txt', b'a\n'),
+        ]
+
+    def test_max_size(self):
+        data = create_zip({
+            'a.txt': b'a' * 10,
+            'bomb.txt': b'\x00' * 1000000,
+            'c.txt': b'c' * 10,
+        })
+
+        assert get_members(data, limits=ArchiveLimits(max_size=100)) == [
+            ('archive.zip!/a.txt', b'a' * 10),
+        ]
+
+    def test_corrupt_archive(self):
+        data = create_zip({
+            'inner.zip': b'PK\x03\x04 not really a zip',
+            'a.txt': b'a\n',
+        })
+
+        assert get_members(data) == [
+            ('archive.zip!/a.txt', b'a\n'),
+        ]
+
+
+def test_read_member(tmpdir):
+    filename = str(tmpdir.join('outer.zip'))
+    with open(filename, 'wb') as f:
+        f.write(
+            create_zip({
+                'inner.tar.gz': create_tar({'a.txt': b'a\n'}),
+            }),
+        )
+
+    assert read_member(filename + '!/inner.tar.gz!/a.txt') == b'a\n'
+    assert read_member(filename + '!/inner.tar.gz!/b.txt') is None
+    assert read_member(str(tmpdir.join('missing.zip')) + '!/a.txt') is None
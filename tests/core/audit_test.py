@@ -1,3 +1,4 @@
+import json
 import string
 import textwrap
 from contextlib import contextmanager
@@ -8,6 +9,8 @@ import pytest
 
 from detect_secrets.core import audit
 from detect_secrets.core.constants import POTENTIAL_SECRET_DETECTED_NOTE
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.plugins.slack import SlackDetector
 from testing.factories import potential_secret_factory
 from testing.mocks import mock_open as mock_open_base
 from testing.mocks import mock_printer as mock_printer_base
@@ -674,6 +677,116 @@ class TestDetermineAuditResults:
         assert hex_high_results['true-positives']['mocked_file'][0]['plaintext'] is None
 
 
+class TestVerifyBaseline:
+
+    @pytest.fixture
+    def baseline_file(self, tmpdir):
+        tmpdir.join('config.py').write(
+            textwrap.dedent("""
+                valid = 'xoxb-1-valid'
+                invalid = 'xoxb-2-invalid'
+                unknown = 'xoxb-3-unknown'
+                removed = 'not a secret'
+            """)[1:],
+        )
+
+        with tmpdir.as_cwd():
+            results = [
+                secret.json()
+                for secret in SlackDetector().analyze(
+                    open('config.py'),
+                    'config.py',
+                )
+            ]
+
+        results.sort(key=lambda secret: secret['line_number'])
+        for secret in results:
+            secret.update(is_verified=False, verified_result=None)
+
+        # This secret was verified before.
+        results[2].update(is_verified=True, verified_result=True)
+
+        results.append({
+            'type': SlackDetector.secret_type,
+            'hashed_secret': 'removed',
+            'line_number': 4,
+            'is_verified': False,
+            'verified_result': None,
+        })
+
+        baseline_file = tmpdir.join('.secrets.baseline')
+        baseline_file.write(
+            json.dumps({
+                'plugins_used': [{'name': 'SlackDetector'}],
+                'results': {'config.py': results},
+            }),
+        )
+        return baseline_file
+
+    def test_verify_baseline(self, tmpdir, baseline_file, mock_printer):
+        def verify(token, *args, **kwargs):
+            return {
+                'xoxb-1-valid': VerifiedResult.VERIFIED_TRUE,
+                'xoxb-2-invalid': VerifiedResult.VERIFIED_FALSE,
+            }.get(token, VerifiedResult.UNVERIFIED)
+
+        with tmpdir.as_cwd(), mock.patch.object(
+            SlackDetector,
+            'verify',
+            side_effect=verify,
+        ) as mock_verify:
+            counts = audit.verify_baseline(str(baseline_file))
+
+        assert mock_verify.call_count == 3
+        assert counts == {
+            VerifiedResult.VERIFIED_TRUE: 1,
+            VerifiedResult.VERIFIED_FALSE: 1,
+            VerifiedResult.UNVERIFIED: 1,
+            None: 1,
+        }
+
+        results = json.loads(baseline_file.read())['results']['config.py']
+        assert [
+            (secret['is_verified'], secret['verified_result'])
+            for secret in results
+        ] == [
+            (True, True),
+            (True, False),
+            # Secrets that can't be verified keep their previous results.
+            (True, True),
+            (False, None),
+        ]
+
+        assert mock_printer.message == (
+            'Verified 3 secrets: 1 live, 1 not live, 1 could not be verified.\n'
+            '1 secrets were not found in their files. Try recreating your baseline.\n'
+        )
+
+    def test_plugins_that_cannot_verify_are_skipped(self, tmpdir, mock_printer):
+        tmpdir.join('config.py').write('secret = "0123456789abcdef0123456789abcdef"\n')
+        baseline_file = tmpdir.join('.secrets.baseline')
+        baseline_file.write(
+            json.dumps({
+                'plugins_used': [{'name': 'HexHighEntropyString', 'hex_limit': 3}],
+                'results': {
+                    'config.py': [{
+                        'type': 'Hex High Entropy String',
+                        'hashed_secret': 'abc',
+                        'line_number': 1,
+                        'is_verified': False,
+                    }],
+                },
+            }),
+        )
+
+        with tmpdir.as_cwd():
+            assert audit.verify_baseline(str(baseline_file)) == {}
+
+        assert mock_printer.message == (
+            'Verified 0 secrets: 0 live, 0 not live, 0 could not be verified.\n'
+        )
+
+
 class TestPrintAuditResults():
 
     @contextmanager
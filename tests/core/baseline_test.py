@@ -12,6 +12,7 @@ from detect_secrets.core.baseline import merge_baseline
 from detect_secrets.core.baseline import merge_results
 from detect_secrets.core.baseline import trim_baseline_of_removed_secrets
 from detect_secrets.core.potential_secret import PotentialSecret
+from detect_secrets.core.secrets_collection import SecretsCollection
 from detect_secrets.plugins.high_entropy_strings import Base64HighEntropyString
 from detect_secrets.plugins.high_entropy_strings import HexHighEntropyString
 from testing.factories import secrets_collection_factory
@@ -158,8 +159,9 @@ class TestInitializeBaseline:
             'detect_secrets.core.baseline.os.path.isfile',
             return_value=True,
         ), mock_open(
-            'Super hidden value "BEEF0123456789a"',
-            'detect_secrets.core.secrets_collection.codecs.open',
+            b'Super hidden value "BEEF0123456789a"',
+            'detect_secrets.core.secrets_collection.open',
+            create=True,
         ):
             results = self.get_results(path=['will_be_mocked'])
 
@@ -185,6 +187,103 @@ class TestInitializeBaseline:
         assert len(results.keys()) == 0
 
 
+class TestDeduplication:
+
+    @staticmethod
+    def create_files(tmpdir, files):
+        for path, contents in files.items():
+            tmpdir.join(path).write(contents, ensure=True)
+
+    def scan(self, tmpdir):
+        with mock.patch.object(
+            SecretsCollection,
+            'scan_file',
+            autospec=True,
+            side_effect=SecretsCollection.scan_file,
+        ) as mock_scan_file, tmpdir.as_cwd():
+            results = baseline.initialize(
+                ['.'],
+                (HexHighEntropyString(3),),
+                should_scan_all_files=True,
+            ).json()
+
+        scanned_files = sorted(
+            call[0][1]
+            for call in mock_scan_file.call_args_list
+        )
+        return results, scanned_files
+
+    def test_identical_files_are_scanned_once(self, tmpdir):
+        contents = 'secret = "0123456789abcdef0123"\n'
+        self.create_files(
+            tmpdir,
+            {
+                'a/config.py': contents,
+                'b/config.py': contents,
+                'b/other.py': contents,
+                'c/config.py': contents + '\n',
+            },
+        )
+
+        results, scanned_files = self.scan(tmpdir)
+
+        assert scanned_files == ['a/config.py', 'c/config.py']
+        assert sorted(results) == [
+            'a/config.py',
+            'b/config.py',
+            'b/other.py',
+            'c/config.py',
+        ]
+        for filename, secrets in results.items():
+            assert [secret['line_number'] for secret in secrets] == [1]
+
+    def test_files_with_different_context_are_scanned_separately(self, tmpdir):
+        # File types are determined by their extension.
+        contents = 'secret: "0123456789abcdef0123"\n'
+        self.create_files(
+            tmpdir,
+            {
+                'config.py': contents,
+                'config.yaml': contents,
+            },
+        )
+
+        _, scanned_files = self.scan(tmpdir)
+
+        assert scanned_files == ['config.py', 'config.yaml']
+
+
+def test_initialize_with_threads(tmpdir):
+    for index in range(20):
+        tmpdir.join('dir{}/config{}.py'.format(index % 3, index)).write(
+            'secret = "{:0>20x}"\nkey = "0123456789abcdef{:04d}"\n'.format(
+                index * 0x1234567,
+                index,
+            ),
+            ensure=True,
+        )
+
+    plugins = (
+        Base64HighEntropyString(4.5),
+        HexHighEntropyString(3),
+    )
+    with tmpdir.as_cwd():
+        expected = baseline.initialize(
+            ['.'],
+            plugins,
+            should_scan_all_files=True,
+        ).json()
+        results = baseline.initialize(
+            ['.'],
+            plugins,
+            should_scan_all_files=True,
+            threads=4,
+        ).json()
+
+    assert len(expected) == 20
+    assert results == expected
+
+
 class TestGetSecretsNotInBaseline:
 
     def test_nothing_new(self):
@@ -388,6 +487,38 @@ class TestUpdateBaselineWithRemovedSecrets:
         assert len(baseline.data) == 1
         assert next(iter(baseline.data['filename'])).lineno == 1
 
+    def test_lazily_loaded_baseline(self):
+        new_findings = secrets_collection_factory([
+            {
+                'secret': 'secret',
+                'lineno': 1,
+            },
+        ])
+        baseline = SecretsCollection.load_baseline_from_dict(
+            secrets_collection_factory([
+                {
+                    'secret': 'deleted_secret',
+                    'lineno': 1,
+                },
+                {
+                    'secret': 'secret',
+                    'lineno': 2,
+                },
+            ]).format_for_baseline_output(),
+            lazy=True,
+        )
+
+        assert trim_baseline_of_removed_secrets(
+            new_findings,
+            baseline,
+            ['filename'],
+        )
+
+        assert [
+            secret['line_number']
+            for secret in baseline.json()['filename']
+        ] == [1]
+
     @pytest.mark.parametrize(
         'results_dict,baseline_dict',
         [
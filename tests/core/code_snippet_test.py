@@ -0,0 +1,45 @@
+import pytest
+
+from detect_secrets.core.code_snippet import CodeSnippetHighlighter
+from detect_secrets.core.code_snippet import CodeSnippetWindow
+
+
+class TestCodeSnippetWindow:
+
+    @pytest.mark.parametrize('num_lines', (1, 3, 10, 20))
+    @pytest.mark.parametrize('lines_of_context', (0, 1, 5))
+    def test_matches_code_snippet(self, num_lines, lines_of_context):
+        lines = ['line {}\n'.format(index) for index in range(num_lines)]
+        window = CodeSnippetWindow(lines_of_context=lines_of_context)
+
+        completed = []
+        for line_number, line in enumerate(lines, start=1):
+            completed.extend(window.add_line(line))
+            window.defer(line_number)
+        completed.extend(window.flush())
+
+        assert [line_number for line_number, _ in completed] == list(
+            range(1, num_lines + 1),
+        )
+        for line_number, snippet in completed:
+            expected = CodeSnippetHighlighter().get_code_snippet(
+                lines,
+                line_number,
+                lines_of_context=lines_of_context,
+            )
+
+            assert snippet.lines == expected.lines
+            assert snippet.start_line == expected.start_line
+            assert snippet.target_index == expected.target_index
+
+    def test_snippets_are_completed_once_context_is_available(self):
+        window = CodeSnippetWindow(lines_of_context=2)
+
+        assert window.add_line('a') == []
+        window.defer('a')
+        assert window.add_line('b') == []
+        assert [
+            (item, snippet.lines)
+            for item, snippet in window.add_line('c')
+        ] == [('a', ['a', 'b', 'c'])]
+        assert window.flush() == []
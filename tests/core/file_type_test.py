@@ -0,0 +1,45 @@
+import pytest
+
+from detect_secrets.core.file_type import classify
+from detect_secrets.core.file_type import is_binary
+
+
+@pytest.mark.parametrize(
+    'sample, expected',
+    (
+        ('', False),
+        (b'', False),
+        ('password = "hunter2"\n', False),
+        (b'caf\xc3\xa9 = "\xe2\x98\x83"\r\n\tkey: value\n', False),
+        (b'\x1b[31mcolored log line\x1b[0m\n', False),
+        # Latin-1 text, which isn't valid UTF-8.
+        (b'caf\xe9 = "cr\xe8me"\n', False),
+        (b'text\x00', True),
+        ('text\x00', True),
+        (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', True),
+        (bytes(range(0x80, 0x100)), True),
+        ('\x01\x02\x03abcdef', True),
+    ),
+)
+def test_is_binary(sample, expected):
+    assert is_binary(sample) is expected
+
+
+@pytest.mark.parametrize(
+    'filename, sample, expected',
+    (
+        ('config.py', 'password = "hunter2"\n', None),
+        ('path/to/package-lock.json', '{\n  "name": "a",\n', 'lockfile'),
+        ('go.sum', b'golang.org/x/net v0.0.1 h1:abc=\n', 'lockfile'),
+        ('static/app.min.js', '!function(e){}', 'generated'),
+        ('static/app.js.map', '', 'generated'),
+        ('bundle', '{"version":3,"sources":["a.js"],"mappings":"AAAA"}', 'generated'),
+        ('api.pb.go', '// Code generated by protoc-gen-go. DO NOT EDIT.\n', 'generated'),
+        ('schema.py', '# @generated by a tool\nsecret = 1\n', 'generated'),
+        # Only the header of the file is checked.
+        ('notes.md', 'a\nb\nc\nd\ne\n@generated\n', None),
+        ('notes.md', 'Please do not edit this file by hand.\n', None),
+    ),
+)
+def test_classify(filename, sample, expected):
+    assert classify(filename, sample) == expected
@@ -0,0 +1,84 @@
+import pytest
+
+from detect_secrets.core.lazy_results import BaselineEntry
+from detect_secrets.core.lazy_results import LazySecretsDict
+from detect_secrets.core.potential_secret import PotentialSecret
+from testing.factories import potential_secret_factory
+
+
+@pytest.fixture
+def lazy_results():
+    return LazySecretsDict(
+        'filename',
+        [
+            BaselineEntry.from_json(
+                'filename',
+                {
+                    'type': 'type',
+                    'hashed_secret': PotentialSecret.hash_secret('secret'),
+                    'line_number': 1,
+                    'is_verified': False,
+                    'verified_result': None,
+                },
+            ),
+            BaselineEntry.from_json(
+                'filename',
+                {
+                    'type': 'type',
+                    'hashed_secret': PotentialSecret.hash_secret('audited'),
+                    'line_number': 2,
+                    'is_secret': False,
+                    'is_verified': True,
+                    'verified_result': False,
+                },
+            ),
+        ],
+    )
+
+
+class TestLazySecretsDict:
+
+    def test_records_are_not_materialized_until_accessed(self, lazy_results):
+        assert len(lazy_results) == 2
+        assert all(
+            isinstance(record, BaselineEntry)
+            for record in lazy_results.records()
+        )
+
+        secret = potential_secret_factory(secret='secret')
+        assert secret in lazy_results
+        assert isinstance(lazy_results[secret], PotentialSecret)
+
+        # Subsequent lookups return the same object, so modifications persist.
+        lazy_results[secret].lineno = 10
+        assert lazy_results[secret].lineno == 10
+        assert [entry.lineno for entry in lazy_results.records()] == [10, 2]
+
+    def test_lookup_uses_potential_secret_equality(self, lazy_results):
+        assert potential_secret_factory(secret='secret', lineno=5) in lazy_results
+        assert potential_secret_factory(secret='unknown') not in lazy_results
+        assert potential_secret_factory(type_='other', secret='secret') not in lazy_results
+        assert potential_secret_factory(filename='other', secret='secret') not in lazy_results
+
+    def test_filter(self, lazy_results):
+        filtered = lazy_results.filter(lambda secret: secret.is_secret is None)
+
+        assert len(filtered) == 1
+        assert potential_secret_factory(secret='secret') in filtered
+        assert len(lazy_results) == 2
+
+    def test_mutation(self, lazy_results):
+        existing = potential_secret_factory(secret='secret')
+        new = potential_secret_factory(secret='new', lineno=3)
+
+        del lazy_results[existing]
+        lazy_results[new] = new
+
+        assert existing not in lazy_results
+        assert lazy_results[new] is new
+        with pytest.raises(KeyError):
+            lazy_results[existing]
+
+    def test_json_matches_potential_secret_json(self, lazy_results):
+        for record in lazy_results.records():
+            assert record.json() == record.to_potential_secret().json()
@@ -1,5 +1,6 @@
 import pytest
 
+from detect_secrets.core.potential_secret import PotentialSecret
 from testing.factories import potential_secret_factory
 
 
@@ -48,3 +49,48 @@ class TestPotentialSecret:
         secret = potential_secret_factory(secret='blah')
         secret.other_factors['second factor'] = 'another one'
         assert {'second factor': 'another one'} == secret.json()['other_factors']
+
+    def test_secret_hash_is_computed_lazily(self):
+        secret = potential_secret_factory(secret='blah')
+        assert secret._secret_hash is None
+
+        assert secret.secret_hash == PotentialSecret.hash_secret('blah')
+        assert secret.secret == secret.secret_value == 'blah'
+
+    def test_hash_is_updated_when_secret_hash_changes(self):
+        secret = potential_secret_factory(secret='A')
+        other = potential_secret_factory(secret='B')
+        assert hash(secret) != hash(other)
+        assert secret != other
+
+        secret.secret_hash = other.secret_hash
+        assert hash(secret) == hash(other)
+        assert secret == other
+
+    def test_set_secret(self):
+        secret = potential_secret_factory(secret='A')
+        original_hash = hash(secret)
+
+        secret.set_secret('B')
+        assert secret.secret_value == 'B'
+        assert hash(secret) != original_hash
+        assert secret == potential_secret_factory(secret='B')
+
+    def test_copy_to(self):
+        secret = potential_secret_factory(filename='a.py', secret='blah', lineno=3)
+        secret.other_factors['second factor'] = 'another one'
+        original_hash = hash(secret)
+
+        copy = secret.copy_to('b.py')
+        copy.other_factors['second factor'] = 'changed'
+
+        assert copy != secret
+        assert copy == potential_secret_factory(filename='b.py', secret='blah')
+        assert copy.lineno == 3
+        assert hash(secret) == original_hash
+        assert secret.other_factors == {'second factor': 'another one'}
+
+    def test_compact_representation(self):
+        secret = potential_secret_factory(filename=''.join(['file', 'name']))
+        assert not hasattr(secret, '__dict__')
+        assert secret.filename is potential_secret_factory(filename='filename').filename
@@ -0,0 +1,99 @@
+import re
+import signal
+
+import mock
+import pytest
+
+from detect_secrets.core.time_budget import LineTimeBudgetExceeded
+from detect_secrets.core.time_budget import TimeBudget
+from detect_secrets.core.time_budget import TimeBudgetExceeded
+from detect_secrets.plugins.base import RegexBasedDetector
+
+
+class CatastrophicBacktrackingDetector(RegexBasedDetector):
+    secret_type = 'test_time_budget'
+    denylist = (
+        re.compile(r'(a+)+b'),
+    )
+
+
+@pytest.fixture
+def mock_time():
+    with mock.patch(
+        'detect_secrets.core.time_budget.monotonic',
+        return_value=0,
+    ) as m:
+        yield m
+
+
+class TestTimeBudget:
+
+    def test_line_within_budget(self, mock_time):
+        budget = TimeBudget(line_seconds=1)
+
+        with budget.file('filename'):
+            budget.start_line('plugin', 1)
+            mock_time.return_value = 1
+
+            assert budget.end_line()
+
+        assert budget.exceeded == []
+
+    def test_line_exceeding_budget_is_recorded(self, mock_time):
+        budget = TimeBudget(line_seconds=1)
+        plugin = CatastrophicBacktrackingDetector()
+
+        with budget.file('filename'):
+            budget.start_line(plugin, 3)
+            mock_time.return_value = 2
+
+            assert not budget.end_line()
+
+        assert budget.json() == [
+            {
+                'budget': 'line',
+                'seconds': 1,
+                'filename': 'filename',
+                'plugin': 'CatastrophicBacktrackingDetector',
+                'line_number': 3,
+            },
+        ]
+
+    def test_file_exceeding_budget_is_abandoned(self, mock_time):
+        budget = TimeBudget(file_seconds=1)
+        plugin = CatastrophicBacktrackingDetector()
+
+        with budget.file('filename'):
+            budget.start_line(plugin, 1)
+            assert budget.end_line()
+
+            mock_time.return_value = 2
+            budget.start_line(plugin, 2)
+
+            raise AssertionError('should not be reached')     # pragma: no cover
+
+        assert [type(error) for error in budget.exceeded] == [TimeBudgetExceeded]
+        assert budget.exceeded[0].line_number == 2
+
+    def test_watchdog_interrupts_stuck_lines(self):
+        budget = TimeBudget(line_seconds=0.05)
+        plugin = CatastrophicBacktrackingDetector()
+        plugin.time_budget = budget
+
+        with budget.file('filename'):
+            assert plugin._analyze_line_within_budget('a' * 40, 1, 'filename') == {}
+
+        assert [type(error) for error in budget.exceeded] == [LineTimeBudgetExceeded]
+
+    def test_watchdog_is_removed_after_each_file(self):
+        previous_handler = signal.getsignal(signal.SIGALRM)
+        budget = TimeBudget(file_seconds=10)
+
+        with budget.file('filename'):
+            assert signal.getsignal(signal.SIGALRM) == budget._check
+
+        assert signal.getsignal(signal.SIGALRM) == previous_handler
+        assert signal.getitimer(signal.ITIMER_REAL) == (0, 0)
+
+    def test_not_caught_by_plugins(self):
+        assert not issubclass(TimeBudgetExceeded, Exception)
@@ -1,6 +1,8 @@
+import mock
 import pytest
 
 from detect_secrets.core.usage import ParserBuilder
+from detect_secrets.plugins.common import regex_backend
 from detect_secrets.plugins.common.util import import_plugins
 
 
@@ -81,3 +83,89 @@ class TestPluginOptions:
         else:
             with pytest.raises(SystemExit):
                 self.parse_args(argument_string)
+
+
+class TestScanOptions:
+
+    @staticmethod
+    def parse_args(argument_string=''):
+        return ParserBuilder()\
+            .add_console_use_arguments()\
+            .parse_args(argument_string.split())
+
+    def test_archive_limits(self):
+        args = self.parse_args('scan --scan-archives --archive-max-size 10')
+        assert args.scan_archives
+        assert args.archive_max_depth == 3
+        assert args.archive_max_size == 10
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --archive-max-members 0')
+
+    def test_threads(self):
+        assert self.parse_args('scan').threads == 1
+        assert self.parse_args('scan --verification-threads 2').verification_threads == 2
+        assert self.parse_args('scan --threads 4').threads == 4
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --threads 0')
+
+    def test_verification_limits(self):
+        args = self.parse_args('scan')
+        assert args.verification_timeout == 10
+        assert args.verification_deadline is None
+
+        args = self.parse_args('scan --verification-timeout 2.5 --verification-deadline 60')
+        assert args.verification_timeout == 2.5
+        assert args.verification_deadline == 60
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --verification-deadline 0')
+
+    def test_verification_cache(self):
+        args = self.parse_args('scan --verification-cache cache.json --verified-true-ttl 1')
+        assert args.verification_cache == 'cache.json'
+        assert args.verified_true_ttl == 1
+        assert args.verified_false_ttl == 7 * 24
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --verified-true-ttl 0')
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --verified-false-ttl -1')
+
+    def test_file_policies(self):
+        args = self.parse_args('scan --lockfiles skip')
+        assert args.lockfiles == 'skip'
+        assert args.generated_files is None
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --generated-files ignore')
+
+    def test_regex_engine(self):
+        assert self.parse_args('scan').regex_engine == 're'
+
+        with pytest.raises(SystemExit):
+            self.parse_args('scan --regex-engine pcre')
+
+        with mock.patch.object(regex_backend, 're2', None), pytest.raises(SystemExit):
+            self.parse_args('scan --regex-engine re2')
+
+
+class TestVerifyOptions:
+
+    @staticmethod
+    def parse_args(argument_string=''):
+        return ParserBuilder()\
+            .add_console_use_arguments()\
+            .parse_args(argument_string.split())
+
+    def test_verify(self):
+        args = self.parse_args('verify .secrets.baseline --verification-cache cache.json')
+        assert args.action == 'verify'
+        assert args.filename == ['.secrets.baseline']
+        assert args.verification_threads == 8
+        assert args.verification_cache == 'cache.json'
+
+        with pytest.raises(SystemExit):
+            self.parse_args('verify')
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import stat
+
+import mock
+import pytest
+
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.usage import add_verification_cache_arguments
+from detect_secrets.core.verification_cache import DEFAULT_VERIFIED_FALSE_TTL
+from detect_secrets.core.verification_cache import DEFAULT_VERIFIED_TRUE_TTL
+from detect_secrets.core.verification_cache import get_verification_cache
+from detect_secrets.core.verification_cache import VerificationCache
+from detect_secrets.plugins.aws import AWSKeyDetector
+from detect_secrets.plugins.slack import SlackDetector
+from testing.mocks import mock_log as mock_log_base
+
+
+@pytest.fixture
+def mock_log():
+    with mock_log_base('detect_secrets.core.verification_cache.log') as m:
+        yield m
+
+
+@pytest.fixture
+def mock_time():
+    with mock.patch('detect_secrets.core.verification_cache.time.time') as m:
+        m.return_value = 1000.0
+        yield m
+
+
+class TestVerificationCache:
+
+    def test_keys(self):
+        cache = VerificationCache()
+        key = cache.get_key(SlackDetector(), 'xoxb-123-abc')
+
+        assert key == cache.get_key(SlackDetector(), 'xoxb-123-abc')
+        assert key != cache.get_key(SlackDetector(), 'xoxb-123-abd')
+        assert key != cache.get_key(SlackDetector(), 'xoxb-123-abc', ('other',))
+        assert key != cache.get_key(AWSKeyDetector(), 'xoxb-123-abc')
+
+        # Keys can't be recomputed without the cache's key.
+        assert key != VerificationCache().get_key(SlackDetector(), 'xoxb-123-abc')
+
+    def test_results_expire(self, mock_time):
+        cache = VerificationCache(verified_true_ttl=10, verified_false_ttl=100)
+        cache.put('valid', VerifiedResult.VERIFIED_TRUE, {'username': 'admin'})
+        cache.put('invalid', VerifiedResult.VERIFIED_FALSE)
+        cache.put('unverified', VerifiedResult.UNVERIFIED)
+
+        assert cache.get('valid') == (VerifiedResult.VERIFIED_TRUE, {'username': 'admin'})
+        assert cache.get('invalid') == (VerifiedResult.VERIFIED_FALSE, {})
+        assert cache.get('unverified') is None
+
+        mock_time.return_value += 50
+        assert cache.get('valid') is None
+        assert cache.get('invalid') == (VerifiedResult.VERIFIED_FALSE, {})
+
+    def test_zero_ttl(self):
+        cache = VerificationCache(verified_false_ttl=0)
+        cache.put('invalid', VerifiedResult.VERIFIED_FALSE)
+
+        assert cache.get('invalid') is None
+
+    def test_save_and_load(self, tmpdir):
+        filename = str(tmpdir.join('cache', 'verification.json'))
+        cache = VerificationCache(filename)
+        valid_key = cache.get_key(SlackDetector(), 'xoxb-123-abc')
+        multi_factor_key = cache.get_key(AWSKeyDetector(), 'AKIA0123', ('secret',))
+        cache.put(valid_key, VerifiedResult.VERIFIED_TRUE)
+        cache.put(
+            multi_factor_key,
+            VerifiedResult.VERIFIED_TRUE,
+            {'secret_access_key': 'secret'},
+        )
+        cache.save()
+
+        with open(filename) as f:
+            contents = f.read()
+
+        assert 'xoxb' not in contents
+        assert 'secret' not in contents
+        assert stat.S_IMODE(os.stat(filename).st_mode) == 0o600
+        assert list(json.loads(contents)['results']) == [valid_key]
+
+        cache = VerificationCache(filename)
+        assert cache.get_key(SlackDetector(), 'xoxb-123-abc') == valid_key
+        assert cache.get(valid_key) == (VerifiedResult.VERIFIED_TRUE, {})
+        assert cache.get(multi_factor_key) is None
+
+    @pytest.mark.parametrize(
+        'contents',
+        (
+            'not json',
+            '[]',
+            '{"version": 0}',
+            '{"version": 1, "key": "00", "results": {"a": {"result": "MAYBE"}}}',
+        ),
+    )
+    def test_invalid_file(self, tmpdir, mock_log, contents):
+        filename = tmpdir.join('verification.json')
+        filename.write(contents)
+
+        cache = VerificationCache(str(filename))
+
+        assert mock_log.warning_messages
+        assert cache.get('a') is None
+
+    def test_missing_file(self, tmpdir, mock_log):
+        cache = VerificationCache(str(tmpdir.join('verification.json')))
+
+        assert not mock_log.warning_messages
+        assert cache.get('a') is None
+
+
+class TestGetVerificationCache:
+
+    def test_no_cache_file(self):
+        assert get_verification_cache(self.parse_args([])) is None
+
+    def test_default_ttls(self, tmpdir):
+        cache = get_verification_cache(
+            self.parse_args(['--verification-cache', str(tmpdir.join('cache.json'))]),
+        )
+
+        assert cache.ttls == {
+            VerifiedResult.VERIFIED_TRUE: DEFAULT_VERIFIED_TRUE_TTL,
+            VerifiedResult.VERIFIED_FALSE: DEFAULT_VERIFIED_FALSE_TTL,
+        }
+
+    def test_ttls_are_given_in_hours(self, tmpdir):
+        cache = get_verification_cache(
+            self.parse_args([
+                '--verification-cache', str(tmpdir.join('cache.json')),
+                '--verified-true-ttl', '2',
+                '--verified-false-ttl', '0.5',
+            ]),
+        )
+
+        assert cache.ttls == {
+            VerifiedResult.VERIFIED_TRUE: 2 * 60 * 60,
+            VerifiedResult.VERIFIED_FALSE: 30 * 60,
+        }
+
+    def parse_args(self, argv):
+        parser = argparse.ArgumentParser()
+        add_verification_cache_arguments(parser)
+
+        return parser.parse_args(argv)
@@ -0,0 +1,236 @@
+import re
+import threading
+import time
+
+import mock
+import pytest
+import requests
+import responses
+
+from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.verification import VerificationQueue
+from detect_secrets.core.verification_cache import VerificationCache
+from detect_secrets.plugins.aws import AWSKeyDetector
+from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.cloudant import CloudantDetector
+from detect_secrets.plugins.common import http_session
+from detect_secrets.plugins.slack import SlackDetector
+from detect_secrets.plugins.stripe import StripeDetector
+from testing.factories import potential_secret_factory
+from testing.provider_server import MockProviderServer
+
+
+class MockPlugin(RegexBasedDetector):
+    secret_type = 'mock'
+    denylist = (
+        re.compile(r'secret_\w+'),
+    )
+
+    def __init__(self, delay=0, **kwargs):
+        super(MockPlugin, self).__init__(should_verify=True, **kwargs)
+        self.delay = delay
+
+        self.verified = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def verify(self, token, *args, **kwargs):
+        with self._lock:
+            self.verified.append(token)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(self.delay)
+
+        with self._lock:
+            self.in_flight -= 1
+
+        if token.startswith('secret_valid'):
+            return VerifiedResult.VERIFIED_TRUE
+
+        return VerifiedResult.VERIFIED_FALSE
+
+
+class OtherMockPlugin(MockPlugin):
+    secret_type = 'other mock'
+
+
+class HTTPMockPlugin(MockPlugin):
+    secret_type = 'http mock'
+
+    def verify(self, token, *args, **kwargs):
+        super(HTTPMockPlugin, self).verify(token)
+        http_session.get('https://example.com/')
+        return VerifiedResult.VERIFIED_TRUE
+
+
+class TestVerificationQueue:
+
+    def test_records_results(self):
+        queue = VerificationQueue()
+        plugin = MockPlugin()
+        valid = potential_secret_factory(secret='secret_valid')
+        invalid = potential_secret_factory(secret='secret_invalid')
+
+        queue.submit(plugin, valid, '')
+        queue.submit(plugin, invalid, '')
+
+        assert queue.join() == [invalid]
+        assert valid.is_verified and valid.verified_result is True
+        assert invalid.is_verified and invalid.verified_result is False
+
+        # The queue can be reused after it is joined.
+        queue.submit(plugin, invalid, '')
+        assert queue.join() == [invalid]
+
+    def test_limits_concurrency_per_provider(self):
+        queue = VerificationQueue(max_workers=8, max_per_provider=2)
+        plugins = (MockPlugin(delay=0.02), OtherMockPlugin(delay=0.02))
+        for index in range(8):
+            for plugin in plugins:
+                queue.submit(
+                    plugin,
+                    potential_secret_factory(secret='secret_valid_{}'.format(index)),
+                    '',
+                )
+
+        assert queue.join() == []
+        for plugin in plugins:
+            assert plugin.max_in_flight == 2
+
+    def test_duplicates_are_verified_once(self):
+        queue = VerificationQueue()
+        plugin = MockPlugin(delay=0.01)
+        plugin.verification_cache = VerificationCache()
+        results = [
+            potential_secret_factory(
+                filename='file{}'.format(index),
+                secret='secret_invalid',
+            )
+            for index in range(8)
+        ]
+        for result in results:
+            queue.submit(plugin, result, '')
+
+        assert queue.join() == results
+        assert plugin.verified == ['secret_invalid']
+        assert all(result.verified_result is False for result in results)
+
+    def test_limits_total_concurrency(self):
+        queue = VerificationQueue(max_workers=1, max_per_provider=4)
+        plugin = MockPlugin(delay=0.01)
+        for index in range(4):
+            queue.submit(
+                plugin,
+                potential_secret_factory(secret='secret_valid_{}'.format(index)),
+                '',
+            )
+
+        queue.join()
+        assert plugin.max_in_flight == 1
+
+    def test_skipped_after_deadline(self):
+        queue = VerificationQueue(
+            request_policy=http_session.RequestPolicy(deadline=-1),
+        )
+        plugin = MockPlugin()
+        result = potential_secret_factory(secret='secret_valid')
+        queue.submit(plugin, result, '')
+
+        assert queue.join() == []
+        assert plugin.verified == []
+        assert not result.is_verified
+        assert queue.skipped == {http_session.SKIPPED_DEADLINE: 1}
+
+    @responses.activate
+    def test_skipped_after_host_keeps_failing(self):
+        responses.add(
+            responses.GET,
+            'https://example.com/',
+            body=requests.exceptions.ConnectionError(),
+        )
+        queue = VerificationQueue(
+            max_workers=1,
+            request_policy=http_session.RequestPolicy(
+                max_retries=0,
+                circuit_breaker_threshold=2,
+            ),
+        )
+        plugin = HTTPMockPlugin()
+        results = [
+            potential_secret_factory(secret='secret_valid_{}'.format(index))
+            for index in range(4)
+        ]
+        for result in results:
+            queue.submit(plugin, result, '')
+
+        assert queue.join() == []
+        assert not any(result.is_verified for result in results)
+        assert len(responses.calls) == 2
+        assert queue.skipped == {
+            http_session.SKIPPED_REQUEST_FAILED: 2,
+            http_session.SKIPPED_CIRCUIT_OPEN: 2,
+        }
+
+
+AWS_KEY_ID = 'AKIA' + 'A' * 16
+AWS_SECRET_ACCESS_KEY = 'a' * 40
+CLOUDANT_PASSWORD = '0' * 64
+SLACK_TOKEN = 'xoxb-123-abc'
+STRIPE_KEY = 'sk_live_' + 'a' * 24
+
+
+class TestMockProviders:
+
+    @pytest.mark.parametrize(
+        'plugin, secret, content, valid_secret',
+        (
+            (
+                AWSKeyDetector,
+                AWS_KEY_ID,
+                'secret_access_key = "{}"'.format(AWS_SECRET_ACCESS_KEY),
+                # Signed requests only include the key ID.
+                AWS_KEY_ID,
+            ),
+            (
+                CloudantDetector,
+                CLOUDANT_PASSWORD,
+                'cloudant_host = account',
+                CLOUDANT_PASSWORD,
+            ),
+            (SlackDetector, SLACK_TOKEN, '', SLACK_TOKEN),
+            (StripeDetector, STRIPE_KEY, '', STRIPE_KEY),
+        ),
+    )
+    @pytest.mark.parametrize('is_valid', (True, False))
+    def test_verify(self, plugin, secret, content, valid_secret, is_valid):
+        queue = VerificationQueue()
+        result = potential_secret_factory(type_=plugin.secret_type, secret=secret)
+
+        with MockProviderServer(valid_secrets=[valid_secret] if is_valid else []) as server:
+            queue.submit(plugin(should_verify=True), result, content)
+            queue.join()
+
+        assert result.is_verified
+        assert result.verified_result is is_valid
+        assert sum(server.requests.values()) == 1
+
+    @pytest.mark.parametrize('error_rate, rate_limit_rate', ((1, 0), (0, 1)))
+    def test_unavailable(self, error_rate, rate_limit_rate):
+        queue = VerificationQueue(
+            request_policy=http_session.RequestPolicy(max_retries=1),
+        )
+        result = potential_secret_factory(secret=STRIPE_KEY)
+
+        with mock.patch('detect_secrets.plugins.common.http_session.time.sleep'):
+            with MockProviderServer(
+                valid_secrets=[STRIPE_KEY],
+                error_rate=error_rate,
+                rate_limit_rate=rate_limit_rate,
+            ) as server:
+                queue.submit(StripeDetector(should_verify=True), result, '')
+                queue.join()
+
+        assert server.requests == {'stripe': 2}
+        assert result.verified_result is not True
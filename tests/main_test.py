@@ -93,6 +93,18 @@ class TestMain:
             should_scan_all_files=False,
             output_raw=False,
             output_verified_false=False,
+            buffer_scan=False,
+            mmap_scan=False,
+            long_line_threshold=None,
+            file_time_budget=None,
+            line_time_budget=None,
+            regex_engine='re',
+            file_policies={},
+            archive_limits=None,
+            threads=1,
+            verification_threads=8,
+            verification_cache=None,
+            request_policy=mock.ANY,
             word_list_file=None,
             word_list_hash=None,
         )
@@ -109,6 +121,18 @@ class TestMain:
             should_scan_all_files=False,
             output_raw=False,
             output_verified_false=False,
+            buffer_scan=False,
+            mmap_scan=False,
+            long_line_threshold=None,
+            file_time_budget=None,
+            line_time_budget=None,
+            regex_engine='re',
+            file_policies={},
+            archive_limits=None,
+            threads=1,
+            verification_threads=8,
+            verification_cache=None,
+            request_policy=mock.ANY,
             word_list_file=None,
             word_list_hash=None,
         )
@@ -127,6 +151,18 @@ class TestMain:
             should_scan_all_files=False,
             output_raw=False,
             output_verified_false=False,
+            buffer_scan=False,
+            mmap_scan=False,
+            long_line_threshold=None,
+            file_time_budget=None,
+            line_time_budget=None,
+            regex_engine='re',
+            file_policies={},
+            archive_limits=None,
+            threads=1,
+            verification_threads=8,
+            verification_cache=None,
+            request_policy=mock.ANY,
             word_list_file=None,
             word_list_hash=None,
         )
@@ -211,6 +247,18 @@ class TestMain:
             should_scan_all_files=True,
             output_raw=False,
             output_verified_false=False,
+            buffer_scan=False,
+            mmap_scan=False,
+            long_line_threshold=None,
+            file_time_budget=None,
+            line_time_budget=None,
+            regex_engine='re',
+            file_policies={},
+            archive_limits=None,
+            threads=1,
+            verification_threads=8,
+            verification_cache=None,
+            request_policy=mock.ANY,
             word_list_file=None,
             word_list_hash=None,
         )
@@ -241,6 +289,35 @@ class TestMain:
             Any(dict),
         )
 
+    @pytest.mark.parametrize(
+        'argument_string, expected',
+        (
+            ('', {'lockfile': 'skip'}),
+            (
+                '--lockfiles scan --generated-files regex-only',
+                {'lockfile': 'scan', 'generated': 'regex-only'},
+            ),
+        ),
+    )
+    def test_file_policies_from_old_baseline(
+        self,
+        mock_baseline_initialize,
+        mock_merge_baseline,
+        argument_string,
+        expected,
+    ):
+        with mock_stdin(), mock.patch(
+            'detect_secrets.main._read_from_file',
+            return_value={'file_policies': {'lockfile': 'skip'}},
+        ), mock.patch(
+            'detect_secrets.main.write_baseline_to_file',
+        ):
+            assert main(
+                'scan --update old_baseline_file {}'.format(argument_string).split(),
+            ) == 0
+
+        assert mock_baseline_initialize.call_args[1]['file_policies'] == expected
+
     def test_reads_non_existed_baseline_from_file(
         self,
         mock_merge_baseline,
@@ -267,6 +344,18 @@ class TestMain:
             should_scan_all_files=False,
             output_raw=False,
             output_verified_false=False,
+            buffer_scan=False,
+            mmap_scan=False,
+            long_line_threshold=None,
+            file_time_budget=None,
+            line_time_budget=None,
+            regex_engine='re',
+            file_policies={},
+            archive_limits=None,
+            threads=1,
+            verification_threads=8,
+            verification_cache=None,
+            request_policy=mock.ANY,
             word_list_file=None,
             word_list_hash=None,
         )
@@ -666,6 +755,19 @@ class TestMain:
 
             assert json.loads(uncolor(printer_shim.message))['plugins'] == expected_output
 
+    def test_verify(self):
+        with mock.patch(
+            'detect_secrets.core.audit.verify_baseline',
+        ) as mock_verify:
+            assert main('verify --verification-threads 2 .secrets.baseline'.split()) == 0
+
+        mock_verify.assert_called_once_with(
+            '.secrets.baseline',
+            verification_threads=2,
+            verification_cache=None,
+            request_policy=mock.ANY,
+        )
+
     def test_audit_diff_not_enough_files(self):
         assert main('audit --diff fileA'.split()) == 1
 
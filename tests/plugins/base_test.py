@@ -1,10 +1,20 @@
+import re
 from contextlib import contextmanager
 
 import mock
 import pytest
+import requests
 
+from detect_secrets.core.code_snippet import CodeSnippetHighlighter
 from detect_secrets.core.constants import VerifiedResult
+from detect_secrets.core.verification_cache import VerificationCache
 from detect_secrets.plugins.base import BasePlugin
+from detect_secrets.plugins.base import LINES_OF_CONTEXT
+from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.common import regex_backend
+from detect_secrets.plugins.common.applicability import Applicability
+from detect_secrets.plugins.common.buffer_scan import MappedFile
+from detect_secrets.plugins.common.regex_backend import Re2Pattern
 from testing.factories import potential_secret_factory
 from testing.mocks import mock_file_object
 
@@ -87,6 +97,15 @@ class TestVerify:
 
         assert not list(result.keys())[0].is_verified
 
+    def test_analyze_request_errors_are_unverified(self):
+        with self.create_test_plugin(VerifiedResult.VERIFIED_TRUE) as plugin:
+            plugin.verify = mock.Mock(side_effect=requests.exceptions.Timeout)
+
+            file = mock_file_object('does not matter')
+            result = plugin.analyze(file, 'does not matter')
+
+        assert not list(result.keys())[0].is_verified
+
     def test_analyze_should_abide_by_no_verify_flag(self):
         with self.create_test_plugin(VerifiedResult.VERIFIED_FALSE) as plugin:
             plugin.should_verify = False
@@ -97,6 +116,37 @@ class TestVerify:
         # If it is verified, this value should be 0.
         assert len(result) == 1
 
+    @pytest.mark.parametrize('secret_line', (1, 5, 10, 19, 20))
+    def test_analyze_verification_context(self, secret_line):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_verify'
+            denylist = (
+                re.compile(r'secret_[a-z]+'),
+            )
+
+        plugin = MockPlugin()
+        plugin.should_verify = True
+        plugin.verify = mock.Mock(return_value=VerifiedResult.UNVERIFIED)
+
+        lines = ['{}\n'.format(index) for index in range(20)]
+        lines[secret_line - 1] = 'secret_abc\n'
+
+        # Lines are streamed from the file, rather than read all at once.
+        result = plugin.analyze(iter(lines), 'filename')
+
+        assert [secret.lineno for secret in result] == [secret_line]
+        plugin.verify.assert_called_once_with(
+            'secret_abc',
+            content=str(
+                CodeSnippetHighlighter().get_code_snippet(
+                    lines,
+                    secret_line,
+                    lines_of_context=LINES_OF_CONTEXT,
+                ),
+            ),
+            potential_secret=list(result)[0],
+        )
+
     @contextmanager
     def create_test_plugin(self, result):
         """
@@ -127,3 +177,619 @@ class TestVerify:
             mock_snippet().get_code_snippet.return_value = ''
 
             yield plugin
+
+
+class TestFindFactors:
+
+    @staticmethod
+    def create_test_plugin():
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_factors'
+            denylist = (
+                re.compile(r'secret_[a-z]+'),
+            )
+            factor_regexes = {
+                'username': mock.Mock(wraps=re.compile(r'user = (\w+)')),
+            }
+
+            def __init__(self):
+                super(MockPlugin, self).__init__(should_verify=True)
+                self.usernames = {}
+
+            def verify(self, token, content, potential_secret):
+                self.usernames[token] = self.find_factors(
+                    'username',
+                    content,
+                    potential_secret,
+                )
+
+                return VerifiedResult.UNVERIFIED
+
+        return MockPlugin()
+
+    def test_factors_are_found_once_per_file(self):
+        plugin = self.create_test_plugin()
+        lines = ['{}\n'.format(index) for index in range(1, 31)]
+        lines[1] = 'user = alice\n'
+        lines[4] = 'secret_a\n'
+        lines[7] = 'secret_b\n'
+        lines[14] = 'user = bob\n'
+        lines[24] = 'user = carol\n'
+
+        results = plugin.analyze(iter(lines), 'filename')
+
+        assert plugin.usernames == {
+            'secret_a': ['alice'],
+            'secret_b': ['alice', 'bob'],
+        }
+
+        # Lines 1 to 15 (the lines of context around both secrets) were each
+        # searched once.
+        assert plugin.factor_regexes['username'].findall.call_count == 15
+        assert all(result.factor_index is None for result in results)
+
+    def test_without_index(self):
+        plugin = self.create_test_plugin()
+        content = 'user = alice\nsecret_a\nuser = bob'
+
+        assert plugin.find_factors('username', content) == ['alice', 'bob']
+        assert plugin.find_factors(
+            'username',
+            content,
+            potential_secret_factory(lineno=2),
+        ) == ['alice', 'bob']
+
+    def test_with_distances(self):
+        plugin = self.create_test_plugin()
+        content = 'user = alice\n\nsecret_a\nuser = bob'
+
+        assert plugin.find_factors(
+            'username',
+            content,
+            potential_secret_factory(secret='secret_a'),
+            with_distances=True,
+        ) == [(2, 'alice'), (1, 'bob')]
+
+        # Without the secret's line, distances can't be told apart.
+        assert plugin.find_factors(
+            'username',
+            content,
+            with_distances=True,
+        ) == [(0, 'alice'), (0, 'bob')]
+
+
+class TestPluginsWhichCantVerify:
+
+    @pytest.mark.parametrize(
+        'analyze',
+        (
+            lambda plugin, content: plugin.analyze(mock_file_object(content), 'a.py'),
+            lambda plugin, content: plugin.analyze_buffer(content, 'a.py'),
+            lambda plugin, content: plugin.analyze_mapped_file(
+                MappedFile(content.encode('utf-8')),
+                'a.py',
+            ),
+        ),
+    )
+    def test_results_are_not_verified(self, analyze):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_unverifiable'
+            denylist = (
+                re.compile(r'secret_[a-z]+'),
+            )
+
+        plugin = MockPlugin(should_verify=True)
+        plugin.verification_queue = mock.Mock()
+        plugin.verify_result = mock.Mock()
+
+        results = analyze(plugin, 'a\nsecret_abc\nb\n')
+
+        assert not plugin.can_verify
+        assert [result.secret_value for result in results] == ['secret_abc']
+        assert not any(result.is_verified for result in results)
+        assert not plugin.verification_queue.submit.called
+        assert not plugin.verify_result.called
+
+        plugin.verify = mock.Mock(return_value=VerifiedResult.UNVERIFIED)
+        assert plugin.can_verify
+
+
+class TestLineCache:
+
+    def test_identical_lines_are_only_analyzed_once(self):
+        plugin = self.create_test_plugin()
+
+        first = plugin.analyze(mock_file_object('password = "hunter2"'), 'a.py')
+        second = plugin.analyze(
+            mock_file_object('\n'.join(['', 'password = "hunter2"'])),
+            'b.py',
+        )
+
+        assert plugin.secret_generator.call_count == 2
+        assert [(secret.filename, secret.lineno) for secret in first] == [('a.py', 1)]
+        assert [(secret.filename, secret.lineno) for secret in second] == [('b.py', 2)]
+        assert list(first)[0].secret_hash == list(second)[0].secret_hash
+
+        cache_info = plugin.line_cache.info()
+        assert cache_info.hits == 1
+        assert cache_info.misses == 2
+        assert cache_info.hit_rate == 1 / 3
+
+    def test_cache_is_keyed_by_file_type(self):
+        plugin = self.create_test_plugin()
+
+        plugin.analyze(mock_file_object('password = "hunter2"'), 'a.py')
+        plugin.analyze(mock_file_object('password = "hunter2"'), 'a.go')
+
+        assert plugin.line_cache.info().hits == 0
+
+    def test_verification_is_performed_for_each_occurrence(self):
+        plugin = self.create_test_plugin()
+        plugin.should_verify = True
+
+        plugin.analyze(mock_file_object('password = "hunter2"'), 'a.py')
+        result = plugin.analyze(mock_file_object('password = "hunter2"'), 'b.py')
+
+        assert plugin.line_cache.info().hits == 1
+        assert plugin.verify.call_count == 2
+        assert list(result)[0].is_verified
+
+    def test_verification_results_are_cached(self):
+        def verify(token, content, potential_secret):
+            potential_secret.other_factors['username'] = 'admin'
+            return VerifiedResult.VERIFIED_TRUE
+
+        plugin = self.create_test_plugin()
+        plugin.should_verify = True
+        plugin.verification_cache = VerificationCache()
+        plugin.verify.side_effect = verify
+
+        plugin.analyze(mock_file_object('password = "hunter2"'), 'a.py')
+        result = plugin.analyze(mock_file_object('password = "hunter2"'), 'b.py')
+
+        assert plugin.verify.call_count == 1
+        assert list(result)[0].verified_result is True
+        assert list(result)[0].other_factors == {'username': 'admin'}
+
+    def create_test_plugin(self):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_cache'
+            denylist = (
+                re.compile(r'password = "(.*)"'),
+            )
+
+        plugin = MockPlugin()
+        plugin.secret_generator = mock.Mock(wraps=plugin.secret_generator)
+        plugin.verify = mock.Mock(return_value=VerifiedResult.VERIFIED_TRUE)
+
+        return plugin
+
+
+class TestLongLines:
+
+    def test_results_match_scanning_entire_line(self):
+        plugin = self.create_test_plugin(r'AKIA[0-9A-Z]{4}')
+        line = ' '.join(
+            'AKIA{:04d} {}'.format(index, 'x' * (index % 37))
+            for index in range(200)
+        )
+
+        expected = plugin.analyze_line(line, 1, 'filename')
+        plugin.long_line_threshold = 100
+        actual = plugin._analyze_line_with_cache(line, 1, 'filename')
+
+        assert len(expected) == 200
+        assert actual == expected
+        assert plugin.analyze_line.call_count > 2
+
+    def test_secrets_on_window_boundaries_are_not_cut_off(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+        plugin.long_line_threshold = 2000
+
+        # Windows are at least twice as large as the maximum secret length.
+        for offset in range(1990, 2010):
+            line = '{} secret_{}'.format('x' * offset, 'a' * 20) + ' x' * 2000
+
+            assert [
+                (secret.secret_value, secret.lineno)
+                for secret in plugin._analyze_line_with_cache(line, 3, 'filename')
+            ] == [('secret_' + 'a' * 20, 3)]
+
+    def test_short_lines_are_scanned_at_once(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+        plugin.long_line_threshold = 100
+
+        plugin._analyze_line_with_cache('x' * 100, 1, 'filename')
+
+        assert plugin.analyze_line.call_count == 1
+
+    def create_test_plugin(self, pattern):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_long_lines'
+            denylist = (
+                re.compile(pattern),
+            )
+
+        plugin = MockPlugin()
+        plugin.analyze_line = mock.Mock(wraps=plugin.analyze_line)
+
+        return plugin
+
+
+class TestDecoders:
+
+    @pytest.mark.parametrize(
+        'line, filename',
+        (
+            # secret_abc, base64 encoded.
+            ('_auth = c2VjcmV0X2FiYw==', '.npmrc'),
+            ('PASSWORD=c2VjcmV0X2FiYw==', '.env'),
+            # secret_abc, hex encoded.
+            ('password = 7365637265745f616263', 'config.ini'),
+            # secret_abc, URL encoded.
+            ('url = https://example.com/?token=%73ecret_abc', 'app.properties'),
+        ),
+    )
+    def test_decoded_values_are_scanned(self, line, filename):
+        plugin = self.create_test_plugin()
+
+        assert [
+            secret.secret_value
+            for secret in plugin.analyze_line(line, 1, filename, output_raw=True)
+        ] == ['secret_abc']
+
+    @pytest.mark.parametrize(
+        'content, expected',
+        (
+            (
+                'kind: Secret\ndata:\n  password: c2VjcmV0X2FiYw==\n',
+                ['secret_abc'],
+            ),
+            # Only the data of Secrets is base64 encoded.
+            ('kind: ConfigMap\ndata:\n  password: c2VjcmV0X2FiYw==\n', []),
+            ('kind: Secret\nmetadata:\n  name: c2VjcmV0X2FiYw==\n', []),
+        ),
+    )
+    def test_kubernetes_secret_data_is_decoded(self, content, expected):
+        plugin = self.create_test_plugin()
+
+        assert [
+            secret.secret_value
+            for secret in plugin.analyze(
+                mock_file_object(content),
+                'secret.yaml',
+                output_raw=True,
+            )
+        ] == expected
+
+    def test_values_are_not_decoded_in_other_files(self):
+        plugin = self.create_test_plugin()
+
+        assert not plugin.analyze_line('_auth = c2VjcmV0X2FiYw==', 1, 'file.py')
+
+    @pytest.mark.parametrize(
+        'line, expected',
+        (
+            # Decoded values are only scanned if the raw line has no results.
+            ('secret_def = c2VjcmV0X2FiYw==', ['secret_def']),
+            ('secret_abc = c2VjcmV0X2FiYw==', ['secret_abc']),
+            ('value = c2VjcmV0X2FiYw==', ['secret_abc']),
+        ),
+    )
+    def test_raw_and_decoded_values_are_one_result(self, line, expected):
+        plugin = self.create_test_plugin()
+
+        assert [
+            secret.secret_value
+            for secret in plugin.analyze_line(line, 1, '.env', output_raw=True)
+        ] == expected
+
+    def test_analyze_encoded_line(self):
+        plugin = self.create_test_plugin()
+
+        assert [
+            secret.secret_value
+            for secret in plugin.analyze_encoded_line(
+                '_auth = c2VjcmV0X2FiYw==',
+                1,
+                '.npmrc',
+                output_raw=True,
+            )
+        ] == ['secret_abc']
+        assert plugin.analyze_encoded_line('_auth = secret_def', 1, '.npmrc') == {}
+        assert plugin.analyze_encoded_line('_auth = c2VjcmV0X2FiYw==', 1, 'file.py') == {}
+
+    def test_lines_are_decoded_once_for_all_plugins(self):
+        first, second = self.create_test_plugin(), self.create_test_plugin()
+        second.decoder_pipeline = first.decoder_pipeline
+
+        for plugin in (first, second):
+            plugin.analyze(mock_file_object('PASSWORD=c2VjcmV0X2FiYw=='), '.env')
+
+        cache_info = first.decoder_pipeline.cache.info()
+        assert cache_info.hits == 1
+        assert cache_info.misses == 1
+
+    def create_test_plugin(self):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_decoders'
+            denylist = (
+                re.compile(r'secret_[a-z]+'),
+            )
+
+        return MockPlugin()
+
+
+class TestIsApplicable:
+
+    @pytest.mark.parametrize(
+        'filename, content, expected',
+        (
+            ('file.py', None, True),
+            ('file.py', 'secret_abc', True),
+            ('file.py', 'password_abc', False),
+            ('file.go', 'secret_abc', False),
+            # The literal may be encoded.
+            ('.env', 'password_abc', True),
+        ),
+    )
+    def test_is_applicable(self, filename, content, expected):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_applicability'
+            applicability = Applicability(
+                path_globs=('*.py', '*.env'),
+                content_literals=('secret_',),
+            )
+            denylist = (
+                re.compile(r'secret_[a-z]+'),
+            )
+
+        assert MockPlugin().is_applicable(filename, content) is expected
+
+    def test_plugins_apply_to_all_files_by_default(self):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_applicability'
+            denylist = ()
+
+        assert MockPlugin().is_applicable('file.go', '')
+
+
+class TestAnalyzeBuffer:
+
+    @pytest.mark.parametrize(
+        'pattern',
+        (
+            r'secret_[a-z]+',
+            r'^secret_[a-z]+',
+            r'secret_[a-z]+$',
+            r'(?:(?<=\W)|(?<=^))secret_[a-z]+',
+        ),
+    )
+    def test_results_match_line_by_line_scanning(self, pattern):
+        buffer = '\n'.join([
+            'secret_abc',
+            'prefix secret_def',
+            'secret_ghi suffix',
+            'secret_jkl  # pragma: allowlist secret',
+            '',
+            'secret_mno',
+        ])
+        plugin = self.create_test_plugin(pattern)
+
+        assert plugin.can_analyze_buffer(buffer, 'filename')
+        expected = plugin.analyze(mock_file_object(buffer), 'filename')
+        plugin.line_cache.clear()
+        actual = plugin.analyze_buffer(buffer, 'filename')
+
+        assert expected
+        assert [
+            (secret.secret_value, secret.lineno)
+            for secret in actual
+        ] == [
+            (secret.secret_value, secret.lineno)
+            for secret in expected
+        ]
+
+    def test_only_candidate_lines_are_analyzed(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+        plugin.secret_generator = mock.Mock(wraps=plugin.secret_generator)
+
+        plugin.analyze_buffer('a\nb\nsecret_abc\nc\n', 'filename')
+
+        assert plugin.secret_generator.call_count == 1
+
+    def test_verification_context(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+        plugin.should_verify = True
+        plugin.verify = mock.Mock(return_value=VerifiedResult.UNVERIFIED)
+
+        buffer = '\n'.join(str(line) for line in range(20)) + '\nsecret_abc\n'
+        plugin.analyze(mock_file_object(buffer), 'filename')
+        plugin.analyze_buffer(buffer, 'filename')
+
+        assert plugin.verify.call_count == 2
+        assert plugin.verify.call_args_list[0] == plugin.verify.call_args_list[1]
+
+    @pytest.mark.parametrize(
+        'buffer, filename',
+        (
+            ('secret_abc\rsecret_def', 'filename'),
+            ('_auth = c2VjcmV0X2FiYw==', '.npmrc'),
+        ),
+    )
+    def test_cannot_analyze_buffer(self, buffer, filename):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+
+        assert not plugin.can_analyze_buffer(buffer, filename)
+
+    def test_cannot_analyze_buffer_with_non_line_local_regex(self):
+        plugin = self.create_test_plugin(r'secret\s+[a-z]+')
+
+        assert not plugin.can_analyze_buffer('secret abc', 'filename')
+
+    def test_cannot_analyze_buffer_with_custom_secret_generator(self):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_buffer'
+            denylist = (
+                re.compile(r'secret_[a-z]+'),
+            )
+
+            def secret_generator(self, string, *args, **kwargs):   # pragma: no cover
+                yield string
+
+        assert not MockPlugin().can_analyze_buffer('secret_abc', 'filename')
+
+    def create_test_plugin(self, pattern):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_buffer'
+            denylist = (
+                re.compile(pattern),
+            )
+
+        return MockPlugin()
+
+
+class TestAnalyzeMappedFile:
+
+    @pytest.mark.parametrize(
+        'pattern',
+        (
+            r'secret_[a-z]+',
+            r'^secret_[a-z]+',
+            r'secret_[a-z]+$',
+            r'secret_\w+',
+        ),
+    )
+    def test_results_match_line_by_line_scanning(self, pattern):
+        buffer = '\r\n'.join([
+            'secret_abc',
+            'prefix secret_def',
+            'secret_ghi suffix',
+            'secret_jkl  # pragma: allowlist secret',
+            '',
+            'caf\u00e9 secret_mno\u00e9',
+            'secret_pqr',
+        ])
+        plugin = self.create_test_plugin(pattern)
+        mapped_file = MappedFile(buffer.encode('utf-8'))
+
+        assert plugin.can_analyze_mapped_file(mapped_file, 'filename')
+        expected = plugin.analyze(mock_file_object(buffer), 'filename')
+        plugin.line_cache.clear()
+        actual = plugin.analyze_mapped_file(mapped_file, 'filename')
+
+        assert expected
+        assert [
+            (secret.secret_value, secret.lineno)
+            for secret in actual
+        ] == [
+            (secret.secret_value, secret.lineno)
+            for secret in expected
+        ]
+
+    def test_only_candidate_lines_are_analyzed(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+        plugin.secret_generator = mock.Mock(wraps=plugin.secret_generator)
+
+        plugin.analyze_mapped_file(MappedFile(b'a\nb\nsecret_abc\nc\n'), 'filename')
+
+        assert plugin.secret_generator.call_count == 1
+
+    def test_verification_context(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+        plugin.should_verify = True
+        plugin.verify = mock.Mock(return_value=VerifiedResult.UNVERIFIED)
+
+        buffer = '\n'.join(str(line) for line in range(20)) + '\nsecret_abc\n'
+        plugin.analyze(mock_file_object(buffer), 'filename')
+        plugin.analyze_mapped_file(MappedFile(buffer.encode('utf-8')), 'filename')
+
+        assert plugin.verify.call_count == 2
+        assert plugin.verify.call_args_list[0] == plugin.verify.call_args_list[1]
+
+    @pytest.mark.parametrize(
+        'pattern, buffer, filename',
+        (
+            (r'secret_[a-z]+', b'secret_abc\rsecret_def', 'filename'),
+            (r'secret_[a-z]+', b'_auth = c2VjcmV0X2FiYw==', '.npmrc'),
+            (r'secret\s+[a-z]+', b'secret abc', 'filename'),
+            ('secret_\u00e9', b'secret_abc', 'filename'),
+        ),
+    )
+    def test_cannot_analyze_mapped_file(self, pattern, buffer, filename):
+        plugin = self.create_test_plugin(pattern)
+
+        assert not plugin.can_analyze_mapped_file(MappedFile(buffer), filename)
+
+    def create_test_plugin(self, pattern):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_mapped_file'
+            denylist = (
+                re.compile(pattern),
+            )
+
+        return MockPlugin()
+
+
+class TestRegexEngine:
+
+    def test_default_engine_uses_denylist_as_is(self):
+        plugin = self.create_test_plugin(r'secret_[a-z]+')
+
+        assert plugin._get_compiled_denylist() == list(plugin.denylist)
+
+    @pytest.mark.skipif(
+        regex_backend.re2 is None,
+        reason='google-re2 is not installed',
+    )
+    @pytest.mark.parametrize(
+        'pattern',
+        (
+            r'secret_[a-z]+',
+            r'^secret_\w+',
+            r'(?:(?<=\W)|(?<=^))secret_[a-z]+',
+        ),
+    )
+    def test_results_match_re(self, pattern):
+        buffer = '\n'.join([
+            'secret_abc',
+            'prefix secret_def',
+            'secret_ghi suffix',
+            'secret_jkl  # pragma: allowlist secret',
+            '',
+            'caf\u00e9 secret_mno\u00e9',
+        ])
+        expected = self.get_results(self.create_test_plugin(pattern), buffer)
+
+        plugin = self.create_test_plugin(pattern)
+        plugin.regex_engine = 're2'
+
+        assert expected[0]
+        assert self.get_results(plugin, buffer) == expected
+
+        is_supported = not regex_backend.get_incompatibilities(plugin.denylist[0])
+        assert isinstance(plugin._get_compiled_denylist()[0], Re2Pattern) == is_supported
+
+    def get_results(self, plugin, buffer):
+        output = []
+        for results in (
+            plugin.analyze(mock_file_object(buffer), 'filename'),
+            plugin.analyze_buffer(buffer, 'filename'),
+            plugin.analyze_mapped_file(MappedFile(buffer.encode('utf-8')), 'filename'),
+        ):
+            plugin.line_cache.clear()
+            output.append([
+                (secret.secret_value, secret.lineno)
+                for secret in results
+            ])
+
+        return output
+
+    def create_test_plugin(self, pattern):
+        class MockPlugin(RegexBasedDetector):
+            secret_type = 'test_regex_engine'
+            denylist = (
+                re.compile(pattern),
+            )
+
+        return MockPlugin()
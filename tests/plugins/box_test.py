@@ -218,6 +218,31 @@ class TestBoxDetector(object):
             potential_secret,
         ) == VerifiedResult.UNVERIFIED
 
+    def test_get_verification_factors(self):
+        content = '''"clientID": "{}",
+               "clientSecret": "{}",
+               "publicKeyID": "{}",
+               "privateKey": "{}",
+               "passphrase": "{}",
+               "enterpriseID": "{}"
+            '''.format(
+            BOX_CLIENT_ID, BOX_CLIENT_SECRET, BOX_PUBLIC_KEY_ID,
+            BOX_PRIVATE_KEY, BOX_PASSPHRASE, BOX_ENTERPRISE_ID,
+        )
+
+        assert BoxDetector().get_verification_factors(content) == (
+            (BOX_CLIENT_ID,),
+            (BOX_PUBLIC_KEY_ID,),
+            (BOX_PRIVATE_KEY.rstrip('\n'),),
+            (BOX_PASSPHRASE,),
+            (BOX_ENTERPRISE_ID,),
+        )
+
+        # Other lines of context don't change the result.
+        assert BoxDetector().get_verification_factors(
+            'unrelated = 1\n' + content,
+        ) == BoxDetector().get_verification_factors(content)
+
     @pytest.mark.parametrize(
         'content, prefix_regex, factor_keyword_regex, factor_regex, expected_result',
         (
@@ -1,3 +1,4 @@
+import base64
 import textwrap
 
 import pytest
@@ -71,9 +72,7 @@ class TestCloudantDetector:
 
     @responses.activate
     def test_verify_invalid_secret(self):
-        cl_api_url = 'https://{cl_account}:{cl_pw}@{cl_account}.cloudant.com'.format(
-            cl_account=CL_ACCOUNT, cl_pw=CL_PW,
-        )
+        cl_api_url = 'https://{cl_account}.cloudant.com'.format(cl_account=CL_ACCOUNT)
         responses.add(
             responses.GET, cl_api_url,
             json={'error': 'unauthorized'}, status=401,
@@ -86,9 +85,7 @@ class TestCloudantDetector:
 
     @responses.activate
     def test_verify_valid_secret(self):
-        cl_api_url = 'https://{cl_account}:{cl_pw}@{cl_account}.cloudant.com'.format(
-            cl_account=CL_ACCOUNT, cl_pw=CL_PW,
-        )
+        cl_api_url = 'https://{cl_account}.cloudant.com'.format(cl_account=CL_ACCOUNT)
         responses.add(
             responses.GET, cl_api_url,
             json={'id': 1}, status=200,
@@ -100,6 +97,9 @@ class TestCloudantDetector:
             potential_secret,
         ) == VerifiedResult.VERIFIED_TRUE
         assert potential_secret.other_factors['hostname'] == CL_ACCOUNT
+        assert responses.calls[0].request.headers['Authorization'] == 'Basic {}'.format(
+            base64.b64encode('{}:{}'.format(CL_ACCOUNT, CL_PW).encode('utf-8')).decode('ascii'),
+        )
 
     @responses.activate
     def test_verify_unverified_secret(self):
@@ -0,0 +1,201 @@
+import codecs
+import io
+import re
+
+import pytest
+
+from detect_secrets.core.code_snippet import CodeSnippetHighlighter
+from detect_secrets.plugins.common.buffer_scan import compile_for_bytes
+from detect_secrets.plugins.common.buffer_scan import get_max_match_length
+from detect_secrets.plugins.common.buffer_scan import has_other_line_boundaries
+from detect_secrets.plugins.common.buffer_scan import is_line_local
+from detect_secrets.plugins.common.buffer_scan import iter_lines
+from detect_secrets.plugins.common.buffer_scan import LineIndex
+from detect_secrets.plugins.common.buffer_scan import MappedFile
+
+
+class TestLineIndex:
+
+    @pytest.mark.parametrize(
+        'buffer',
+        (
+            '',
+            'a',
+            'a\n',
+            'a\nb',
+            'a\n\nb\n',
+            'a\r\nb\r\n',
+            '\n\n',
+        ),
+    )
+    def test_lines_match_readlines(self, buffer):
+        index = LineIndex(buffer)
+
+        assert index.get_lines() == tuple(buffer.splitlines(True))
+        assert index.num_lines == len(buffer.splitlines())
+
+    def test_get_line_number(self):
+        index = LineIndex('ab\ncd\n\nef')
+
+        assert [index.get_line_number(offset) for offset in range(9)] == [
+            1, 1, 1,
+            2, 2, 2,
+            3,
+            4, 4,
+        ]
+
+        # End of buffer maps to the last line.
+        assert index.get_line_number(9) == 4
+
+
+class TestMappedFile:
+
+    def test_get_candidate_lines(self):
+        mapped_file = MappedFile(b'a\nsecret_abc\n\nb secret_def\r\nc')
+
+        assert list(
+            mapped_file.get_candidate_lines([
+                compile_for_bytes(re.compile(r'secret_[a-z]+')),
+            ]),
+        ) == [
+            (2, 2, 'secret_abc\n'),
+            (4, 14, 'b secret_def\r\n'),
+        ]
+
+    def test_empty_match_at_end_of_line(self):
+        mapped_file = MappedFile(b'a\nb\n')
+
+        assert [
+            line_number
+            for line_number, _, _ in mapped_file.get_candidate_lines([
+                compile_for_bytes(re.compile(r'$')),
+            ])
+        ] == [1, 2]
+
+    def test_non_ascii_lines_are_always_candidates(self):
+        mapped_file = MappedFile(b'a\nb \xff\xe2\x82\xac\nc')
+
+        assert list(
+            mapped_file.get_candidate_lines([
+                compile_for_bytes(re.compile(r'secret')),
+            ]),
+        ) == [
+            (2, 2, 'b \ufffd\u20ac\n'),
+        ]
+
+    @pytest.mark.parametrize('line_number', (1, 5, 9, 20))
+    def test_get_context_matches_code_snippet(self, line_number):
+        buffer = '\n'.join(str(line) for line in range(20))
+        mapped_file = MappedFile(buffer.encode('utf-8'))
+        line_start = len(''.join(buffer.splitlines(True)[:line_number - 1]))
+
+        assert mapped_file.get_context(line_start, line_number, 7) == str(
+            CodeSnippetHighlighter().get_code_snippet(
+                buffer.splitlines(True),
+                line_number,
+                lines_of_context=7,
+            ),
+        )
+
+    @pytest.mark.parametrize(
+        'buffer, expected',
+        (
+            (b'a\nb\r\nc', False),
+            (b'a\rb', True),
+            (b'a\x0cb', True),
+            ('a\u2028b'.encode('utf-8'), True),
+        ),
+    )
+    def test_has_other_line_boundaries(self, buffer, expected):
+        assert MappedFile(buffer).has_other_line_boundaries() is expected
+
+
+@pytest.mark.parametrize(
+    'buffer',
+    (
+        '',
+        'a',
+        'abc\ndef\n',
+        'a\r\nb\rc\r\n\r',
+        'a\x0cb\u2028c\x85',
+        '\u00e9\u00e9\r\n\u00e9',
+        '\n\n\r\r',
+    ),
+)
+@pytest.mark.parametrize('read_size', (1, 2, 3, 1024))
+def test_iter_lines_matches_readlines(buffer, read_size):
+    def get_reader():
+        return codecs.getreader('utf-8')(io.BytesIO(buffer.encode('utf-8')))
+
+    assert list(iter_lines(get_reader(), read_size)) == get_reader().readlines()
+
+
+@pytest.mark.parametrize(
+    'pattern, expected',
+    (
+        (r'secret_[a-z]+', True),
+        (r'secret_\w+', True),
+        ('secret_\u00e9', False),
+    ),
+)
+def test_compile_for_bytes(pattern, expected):
+    regex = compile_for_bytes(re.compile(pattern))
+
+    assert (regex is not None) is expected
+    if expected:
+        assert regex.flags & re.MULTILINE
+
+
+@pytest.mark.parametrize(
+    'pattern, expected',
+    (
+        (r'AKIA[0-9A-Z]{16}', 20),
+        (r'(?<=\W)key(abc|d)?', 6),
+        (r'key[^\s]+', None),
+        (r'key\w*', None),
+    ),
+)
+def test_get_max_match_length(pattern, expected):
+    assert get_max_match_length(re.compile(pattern)) == expected
+
+
+@pytest.mark.parametrize(
+    'buffer, expected',
+    (
+        ('a\nb\r\nc', False),
+        ('a\rb', True),
+        ('a\x0cb', True),
+        ('a b', True),
+    ),
+)
+def test_has_other_line_boundaries(buffer, expected):
+    assert has_other_line_boundaries(buffer) is expected
+
+
+@pytest.mark.parametrize(
+    'pattern, expected',
+    (
+        (r'AKIA[0-9A-Z]{16}', True),
+        (r'^key$', True),
+        (r'(?:(?<=\W)|(?<=^))key', True),
+        (r'(?<!x)key(?!y)', True),
+        (r'key[^\s]+', True),
+        (r'key.*', True),
+
+        # Could consume a newline
+        (r'key\s+value', False),
+        (r'key[^"]+', False),
+        (r'(?s)key.*', False),
+        (r'key\n', False),
+
+        # Negative lookarounds that could see a newline
+        (r'(?<!\s)key', False),
+        (r'key(?![^a-z])', False),
+
+        # String anchors
+        (r'\Akey', False),
+        (r'key\Z', False),
+    ),
+)
+def test_is_line_local(pattern, expected):
+    assert is_line_local(re.compile(pattern)) is expected
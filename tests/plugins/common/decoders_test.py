@@ -0,0 +1,145 @@
+import pytest
+
+from detect_secrets.plugins.common import decoders
+from detect_secrets.plugins.common.decoders import DecoderPipeline
+from detect_secrets.plugins.common.decoders import find_secret_data_lines
+from detect_secrets.plugins.common.decoders import get_decoders
+from testing.mocks import mock_file_object
+
+
+class TestDecoders:
+
+    @pytest.mark.parametrize(
+        'decoder, line, expected',
+        (
+            (decoders.NPMRC_AUTH, '_auth = aHVudGVyMg==', '_auth = hunter2'),
+            (decoders.NPMRC_AUTH, '_password=aHVudGVyMg==', '_password=hunter2'),
+            (
+                decoders.KUBERNETES_SECRET_DATA,
+                '  password: "aHVudGVyMg=="',
+                '  password: "hunter2"',
+            ),
+            (
+                decoders.BASE64,
+                'a=c2VjcmV0X2FiYw== b=c2VjcmV0X2RlZg==',
+                'a=secret_abc b=secret_def',
+            ),
+            (decoders.HEX, 'key = 7365637265745f616263', 'key = secret_abc'),
+            (
+                decoders.URL_ENCODED,
+                'url = https://example.com/?p=p%40ss',
+                'url = https://example.com/?p=p@ss',
+            ),
+        ),
+    )
+    def test_decode_line(self, decoder, line, expected):
+        assert decoder.decode_line(line) == expected
+
+    @pytest.mark.parametrize(
+        'decoder, line',
+        (
+            # Not valid base64.
+            (decoders.NPMRC_AUTH, '_auth = aHVudGVyMg'),
+            # Top level keys aren't in the `data` of a Secret.
+            (decoders.KUBERNETES_SECRET_DATA, 'password: aHVudGVyMg=='),
+            # Decodes into binary.
+            (decoders.BASE64, 'value = /////////////////////w=='),
+            (decoders.HEX, 'value = ffffffffffffffffffff'),
+            # Too short to be worth decoding.
+            (decoders.HEX, 'value = 68756e746572'),
+            (decoders.URL_ENCODED, 'value = hunter2'),
+        ),
+    )
+    def test_values_which_cannot_be_decoded(self, decoder, line):
+        assert decoder.decode_line(line) is None
+
+
+@pytest.mark.parametrize(
+    'filename, expected',
+    (
+        ('.npmrc', (decoders.NPMRC_AUTH,)),
+        ('config/.env', (decoders.BASE64, decoders.HEX, decoders.URL_ENCODED)),
+        ('secret.yaml', (decoders.KUBERNETES_SECRET_DATA,)),
+        ('file.py', ()),
+    ),
+)
+def test_get_decoders(filename, expected):
+    assert get_decoders(filename) == expected
+
+
+@pytest.mark.parametrize(
+    'content, expected',
+    (
+        (
+            'apiVersion: v1\n'
+            'data:\n'
+            '  password: aHVudGVyMg==\n'
+            '\n'
+            '  # comment\n'
+            '  username: YWRtaW4=\n'
+            'kind: Secret\n'
+            'metadata:\n'
+            '  name: c2VjcmV0X2FiYw==\n',
+            {3, 6},
+        ),
+        ('kind: "Secret"\nbinaryData:\n  key: aHVudGVyMg==\n', {3}),
+        ('kind: ConfigMap\ndata:\n  password: aHVudGVyMg==\n', set()),
+        (
+            'kind: ConfigMap\n'
+            'data:\n'
+            '  password: aHVudGVyMg==\n'
+            '---\n'
+            'kind: Secret\n'
+            'data:\n'
+            '  password: aHVudGVyMg==\n',
+            {7},
+        ),
+        ('spec:\n  kind: Secret\ndata:\n  password: aHVudGVyMg==\n', set()),
+    ),
+)
+def test_find_secret_data_lines(content, expected):
+    assert find_secret_data_lines(content.splitlines(True)) == expected
+
+
+class TestDecoderPipeline:
+
+    def test_decoded_views_are_memoized(self):
+        pipeline = DecoderPipeline()
+
+        assert pipeline.decode('a = 7365637265745f616263', '.env') == ('a = secret_abc',)
+        assert pipeline.decode('a = 7365637265745f616263', 'config.ini') == ('a = secret_abc',)
+
+        cache_info = pipeline.cache.info()
+        assert cache_info.hits == 1
+        assert cache_info.misses == 1
+
+    def test_lines_without_encoded_values(self):
+        pipeline = DecoderPipeline()
+
+        assert pipeline.decode('a = b', '.env') == ()
+        assert pipeline.decode('a = 7365637265745f616263', 'file.py') == ()
+
+    def test_kubernetes_secret_data_is_only_decoded_in_secrets(self):
+        pipeline = DecoderPipeline()
+        line = '  password: aHVudGVyMg=='
+
+        content = 'kind: Secret\ndata:\n{}\n'.format(line)
+        with pipeline.file('secret.yaml', mock_file_object(content)):
+            assert pipeline.get_decoders('secret.yaml') == (decoders.KUBERNETES_SECRET_DATA,)
+            assert pipeline.decode(line, 'secret.yaml', 3) == ('  password: hunter2',)
+            assert pipeline.decode(line, 'secret.yaml', 1) == ()
+
+        content = 'kind: ConfigMap\ndata:\n{}\n'.format(line)
+        with pipeline.file('config.yaml', mock_file_object(content)):
+            assert pipeline.get_decoders('config.yaml') == ()
+            assert pipeline.decode(line, 'config.yaml', 3) == ()
+
+        # Nor outside of the file's block.
+        assert pipeline.decode(line, 'secret.yaml', 3) == ()
+
+    def test_long_lines_are_not_memoized(self):
+        pipeline = DecoderPipeline()
+        line = 'a = 7365637265745f616263' + ' ' * 1000
+
+        assert pipeline.decode(line, '.env') == ('a = secret_abc' + ' ' * 1000,)
+        assert pipeline.cache.info().currsize == 0
@@ -0,0 +1,44 @@
+import re
+
+from detect_secrets.plugins.common.factor_index import FactorIndex
+
+
+REGEXES = {
+    'username': re.compile(r'user = (\w+)'),
+    'host': (
+        re.compile(r'host = (\w+)'),
+        re.compile(r'https://(\w+)\.example\.com'),
+    ),
+}
+
+
+class TestFactorIndex:
+
+    def test_find(self):
+        index = FactorIndex.from_content(
+            REGEXES,
+            '\n'.join([
+                'user = alice',
+                'host = first',
+                '',
+                'url = https://second.example.com  # host = third',
+                'user = bob',
+            ]),
+        )
+
+        assert index.find('username') == ['alice', 'bob']
+        assert index.find('host') == ['first', 'third', 'second']
+
+        assert index.find('username', line_number=3, lines_of_context=1) == []
+        assert index.find('username', line_number=3, lines_of_context=2) == ['alice', 'bob']
+        assert index.find('host', line_number=5, lines_of_context=1) == ['third', 'second']
+
+        assert index.find('username', with_line_numbers=True) == [(1, 'alice'), (5, 'bob')]
+
+    def test_lines_are_only_added_once(self):
+        index = FactorIndex(REGEXES)
+        index.add_lines(['user = alice', 'user = bob'], first_line_number=3)
+        index.add_lines(['user = bob', 'user = carol'], first_line_number=4)
+
+        assert index.find('username') == ['alice', 'bob', 'carol']
+        assert index.find('username', line_number=5) == ['carol']
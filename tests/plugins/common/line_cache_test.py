@@ -0,0 +1,48 @@
+from detect_secrets.plugins.common.line_cache import LineResultCache
+
+
+class TestLineResultCache:
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = LineResultCache(maxsize=2)
+        cache.put('a', ('A',))
+        cache.put('b', ('B',))
+
+        # Accessing `a` makes `b` the least recently used entry.
+        assert cache.get('a') == ('A',)
+        cache.put('c', ('C',))
+
+        assert cache.get('b') is None
+        assert cache.get('a') == ('A',)
+        assert cache.get('c') == ('C',)
+        assert cache.info().currsize == 2
+
+    def test_info(self):
+        cache = LineResultCache()
+        assert cache.info().hit_rate == 0.0
+
+        cache.put('a', ())
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+
+        info = cache.info()
+        assert info.hits == 2
+        assert info.misses == 1
+        assert info.hit_rate == 2 / 3
+
+    def test_is_cacheable(self):
+        cache = LineResultCache(max_line_length=5)
+        assert cache.is_cacheable('12345')
+        assert not cache.is_cacheable('123456')
+
+        assert not LineResultCache(maxsize=0).is_cacheable('')
+
+    def test_clear(self):
+        cache = LineResultCache()
+        cache.put('a', ())
+        cache.get('a')
+
+        cache.clear()
+        assert cache.get('a') is None
+        assert cache.info().hits == 0
@@ -0,0 +1,182 @@
+import re
+
+import mock
+import pytest
+
+from detect_secrets.plugins.artifactory import ArtifactoryDetector
+from detect_secrets.plugins.box import BoxDetector
+from detect_secrets.plugins.cloudant import CloudantDetector
+from detect_secrets.plugins.common import regex_backend
+from detect_secrets.plugins.common.regex_backend import get_incompatibilities
+from detect_secrets.plugins.common.regex_backend import Re2Pattern
+from detect_secrets.plugins.db2 import Db2Detector
+from detect_secrets.plugins.ibm_cloud_iam import IbmCloudIamDetector
+from detect_secrets.plugins.softlayer import SoftlayerDetector
+
+
+requires_re2 = pytest.mark.skipif(
+    regex_backend.re2 is None,
+    reason='google-re2 is not installed',
+)
+
+TEXTS = (
+    '',
+    'xoxb-1234-abcd XOXP-99-Q token=abc_DEF key=valuex\n',
+    'café ٣٤   İı iI KKk sſS a\nb\r\nab\nAB_c1\n',
+    'aaaaab aab ab\nac abc \x0b\x1c\x85 ',
+    'key=ax"key=bx=key=éx\nkey=cx xoxb-é-1 ٣key=dx',
+)
+
+
+@pytest.mark.parametrize(
+    'pattern, flags, expected',
+    (
+        (r'secret_[a-z]+', 0, []),
+        (r'(?P<key>key)=(\w+?)x', re.IGNORECASE, []),
+        (r'(?m)^secret$', 0, []),
+        (r'\bsecret\b', re.ASCII, []),
+        (r'(?:(?<=\W)|(?<=^))secret', 0, []),
+        (r'(?<=\s)secret', 0, []),
+        (r'(?:(?<=\W)|(?<=^))secret(?!_)', 0, ['lookaround']),
+        (r'(?:(?<=\W)|(?<=\Wa))secret', 0, ['lookaround']),
+        (r'a(?<=\W)secret', 0, ['lookaround']),
+        (r'secret(?!_)', 0, ['lookaround']),
+        (r'(["\'])secret\1', 0, ['backreference']),
+        (r'(")?secret(?(1)")', 0, ['conditional group']),
+        (r'secret$', 0, ['$ without MULTILINE']),
+        (r'\bsecret\b', 0, ['Unicode word boundary']),
+        (r'a{1001}', 0, ['large repetition count']),
+        (r'a*', 0, ['empty match']),
+    ),
+)
+def test_get_incompatibilities(pattern, flags, expected):
+    assert get_incompatibilities(re.compile(pattern, flags)) == expected
+
+
+@pytest.mark.parametrize(
+    'plugin_class',
+    (
+        ArtifactoryDetector,
+        BoxDetector,
+        CloudantDetector,
+        Db2Detector,
+        IbmCloudIamDetector,
+        SoftlayerDetector,
+    ),
+)
+def test_detectors_that_start_with_lookbehinds_are_compatible(plugin_class):
+    for regex in plugin_class().denylist:
+        assert get_incompatibilities(regex) == []
+
+
+def test_compile_with_default_engine():
+    regex = re.compile(r'secret_[a-z]+')
+
+    assert regex_backend.compile(regex) is regex
+
+
+def test_compile_without_re2():
+    regex = re.compile(r'secret_[a-z]+')
+
+    with mock.patch.object(regex_backend, 're2', None):
+        assert not regex_backend.is_available('re2')
+        assert regex_backend.compile(regex, 're2') is regex
+
+
+@requires_re2
+class TestRe2:
+
+    @pytest.mark.parametrize(
+        'pattern, flags',
+        (
+            (r'xox[baprs]-(?:\d+-)+[a-z0-9]+', re.IGNORECASE),
+            (r'(?P<key>key)=(\w+?)x', 0),
+            (r'\d+', 0),
+            (r'\w+', 0),
+            (r'\w+', re.ASCII),
+            (r'\s+', 0),
+            (r'[^\W_]+', 0),
+            (r'[^abc\s]+', re.IGNORECASE),
+            (r'[a-z]+', re.IGNORECASE),
+            (r'[^i]', re.IGNORECASE),
+            (r'k', re.IGNORECASE),
+            (r'a.b', 0),
+            (r'a.b', re.DOTALL),
+            (r'^ab$', re.MULTILINE),
+            (r'\Aaa|b\Z', 0),
+            (r'(?:ab|a)c', 0),
+            (r'a{2,5}?b', 0),
+            (r'(?i:k)s', 0),
+            (r'(?:(?<=\W)|(?<=^))(?P<key>key)=(\w+?)x', 0),
+            (r'(?:(?<==|:|")|(?<=\s)|(?<=^))[a-z]+', re.IGNORECASE),
+            (r'(?<=\s)\w', 0),
+            (r'(?:(?<=\W)|(?<=^))key', re.MULTILINE),
+        ),
+    )
+    def test_results_match_re(self, pattern, flags):
+        regex = re.compile(pattern, flags)
+        compiled_regex = regex_backend.compile(regex, 're2')
+
+        assert isinstance(compiled_regex, Re2Pattern)
+        for text in TEXTS:
+            assert compiled_regex.findall(text) == regex.findall(text)
+            assert [
+                match.span() for match in compiled_regex.finditer(text)
+            ] == [
+                match.span() for match in regex.finditer(text)
+            ]
+
+        bytes_regex = re.compile(pattern.encode('ascii'), flags & ~re.ASCII)
+        compiled_bytes_regex = regex_backend.compile(bytes_regex, 're2')
+
+        assert isinstance(compiled_bytes_regex, Re2Pattern)
+        for text in TEXTS:
+            text = text.encode('utf-8') + bytes(range(0x100))
+            assert compiled_bytes_regex.findall(text) == bytes_regex.findall(text)
+
+    def test_search_from_position(self):
+        regex = re.compile(rb'secret_[a-z]+', re.MULTILINE)
+        compiled_regex = regex_backend.compile(regex, 're2')
+
+        assert compiled_regex.search(b'secret_abc secret_def', 1).span() == (11, 21)
+
+    @pytest.mark.parametrize(
+        'pattern, text, pos, expected',
+        (
+            (rb'(?:(?<=\W)|(?<=^))key', b'key', 0, (0, 3)),
+            (rb'(?:(?<=\W)|(?<=^))key', b'key key', 1, (4, 7)),
+            (rb'(?:(?<=\W)|(?<=^))key', b' key', 1, (1, 4)),
+            (rb'(?:(?<=\W)|(?<=^))key', b'\xffkey', 1, (1, 4)),
+        ),
+    )
+    def test_search_from_position_after_lookbehind(self, pattern, text, pos, expected):
+        regex = re.compile(pattern)
+        compiled_regex = regex_backend.compile(regex, 're2')
+
+        assert isinstance(compiled_regex, Re2Pattern)
+        assert compiled_regex.search(text, pos).span() == expected
+
+    def test_match_groups_after_lookbehind(self):
+        regex = re.compile(r'(?:(?<=\W)|(?<=^))(?P<key>key)=(\w+)?(x)?')
+        compiled_regex = regex_backend.compile(regex, 're2')
+
+        match = compiled_regex.search('é key=é')
+        assert match.span() == (2, 7)
+        assert match.span('key') == (2, 5)
+        assert match.group('key', 2, 3) == ('key', 'é', None)
+        assert match.groups('') == ('key', 'é', '')
+        assert match.groupdict() == {'key': 'key'}
+        assert match[2] == 'é'
+
+    def test_incompatible_patterns_use_re(self):
+        regex = re.compile(r'secret(?!_)')
+
+        assert regex_backend.compile(regex, 're2') is regex
+
+    def test_text_with_surrogates_uses_re(self):
+        compiled_regex = regex_backend.compile(re.compile(r'secret_[a-z]+'), 're2')
+        text = 'secret_abc \udcff'
+
+        assert compiled_regex.findall(text) == ['secret_abc']
+        assert [match.group() for match in compiled_regex.finditer(text)] == ['secret_abc']
+        assert compiled_regex.search(text).group() == 'secret_abc'
@@ -9,6 +9,8 @@ from detect_secrets.core.potential_secret import PotentialSecret
 from detect_secrets.plugins.db2 import Db2Detector
 from detect_secrets.plugins.db2 import find_other_factor
 from detect_secrets.plugins.db2 import get_hostname_port_database_from_url
+from detect_secrets.plugins.db2 import MAX_ATTEMPTS
+from detect_secrets.plugins.db2 import rank_candidates
 
 
 DB2_USER = 'fake_user'
@@ -251,6 +253,93 @@ class TestGheDetector(object):
 
         mock_db2_connect.assert_called_with(DB2_CONN_STRING, '', '')
 
+    @patch('detect_secrets.plugins.db2.verify_db2_credentials')
+    def test_verify_tries_nearest_factors_first(self, mock_verify_credentials):
+        def verify_credentials(database, hostname, port, username, password, timeout):
+            if (username, hostname) == ('near_user', 'near.host'):
+                return VerifiedResult.VERIFIED_TRUE
+
+            return VerifiedResult.VERIFIED_FALSE
+
+        mock_verify_credentials.side_effect = verify_credentials
+
+        potential_secret = PotentialSecret('test db2', 'test filename', DB2_PASSWORD)
+        assert Db2Detector().verify(
+            DB2_PASSWORD,
+            textwrap.dedent("""
+                user=far_user
+                host=far.host
+                database={}
+                port={}
+                user=near_user
+                host=near.host
+                password={}
+            """)[1:].format(DB2_DATABASE, DB2_PORT, DB2_PASSWORD),
+            potential_secret,
+        ) == VerifiedResult.VERIFIED_TRUE
+
+        # The nearest combination is tried first, and succeeds.
+        assert mock_verify_credentials.call_args_list[0][0][:4] == (
+            DB2_DATABASE, 'near.host', DB2_PORT, 'near_user',
+        )
+        assert potential_secret.other_factors['username'] == 'near_user'
+        assert potential_secret.other_factors['hostname'] == 'near.host'
+
+    @pytest.mark.parametrize(
+        'database_count, verify_results, expected',
+        (
+            (MAX_ATTEMPTS, [VerifiedResult.VERIFIED_FALSE], VerifiedResult.VERIFIED_FALSE),
+            (
+                MAX_ATTEMPTS,
+                [VerifiedResult.VERIFIED_FALSE, VerifiedResult.UNVERIFIED],
+                VerifiedResult.UNVERIFIED,
+            ),
+            # Candidates that weren't tried may still be valid.
+            (MAX_ATTEMPTS * 2, [VerifiedResult.VERIFIED_FALSE], VerifiedResult.UNVERIFIED),
+        ),
+    )
+    @patch('detect_secrets.plugins.db2.verify_db2_credentials')
+    def test_verify_attempts_are_limited(
+        self, mock_verify_credentials, database_count, verify_results, expected,
+    ):
+        mock_verify_credentials.side_effect = (
+            lambda database, *args: verify_results[int(database[-1]) % len(verify_results)]
+        )
+
+        content = self.get_content_with_databases(database_count)
+        potential_secret = PotentialSecret('test db2', 'test filename', DB2_PASSWORD)
+
+        assert Db2Detector().verify(DB2_PASSWORD, content, potential_secret) == expected
+        assert mock_verify_credentials.call_count == MAX_ATTEMPTS
+        assert not potential_secret.other_factors
+
+    def test_get_verification_factors(self):
+        content = self.get_content_with_databases(MAX_ATTEMPTS * 2)
+        plugin = Db2Detector()
+
+        factors = plugin.get_verification_factors(content)
+        assert factors == tuple(plugin.get_candidates(content)[:MAX_ATTEMPTS])
+        assert len(factors) == MAX_ATTEMPTS
+
+        # Factors which wouldn't be tried don't change the result.
+        assert plugin.get_verification_factors(
+            content + 'database=unlikely\n',
+        ) == factors
+
+    def test_get_verification_factors_without_other_factors(self):
+        assert Db2Detector().get_verification_factors(
+            'password={}'.format(DB2_PASSWORD),
+        ) == ()
+
+    @staticmethod
+    def get_content_with_databases(database_count):
+        return 'user={}\nport={}\nhost={}\npassword={}\n'.format(
+            DB2_USER, DB2_PORT, DB2_HOSTNAME, DB2_PASSWORD,
+        ) + ''.join(
+            'database=database{}\n'.format(index)
+            for index in range(database_count)
+        )
+
     def test_verify_no_other_factors(self):
         potential_secret = PotentialSecret('test db2', 'test filename', DB2_PASSWORD)
         assert Db2Detector().verify(
@@ -354,3 +443,17 @@ def test_get_hostname_port_database_from_url(
     assert get_hostname_port_database_from_url(
         content, hostname_regex, port_regex, database_regex,
     ) == expected_output
+
+
+def test_rank_candidates():
+    assert rank_candidates(
+        [(2, 'far_user'), (0, 'near_user'), (0, 'near_user')],
+        [(1, 'database')],
+        [(1, '1234')],
+        [(4, 'far.host'), (1, 'near.host')],
+    ) == [
+        ('near_user', 'database', '1234', 'near.host'),
+        ('far_user', 'database', '1234', 'near.host'),
+        ('near_user', 'database', '1234', 'far.host'),
+        ('far_user', 'database', '1234', 'far.host'),
+    ]
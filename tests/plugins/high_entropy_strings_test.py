@@ -1,4 +1,5 @@
 import codecs
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -236,6 +237,24 @@ class TestRegularBase64HighEntropyStrings(HighEntropyStringsTest):
                 'Location:    test_data/config.env:1',
             )
 
+    def test_shared_between_threads(self):
+        plugin = Base64HighEntropyString(3)
+        filenames = ['test_data/config.ini', 'test_data/config.yaml'] * 10
+
+        def analyze(filename):
+            with codecs.open(filename, encoding='utf-8') as f:
+                return sorted(
+                    secret.lineno
+                    for secret in plugin.analyze(f, filename).values()
+                )
+
+        expected = [analyze(filename) for filename in filenames]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert list(executor.map(analyze, filenames)) == expected
+
+        # Scanning ini and yaml files doesn't change the regex for other files.
+        assert plugin.regex.pattern == Base64HighEntropyString(3).regex.pattern
+
 
 class TestUrlSafeBase64HighEntropyStrings(HighEntropyStringsTest):
     def setup(self):